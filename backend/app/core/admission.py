@@ -0,0 +1,172 @@
+"""
+Admission control - caps concurrent requests per endpoint class (ingestion, demo
+loading, search) with a bounded wait queue in front. A request that finds the queue
+full gets 429; one that waits longer than ADMISSION_QUEUE_TIMEOUT gets 503. Both
+carry Retry-After, estimated from recent service times. Runs before the body is
+read, so a rejected upload costs next to nothing and an ingest storm cannot take
+the memory, Groq quota and event loop search needs.
+"""
+
+import asyncio
+import json
+import math
+import re
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+
+class Rejected(Exception):
+    def __init__(self, status: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status = status
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionLimit:
+    """
+    At most concurrency requests in flight, at most queue_size waiting for a slot.
+    concurrency 0 disables the limit (requests are only counted).
+    """
+
+    def __init__(self, name: str, concurrency: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = {"queue_full": 0, "timeout": 0}
+        self._slots: Optional[asyncio.Semaphore] = asyncio.Semaphore(concurrency) if concurrency > 0 else None
+        # Moving averages (seconds) of time in the handler and time queued
+        self._service_s: Optional[float] = None
+        self._wait_s = 0.0
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free for a new request: the queue ahead drained at the current pace."""
+        per_request = self._service_s or 1.0
+        slots = max(1, self.concurrency)
+        return max(1, math.ceil(per_request * (self.waiting + 1) / slots))
+
+    async def acquire(self) -> None:
+        """Take a slot, queueing if allowed. Raises Rejected (429 queue full, 503 waited too long)."""
+        if self._slots is None:
+            self.active += 1
+            self.admitted += 1
+            return
+        if self._slots.locked():
+            if self.waiting >= self.queue_size:
+                self.rejected["queue_full"] += 1
+                raise Rejected(429, self.retry_after(), f"Too many {self.name} requests in progress")
+            self.waiting += 1
+            t0 = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected["timeout"] += 1
+                raise Rejected(503, self.retry_after(), f"{self.name.capitalize()} capacity exhausted, try again later")
+            finally:
+                self.waiting -= 1
+            self._wait_s = 0.8 * self._wait_s + 0.2 * (time.perf_counter() - t0)
+        else:
+            await self._slots.acquire()
+        self.active += 1
+        self.admitted += 1
+
+    def release(self, service_s: float) -> None:
+        self.active -= 1
+        if self._slots is not None:
+            self._slots.release()
+        self._service_s = service_s if self._service_s is None else 0.8 * self._service_s + 0.2 * service_s
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "avg_service_ms": round((self._service_s or 0.0) * 1000, 1),
+            "avg_wait_ms": round(self._wait_s * 1000, 1),
+        }
+
+
+LIMITS: Dict[str, AdmissionLimit] = {
+    "ingest": AdmissionLimit(
+        "ingest", settings.ADMISSION_INGEST_CONCURRENCY, settings.ADMISSION_INGEST_QUEUE, settings.ADMISSION_QUEUE_TIMEOUT
+    ),
+    "demo": AdmissionLimit(
+        "demo", settings.ADMISSION_DEMO_CONCURRENCY, settings.ADMISSION_DEMO_QUEUE, settings.ADMISSION_QUEUE_TIMEOUT
+    ),
+    "search": AdmissionLimit(
+        "search", settings.ADMISSION_SEARCH_CONCURRENCY, settings.ADMISSION_SEARCH_QUEUE, settings.ADMISSION_QUEUE_TIMEOUT
+    ),
+}
+
+# (method, path pattern, endpoint class)
+ROUTES: Sequence[Tuple[str, str, str]] = (
+    ("POST", r"/api/cv/ingest", "ingest"),
+    ("POST", r"/api/cv/[^/]+/resume", "ingest"),
+    ("GET", r"/api/demo/load", "demo"),
+    ("GET", r"/api/cv/search", "search"),
+    ("POST", r"/api/matching/semantic", "search"),
+    ("POST", r"/api/matching/batch", "search"),
+    ("POST", r"/api/scoring/candidates", "search"),
+    # Embeds the offer and scans the CV pool for its matches
+    ("POST", r"/api/jobs", "search"),
+)
+
+
+def admission_metrics() -> Dict[str, Dict[str, Any]]:
+    """Per endpoint class: limits, in flight, queue depth, admitted and rejected counts."""
+    return {name: limit.metrics() for name, limit in LIMITS.items()}
+
+
+class AdmissionMiddleware:
+    """app.add_middleware(AdmissionMiddleware) - add it after the app's own middleware (only CORS outside it)."""
+
+    def __init__(self, app: ASGIApp, routes: Sequence[Tuple[str, str, str]] = ROUTES):
+        self.app = app
+        self.routes = [(method, re.compile(pattern + r"/?$"), LIMITS[name]) for method, pattern, name in routes]
+
+    def _match(self, scope: Scope) -> Optional[AdmissionLimit]:
+        for method, pattern, limit in self.routes:
+            if scope["method"] == method and pattern.match(scope["path"]):
+                return limit
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self._match(scope) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await limit.acquire()
+        except Rejected as e:
+            await self._reject(send, e)
+            return
+        t0 = time.perf_counter()
+        try:
+            # Returns once the response (streamed ones included) has been sent
+            await self.app(scope, receive, send)
+        finally:
+            limit.release(time.perf_counter() - t0)
+
+    async def _reject(self, send: Send, e: Rejected) -> None:
+        body = json.dumps({"detail": e.reason, "retry_after": e.retry_after}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": e.status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(e.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
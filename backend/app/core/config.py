@@ -3,6 +3,7 @@ Application configuration - loads from environment variables.
 """
 
 import os
+import tempfile
 from pathlib import Path
 from typing import Optional
 from pydantic_settings import BaseSettings
@@ -11,6 +12,9 @@ from pydantic_settings import BaseSettings
 _BACKEND_ROOT = Path(__file__).resolve().parent.parent.parent
 _ENV_FILE = _BACKEND_ROOT / ".env"
 
+# Owner of every CV and job offer until JWT auth is wired in
+DEMO_USER_ID = "00000000-0000-0000-0000-000000000000"
+
 
 class Settings(BaseSettings):
     """Configuration for ATS Intelligent System."""
@@ -25,6 +29,11 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_ROLE_KEY: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
     SUPABASE_ANON_KEY: str = os.getenv("SUPABASE_ANON_KEY", "")
 
+    # Async Supabase client connection pool (request handlers)
+    SUPABASE_POOL_MAX_CONNECTIONS: int = int(os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", "50"))
+    SUPABASE_POOL_MAX_KEEPALIVE: int = int(os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", "20"))
+    SUPABASE_TIMEOUT: float = float(os.getenv("SUPABASE_TIMEOUT", "30"))
+
     # Groq API (for LLM CV structuring)
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
     GROQ_API_URL: str = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1")
@@ -36,8 +45,71 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
     EMBEDDING_DIMENSION: int = 384
 
+    # Vector search operating points (HNSW ef_search per endpoint; see scripts/benchmark_vector_recall.py)
+    CV_SEARCH_EF_SEARCH: int = int(os.getenv("CV_SEARCH_EF_SEARCH", "40"))
+    MATCHING_EF_SEARCH: int = int(os.getenv("MATCHING_EF_SEARCH", "100"))
+
+    # Batch matching: jobs matched per RPC call / streamed chunk
+    MATCHING_BATCH_CHUNK: int = int(os.getenv("MATCHING_BATCH_CHUNK", "25"))
+
+    # CV pipeline (services/cv_pipeline.py): per-stage timeouts (s) and process-wide concurrency
+    PIPELINE_STORAGE_TIMEOUT: float = float(os.getenv("PIPELINE_STORAGE_TIMEOUT", "60"))
+    PIPELINE_OCR_TIMEOUT: float = float(os.getenv("PIPELINE_OCR_TIMEOUT", "120"))
+    PIPELINE_LLM_TIMEOUT: float = float(os.getenv("PIPELINE_LLM_TIMEOUT", "120"))
+    PIPELINE_EMBEDDING_TIMEOUT: float = float(os.getenv("PIPELINE_EMBEDDING_TIMEOUT", "60"))
+    PIPELINE_OCR_CONCURRENCY: int = int(os.getenv("PIPELINE_OCR_CONCURRENCY", "2"))
+    PIPELINE_LLM_CONCURRENCY: int = int(os.getenv("PIPELINE_LLM_CONCURRENCY", "4"))
+    PIPELINE_EMBEDDING_CONCURRENCY: int = int(os.getenv("PIPELINE_EMBEDDING_CONCURRENCY", "2"))
+
+    # Embedding transport to Supabase: "json" (float lists) or base64-packed "float32" / "float16"
+    # through the migration 010 RPC. Storage is vector(384) either way.
+    EMBEDDING_TRANSPORT: str = os.getenv("EMBEDDING_TRANSPORT", "float32")
+
+    # Bulk row writer: rows per request, max wait before a partial flush, retries per batch
+    BULK_WRITE_BATCH_SIZE: int = int(os.getenv("BULK_WRITE_BATCH_SIZE", "50"))
+    BULK_WRITE_FLUSH_MS: int = int(os.getenv("BULK_WRITE_FLUSH_MS", "500"))
+    BULK_WRITE_RETRIES: int = int(os.getenv("BULK_WRITE_RETRIES", "3"))
+
+    # Admission control per endpoint class: requests in flight (0 = unlimited) and requests
+    # allowed to wait for a slot; a full queue gets 429, a wait over the timeout 503
+    ADMISSION_INGEST_CONCURRENCY: int = int(os.getenv("ADMISSION_INGEST_CONCURRENCY", "4"))
+    ADMISSION_INGEST_QUEUE: int = int(os.getenv("ADMISSION_INGEST_QUEUE", "16"))
+    ADMISSION_DEMO_CONCURRENCY: int = int(os.getenv("ADMISSION_DEMO_CONCURRENCY", "1"))
+    ADMISSION_DEMO_QUEUE: int = int(os.getenv("ADMISSION_DEMO_QUEUE", "0"))
+    ADMISSION_SEARCH_CONCURRENCY: int = int(os.getenv("ADMISSION_SEARCH_CONCURRENCY", "64"))
+    ADMISSION_SEARCH_QUEUE: int = int(os.getenv("ADMISSION_SEARCH_QUEUE", "128"))
+    ADMISSION_QUEUE_TIMEOUT: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+
+    # Reprocessing stale CVs (scripts/reprocess_cvs.py): CVs at once, Groq calls per minute,
+    # retries per CV after a rate limit
+    REPROCESS_CONCURRENCY: int = int(os.getenv("REPROCESS_CONCURRENCY", "2"))
+    REPROCESS_LLM_PER_MINUTE: int = int(os.getenv("REPROCESS_LLM_PER_MINUTE", "30"))
+    REPROCESS_MAX_RETRIES: int = int(os.getenv("REPROCESS_MAX_RETRIES", "5"))
+
+    # Demo loading: sample CVs processed at once
+    DEMO_LOAD_CONCURRENCY: int = int(os.getenv("DEMO_LOAD_CONCURRENCY", "4"))
+
+    # Candidate scoring: score_cv_documents RPC (migration 008) or in-process NumPy engine
+    SCORING_IN_DATABASE: bool = os.getenv("SCORING_IN_DATABASE", "true").lower() == "true"
+    # Candidate ids scored per request to Supabase, and chunks in flight at once.
+    # Rows are fetched with GET ?id=in.(...) - 150 uuids keep the URL near 6 KB, under
+    # common 8 KB proxy / PostgREST URI limits (500 made it ~20 KB)
+    SCORING_CHUNK_SIZE: int = int(os.getenv("SCORING_CHUNK_SIZE", "150"))
+    SCORING_CONCURRENCY: int = int(os.getenv("SCORING_CONCURRENCY", "4"))
+
+    # Materialized job matches: candidates kept per job, minimum similarity
+    JOB_MATCHES_TOP_K: int = int(os.getenv("JOB_MATCHES_TOP_K", "50"))
+    JOB_MATCH_THRESHOLD: float = float(os.getenv("JOB_MATCH_THRESHOLD", "0.3"))
+
+    # Search result cache: TTL (0 disables), in-process size, optional shared Redis backend
+    SEARCH_CACHE_TTL: int = int(os.getenv("SEARCH_CACHE_TTL", "300"))
+    SEARCH_CACHE_MAX_ENTRIES: int = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "")
+
     # File upload limits
     MAX_FILE_SIZE_MB: int = int(os.getenv("MAX_FILE_SIZE_MB", "10"))
+    # Uploads up to this size stay in memory while processed, larger ones go to a temp file
+    UPLOAD_SPOOL_MEMORY_MB: float = float(os.getenv("UPLOAD_SPOOL_MEMORY_MB", "2"))
     ALLOWED_CONTENT_TYPES: list = [
         "application/pdf",
         "image/jpeg",
@@ -45,6 +117,17 @@ class Settings(BaseSettings):
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
     ]
 
+    # Storage uploads: pooled connections, resumable (TUS) above this size, chunk retries
+    STORAGE_HTTP_MAX_CONNECTIONS: int = int(os.getenv("STORAGE_HTTP_MAX_CONNECTIONS", "20"))
+    STORAGE_RESUMABLE_THRESHOLD_MB: int = int(os.getenv("STORAGE_RESUMABLE_THRESHOLD_MB", "6"))
+    STORAGE_UPLOAD_RETRIES: int = int(os.getenv("STORAGE_UPLOAD_RETRIES", "3"))
+
+    # Local disk LRU of recently viewed originals (0 MB disables)
+    ORIGINALS_CACHE_DIR: str = os.getenv(
+        "ORIGINALS_CACHE_DIR", str(Path(tempfile.gettempdir()) / "ats-originals")
+    )
+    ORIGINALS_CACHE_MAX_MB: int = int(os.getenv("ORIGINALS_CACHE_MAX_MB", "512"))
+
     # Signed URL expiry (seconds)
     SIGNED_URL_EXPIRY: int = int(os.getenv("SIGNED_URL_EXPIRY", "3600"))
 
@@ -1,32 +1,45 @@
 """
 Supabase client (service role) for backend operations.
 Uses service_role key - bypasses RLS, full access.
+
+get_supabase() is the synchronous client (services, scripts); request handlers use
+get_async_supabase() - non-blocking, over a pooled httpx.AsyncClient.
 """
 
-from typing import Optional
-from supabase import create_client, Client
+import asyncio
+from typing import Optional, Tuple
+
+import httpx
+from supabase import AsyncClient, AsyncClientOptions, Client, acreate_client, create_client
 
 from .config import settings
 
 
 _supabase_client: Optional[Client] = None
+_async_supabase_client: Optional[AsyncClient] = None
+_async_client_lock = asyncio.Lock()
+
+
+def _credentials() -> Tuple[str, str]:
+    url = (settings.SUPABASE_URL or "").strip()
+    key = (settings.SUPABASE_SERVICE_ROLE_KEY or "").strip()
+    if not url or not key:
+        raise RuntimeError(
+            "SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in backend/.env"
+        )
+    if key in ("your-service-role-key", "your_service_role_key"):
+        raise RuntimeError(
+            "Replace SUPABASE_SERVICE_ROLE_KEY with your real key from "
+            "Supabase Dashboard → Project Settings → API"
+        )
+    return url, key
 
 
 def get_supabase() -> Client:
     """Get or create Supabase client with service role."""
     global _supabase_client
     if _supabase_client is None:
-        url = (settings.SUPABASE_URL or "").strip()
-        key = (settings.SUPABASE_SERVICE_ROLE_KEY or "").strip()
-        if not url or not key:
-            raise RuntimeError(
-                "SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in backend/.env"
-            )
-        if key in ("your-service-role-key", "your_service_role_key"):
-            raise RuntimeError(
-                "Replace SUPABASE_SERVICE_ROLE_KEY with your real key from "
-                "Supabase Dashboard → Project Settings → API"
-            )
+        url, key = _credentials()
         try:
             _supabase_client = create_client(url, key)
         except Exception as e:
@@ -35,3 +48,41 @@ def get_supabase() -> Client:
                 "Check SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY in backend/.env"
             ) from e
     return _supabase_client
+
+
+async def get_async_supabase() -> AsyncClient:
+    """Get or create the async Supabase client; connections are pooled (SUPABASE_POOL_*)."""
+    global _async_supabase_client
+    if _async_supabase_client is not None:
+        return _async_supabase_client
+    # Concurrent first requests would otherwise each build a client and leak its pool
+    async with _async_client_lock:
+        if _async_supabase_client is not None:
+            return _async_supabase_client
+        url, key = _credentials()
+        http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.SUPABASE_TIMEOUT, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=settings.SUPABASE_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPABASE_POOL_MAX_KEEPALIVE,
+            ),
+        )
+        try:
+            _async_supabase_client = await acreate_client(
+                url, key, options=AsyncClientOptions(httpx_client=http_client)
+            )
+        except Exception as e:
+            await http_client.aclose()
+            raise RuntimeError(
+                f"Failed to connect to Supabase: {e}. "
+                "Check SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY in backend/.env"
+            ) from e
+    return _async_supabase_client
+
+
+async def close_async_supabase() -> None:
+    """Close the async client's connection pool (application shutdown)."""
+    global _async_supabase_client
+    if _async_supabase_client is not None:
+        await _async_supabase_client.options.httpx_client.aclose()
+        _async_supabase_client = None
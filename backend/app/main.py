@@ -4,11 +4,19 @@ Supabase-native: Postgres (pgvector), Storage, RLS.
 """
 
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import cv, matching, scoring, demo
+from app.core.admission import AdmissionMiddleware, admission_metrics
+from app.core.config import settings
+from app.core.supabase_client import close_async_supabase
+from app.core.upload_limit import BodySizeLimitMiddleware
+from app.routers import cv, matching, scoring, demo, jobs, skills
+from app.services.pipeline import stage_load
+from app.services.result_cache import close_result_cache
+from app.services.storage_service import close_http_client
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,14 +24,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Pooled Supabase, Storage and Redis connections
+    await close_async_supabase()
+    await close_http_client()
+    await close_result_cache()
+
+
 app = FastAPI(
     title="ATS Intelligent System",
     description="Applicant Tracking System with OCR, LLM structuring, semantic search",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+# Stop reading oversized uploads at the limit (plus room for the multipart envelope)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.MAX_FILE_SIZE_MB * 1024 * 1024 + 64 * 1024,
+    paths=("/api/cv/ingest",),
+)
+# Over-capacity requests are turned away before their body is read
+app.add_middleware(AdmissionMiddleware)
+# Added last = outermost: 413/429/503 rejections and preflights get CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -36,6 +64,8 @@ app.include_router(cv.router)
 app.include_router(matching.router)
 app.include_router(scoring.router)
 app.include_router(demo.router)
+app.include_router(jobs.router)
+app.include_router(skills.router)
 
 
 @app.get("/")
@@ -46,6 +76,7 @@ def root():
         "status": "running",
         "docs": "/docs",
         "health": "/health",
+        "metrics": "/metrics",
     }
 
 
@@ -54,9 +85,14 @@ def health():
     return {"status": "healthy", "service": "ats-backend"}
 
 
+@app.get("/metrics")
+def metrics():
+    """Admission queues per endpoint class and pipeline stage load (in this worker)."""
+    return {"admission": admission_metrics(), "pipeline_stages": stage_load()}
+
+
 if __name__ == "__main__":
     import uvicorn
-    from app.core.config import settings
 
     uvicorn.run(
         "app.main:app",
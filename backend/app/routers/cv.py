@@ -3,253 +3,429 @@ CV router - ingest, get, search, delete.
 """
 
 import logging
+import os
+import re
 import uuid
 from datetime import datetime
-from typing import Optional
-
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
-from fastapi.responses import JSONResponse, Response
-
-from app.core.config import settings
-from app.core.supabase_client import get_supabase
-from app.services.ocr_service import extract_text
-from app.services.llm_structuring import structure_cv_flexible
+from typing import AsyncIterator, BinaryIO, Iterator, Optional, Tuple
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.core.config import DEMO_USER_ID, settings
+from app.schemas.filters import SEARCHABLE_STATUSES, build_match_filters
+from app.schemas.pagination import count_option, encode_cursor, keyset_filter
+from app.schemas.projections import parse_fields, project, select_clause
+from app.services.cv_pipeline import process_cv, resume_cv
 from app.services.embedding_service import generate_embedding
-from app.services.storage_service import upload_file, create_signed_url, download_file
+from app.services.original_cache import evict_original, get_original_path, original_etag
+from app.services.result_cache import cache_key, get_cached, invalidate_results, normalize_query, set_cached
+from app.services import cv_repository
+from app.services.storage_service import (
+    create_signed_url,
+    create_signed_urls,
+    delete_file,
+    open_download,
+)
+from app.services.upload_spool import InvalidMultipart, UploadTooLarge, spool_multipart
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/cv", tags=["CV"])
 
+SEARCH_MODES = ("semantic", "hybrid")
+
 
 def _get_user_id() -> str:
     """Default user for demo - replace with JWT auth in production."""
-    return "00000000-0000-0000-0000-000000000000"
-
-
-def _build_structured_data(llm_result: dict) -> dict:
-    """Convert LLM result to structured_data for storage."""
-    data = llm_result.get("data", {}) or {}
-    candidate_info = data.get("candidate_info", {}) or {}
-    sections = data.get("sections", []) or []
-    career = data.get("career_summary", {}) or {}
-
-    experiences = []
-    education = []
-    skills = []
-
-    for s in sections:
-        if s.get("section_type") == "experience":
-            experiences.extend(s.get("content", {}).get("experiences", []))
-        elif s.get("section_type") in ("formation", "education"):
-            education.extend(s.get("content", {}).get("education", []))
-        elif s.get("section_type") in ("compétences", "skills"):
-            skills.extend(s.get("content", {}).get("skills", []))
-
-    return {
-        "candidate_info": candidate_info,
-        "sections": sections,
-        "experiences": experiences,
-        "education": education,
-        "skills": skills,
-        "career_summary": career,
+    return DEMO_USER_ID
+
+
+_INGEST_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "source": {"type": "string", "default": "upload"},
+                        "gdpr_consent": {"type": "boolean", "default": False},
+                    },
+                }
+            }
+        },
     }
+}
 
 
-def _calculate_quality_score(structured: dict) -> float:
-    """Simple quality score."""
-    score = 0.0
-    ci = structured.get("candidate_info", {}) or {}
-    if ci.get("full_name"):
-        score += 0.3
-    if ci.get("email"):
-        score += 0.2
-    if structured.get("experiences"):
-        score += 0.3
-    if structured.get("skills"):
-        score += 0.2
-    return min(score, 1.0)
-
-
-@router.post("/ingest")
-async def ingest_cv(
-    file: UploadFile = File(...),
-    source: str = Form("upload"),
-    gdpr_consent: bool = Form(False),
-):
+@router.post("/ingest", openapi_extra=_INGEST_FORM)
+async def ingest_cv(request: Request):
     """
-    Ingest a CV: upload to storage, OCR, LLM structuring, embedding, save to DB.
-    Full pipeline runs synchronously.
+    Ingest a CV (multipart form: file, source, gdpr_consent): upload to storage,
+    OCR, LLM structuring, embedding, save to DB.
+    Runs the shared CV pipeline (services/cv_pipeline.py): the upload overlaps
+    OCR -> LLM and the embedding overlaps the LLM call. Per-stage timings are
+    returned in timings_ms. Each stage's output is saved as it completes; a failed
+    ingest can be resumed with POST /api/cv/{cv_id}/resume.
     """
-    if not file.filename:
+    # The body is parsed as it streams in: the file part is hashed and size-checked per
+    # chunk and spooled once (memory, or a temp file for large files)
+    try:
+        upload, form = await spool_multipart(request, "file", settings.MAX_FILE_SIZE_MB * 1024 * 1024)
+    except UploadTooLarge as e:
+        raise HTTPException(413, str(e))
+    except InvalidMultipart as e:
+        raise HTTPException(400, str(e))
+    if upload is None or not upload.filename:
+        if upload is not None:
+            upload.close()
         raise HTTPException(400, "No file provided")
 
-    ct = file.content_type or "application/octet-stream"
+    ct = upload.content_type or "application/octet-stream"
     if ct not in settings.ALLOWED_CONTENT_TYPES:
+        upload.close()
         raise HTTPException(400, f"Unsupported type: {ct}")
+    source = form.get("source") or "upload"
+    gdpr_consent = form.get("gdpr_consent", "").strip().lower() in ("1", "true", "on", "yes")
 
-    file_content = await file.read()
-    if len(file_content) > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
-        raise HTTPException(400, f"File too large (max {settings.MAX_FILE_SIZE_MB} MB)")
-
-    user_id = _get_user_id()
     cv_id = str(uuid.uuid4())
-
-    # 1. Upload to Supabase Storage
-    storage_path = await upload_file(
-        file_content=file_content,
-        filename=file.filename,
-        user_id=user_id,
-        cv_id=cv_id,
-    )
-
-    # 2. OCR
-    ocr_result = await extract_text(
-        file_content=file_content,
-        filename=file.filename,
-        content_type=ct,
-    )
-    raw_text = ocr_result.get("raw_text", "") or ""
-
-    # 3. LLM structuring
-    llm_result = await structure_cv_flexible(raw_text, ocr_result)
-    structured_data = _build_structured_data(llm_result)
-
-    # 4. Embedding
-    embedding = await generate_embedding(raw_text)
-
-    # 5. Quality score
-    quality_score = _calculate_quality_score(structured_data)
-
-    # 6. Save to Supabase
-    supabase = get_supabase()
-    row = {
-        "id": cv_id,
-        "user_id": user_id,
-        "original_file_path": storage_path,
-        "raw_text": raw_text,
-        "structured_data": structured_data,
-        "embedding": embedding,
-        "quality_score": quality_score,
-        "status": "active",
-        "source_type": source,
-        "original_filename": file.filename,
-        "mime_type": ct,
-        "file_size_bytes": len(file_content),
-        "gdpr_consent": gdpr_consent,
-    }
-    supabase.table("cv_documents").insert(row).execute()
+    try:
+        result = await process_cv(
+            upload,
+            upload.filename,
+            ct,
+            user_id=_get_user_id(),
+            source=source,
+            gdpr_consent=gdpr_consent,
+            cv_id=cv_id,
+        )
+    except Exception as e:
+        logger.error(f"Ingestion of {upload.filename} failed: {e}")
+        # Completed stages are checkpointed on the row - resuming does not redo them
+        raise HTTPException(500, f"Ingestion failed: {e}. Resume with POST /api/cv/{cv_id}/resume")
+    finally:
+        upload.close()
+    await invalidate_results()
 
     return JSONResponse(
         status_code=201,
         content={
-            "cv_id": cv_id,
+            "cv_id": result["cv_id"],
             "status": "active",
             "message": "CV ingested successfully",
+            "sha256": upload.sha256,
+            "file_size_bytes": upload.size,
+            "timings_ms": result["timings_ms"],
         },
     )
 
 
+@router.post("/{cv_id}/resume")
+async def resume_ingest(cv_id: str):
+    """
+    Resume a failed or interrupted ingest: stages whose output is already stored
+    (see completed_stages) are restored, only the others run again.
+    """
+    try:
+        result = await resume_cv(cv_id)
+    except LookupError:
+        raise HTTPException(404, "CV not found")
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    await invalidate_results()
+
+    return {
+        "cv_id": cv_id,
+        "status": "active",
+        "restored": result["restored"],
+        "steps": result["steps"],
+        "timings_ms": result["timings_ms"],
+    }
+
+
 @router.get("/search")
 async def search_cvs(
     q: Optional[str] = None,
     page: int = 1,
     limit: int = 20,
+    fields: Optional[str] = None,
+    mode: str = "semantic",
+    cursor: Optional[str] = None,
+    count: Optional[str] = None,
+    signed_urls: bool = False,
 ):
     """
-    Search CVs - text query uses pgvector semantic search.
-    Without q, returns paginated list.
+    Search CVs - text query uses pgvector semantic search over active CVs.
+    Without q, returns paginated list (every status).
+    mode: "semantic" (vector only) or "hybrid" (full-text + vector, reciprocal rank fusion).
+    fields: comma-separated columns (default: compact summary, "full" for all but embedding).
+    cursor: opaque next_cursor from a previous list page - deep pages cost the same as page 1.
+    count: "exact", "planned" (planner estimate), "estimated" or "none" for the list total -
+    default "exact" for page-based listing, "planned" with a cursor (no COUNT(*) per page).
+    signed_urls: add a signed_url per listed CV (one batch request, cached per path).
     """
-    supabase = get_supabase()
+    if mode not in SEARCH_MODES:
+        raise HTTPException(400, f"Unknown mode: {mode}. Allowed: {', '.join(SEARCH_MODES)}")
+    try:
+        names = parse_fields(fields)
+        count_mode = count_option(count or ("planned" if cursor else "exact"))
+        keyset = keyset_filter(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    columns = select_clause(names)
     user_id = _get_user_id()
 
     if q and q.strip():
-        # Semantic search: get embedding for query, then vector search
-        query_embedding = await generate_embedding(q.strip())
-        r = supabase.rpc(
-            "match_cv_documents",
-            {
-                "query_embedding": query_embedding,
-                "match_threshold": 0.5,
-                "match_count": limit,
-            },
-        ).execute()
-        # Fallback if RPC not exists: simple filter
-        if hasattr(r, "data") and r.data:
-            ids = [x["id"] for x in r.data]
+        query = q.strip()
+        key = cache_key(
+            "cv_search", q=normalize_query(query), mode=mode, limit=limit, page=page,
+            columns=columns, user_id=user_id,
+        )
+        cached, generation = await get_cached(key)
+        if cached is not None:
+            return cached
+
+        query_embedding = await generate_embedding(query)
+        if mode == "hybrid":
+            # Full-text + vector in one RPC, fused server-side
+            matches = await cv_repository.rpc(
+                "hybrid_search_cv_documents",
+                {
+                    "query_text": query,
+                    "query_embedding": query_embedding,
+                    "match_count": limit,
+                    "filter_user_id": user_id,
+                    "filter_status": list(SEARCHABLE_STATUSES),
+                },
+            )
+            score_key = "score"
         else:
-            ids = []
-        if not ids:
-            return {"results": [], "total": 0, "page": page, "limit": limit}
-
-        r2 = supabase.table("cv_documents").select("*").in_("id", ids).eq("user_id", user_id).execute()
-        return {
-            "results": r2.data or [],
-            "total": len(r2.data or []),
+            matches = await cv_repository.rpc(
+                "match_cv_documents",
+                {
+                    "query_embedding": query_embedding,
+                    "match_threshold": 0.5,
+                    "match_count": limit,
+                    # HNSW returns at most ef_search rows
+                    "ef_search": max(settings.CV_SEARCH_EF_SEARCH, limit),
+                    # Owner and status filters applied inside the index scan, not after LIMIT
+                    "filters": build_match_filters(user_id=user_id, status=list(SEARCHABLE_STATUSES)),
+                },
+            )
+            score_key = "similarity"
+        id_to_score = {str(x["id"]): x.get(score_key) for x in matches}
+        if not id_to_score:
+            return {"results": [], "total": 0, "page": page, "limit": limit, "mode": mode}
+
+        ids = list(id_to_score)
+        rows = await cv_repository.get_cvs(ids, columns, user_id=user_id)
+        # Preserve rank order
+        order = {x: i for i, x in enumerate(ids)}
+        results = []
+        for row in sorted(rows, key=lambda x: order.get(str(x["id"]), len(order))):
+            result = project(row, names)
+            result["search_score"] = id_to_score.get(str(row["id"]))
+            results.append(result)
+        response = {
+            "results": results,
+            "total": len(results),
             "page": page,
             "limit": limit,
+            "mode": mode,
         }
-
-    # List all
-    start = (page - 1) * limit
-    r = (
-        supabase.table("cv_documents")
-        .select("*", count="exact")
-        .eq("user_id", user_id)
-        .order("created_at", desc=True)
-        .range(start, start + limit - 1)
-        .execute()
+        await set_cached(key, response, generation)
+        return response
+
+    # List all - keyset pagination on (created_at, id) when a cursor is given,
+    # offset paging by page otherwise (kept for backward compatibility)
+    rows, total = await cv_repository.list_cvs(
+        user_id,
+        select_clause(names, extra=("created_at", "original_file_path")),
+        limit,
+        count_mode=count_mode,
+        keyset=keyset,
+        page=page,
     )
-    count = r.count if hasattr(r, "count") and r.count is not None else len(r.data or [])
+    next_cursor = encode_cursor(rows[-1]) if len(rows) == limit else None
+    results = [project(row, names) for row in rows]
+    if signed_urls:
+        paths = [row["original_file_path"] for row in rows if row.get("original_file_path")]
+        urls = await create_signed_urls(paths, expires_in=settings.SIGNED_URL_EXPIRY) if paths else {}
+        for result, row in zip(results, rows):
+            result["signed_url"] = urls.get(row.get("original_file_path"))
     return {
-        "results": r.data or [],
-        "total": count,
+        "results": results,
+        "total": total,
         "page": page,
         "limit": limit,
+        "next_cursor": next_cursor,
     }
 
 
 @router.get("/{cv_id}/original")
-async def get_cv_original_file(cv_id: str):
+async def get_cv_original_file(cv_id: str, request: Request):
     """
     Stream the original PDF/file from storage.
     Use this for viewing/downloading - more reliable than signed URLs.
+    Supports Range (single range) and If-None-Match; repeat views are served from
+    the local originals cache without touching Storage.
     """
-    supabase = get_supabase()
-    r = supabase.table("cv_documents").select("original_file_path", "original_filename", "mime_type").eq("id", cv_id).execute()
-    if not r.data or len(r.data) == 0:
+    row = await cv_repository.get_cv(cv_id, "original_file_path,original_filename,mime_type")
+    if row is None:
         raise HTTPException(404, "CV not found")
-    row = r.data[0]
     path = row.get("original_file_path")
     if not path:
         raise HTTPException(404, "Original file not stored")
-    content = download_file(path)
-    if content is None:
-        raise HTTPException(404, "Original file not found in storage")
     filename = row.get("original_filename") or "document.pdf"
     mime = row.get("mime_type") or "application/pdf"
-    return Response(
-        content=content,
+    etag = original_etag(path)
+    headers = {
+        "Content-Disposition": f'inline; filename="{filename}"',
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=3600",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    local_path = await get_original_path(path)
+    if local_path is None:
+        return await _proxy_original(path, range_header, mime, headers)
+    try:
+        # Open before answering: the LRU may evict the file at any time, but an open
+        # handle keeps reading the unlinked file
+        f = open(local_path, "rb")
+    except OSError:
+        return await _proxy_original(path, range_header, mime, headers)
+
+    size = os.fstat(f.fileno()).st_size
+    try:
+        byte_range = _parse_range(range_header, size)
+    except ValueError:
+        f.close()
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    start, end = byte_range or (0, size - 1)
+    status_code = 200
+    if byte_range:
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        _iter_file(f, start, end),
+        status_code=status_code,
+        media_type=mime,
+        headers=headers,
+        background=BackgroundTask(f.close),
+    )
+
+
+async def _proxy_original(path: str, range_header: Optional[str], mime: str, headers: dict) -> Response:
+    """
+    Originals cache disabled or unavailable: stream the object from Storage, passing a
+    valid Range header through (Storage answers 206 / 416 itself).
+    """
+    try:
+        upstream = await open_download(path, range_header if _range_spec(range_header) else None)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 416:
+            content_range = e.response.headers.get("content-range", "bytes */*")
+            return Response(status_code=416, headers={**headers, "Content-Range": content_range})
+        logger.warning(f"Storage download failed for {path}: {e}")
+        raise HTTPException(404, "Original file not found in storage")
+    except httpx.HTTPError as e:
+        logger.warning(f"Storage download failed for {path}: {e}")
+        raise HTTPException(502, "Storage unavailable")
+
+    for name in ("content-length", "content-range"):
+        if name in upstream.headers:
+            headers[name.title()] = upstream.headers[name]
+
+    async def body() -> AsyncIterator[bytes]:
+        async for chunk in upstream.aiter_bytes(64 * 1024):
+            yield chunk
+
+    # aclose also runs if the client disconnects before the body is iterated
+    return StreamingResponse(
+        body(),
+        status_code=upstream.status_code,
         media_type=mime,
-        headers={"Content-Disposition": f'inline; filename="{filename}"'},
+        headers=headers,
+        background=BackgroundTask(upstream.aclose),
     )
 
 
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)", re.ASCII)
+
+
+def _range_spec(header: Optional[str]) -> Optional[Tuple[Optional[int], Optional[int]]]:
+    """
+    (first, last) of a single "bytes=" range - first is None for a suffix range ("bytes=-500").
+    None when absent or invalid (multiple ranges, another unit, "bytes=3-1"): the header
+    is then ignored and the whole file sent.
+    """
+    match = _RANGE.fullmatch(header.strip()) if header else None
+    if match is None or match.group(1) == match.group(2) == "":
+        return None
+    first = int(match.group(1)) if match.group(1) else None
+    last = int(match.group(2)) if match.group(2) else None
+    if first is not None and last is not None and last < first:
+        return None
+    return first, last
+
+
+def _parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (start, end) for a single "bytes=" range, None to send the whole file
+    (no header or an invalid one). Raises ValueError if valid but unsatisfiable.
+    """
+    spec = _range_spec(header)
+    if spec is None:
+        return None
+    first, last = spec
+    if first is None:
+        # Suffix range: the last N bytes
+        if last == 0 or size == 0:
+            raise ValueError("Range not satisfiable")
+        return max(size - last, 0), size - 1
+    if first >= size:
+        raise ValueError("Range not satisfiable")
+    return first, size - 1 if last is None else min(last, size - 1)
+
+
+def _iter_file(f: BinaryIO, start: int, end: int, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Bytes start..end (inclusive) of an open file, in chunks. The caller closes it."""
+    f.seek(start)
+    remaining = end - start + 1
+    while remaining > 0:
+        chunk = f.read(min(chunk_size, remaining))
+        if not chunk:
+            return
+        remaining -= len(chunk)
+        yield chunk
+
+
 @router.get("/{cv_id}")
 async def get_cv(cv_id: str):
     """
     Get CV by ID. Returns signed URL for original, raw_text, structured_data, embedding preview.
     """
-    supabase = get_supabase()
-    r = supabase.table("cv_documents").select("*").eq("id", cv_id).execute()
-
-    if not r.data or len(r.data) == 0:
+    row = await cv_repository.get_cv_with_embedding(cv_id)
+    if row is None:
         raise HTTPException(404, "CV not found")
+    embedding = row["embedding"]
 
-    row = r.data[0]
     signed_url = None
     if row.get("original_file_path"):
-        signed_url = create_signed_url(
+        signed_url = await create_signed_url(
             row["original_file_path"],
             expires_in=settings.SIGNED_URL_EXPIRY,
         )
@@ -263,8 +439,8 @@ async def get_cv(cv_id: str):
         "status": row.get("status", "unknown"),
         "quality_score": row.get("quality_score", 0),
         "embedding_preview": {
-            "dimension": len(row["embedding"]) if row.get("embedding") else 0,
-            "first_5": (row["embedding"] or [])[:5],
+            "dimension": len(embedding) if embedding is not None else 0,
+            "first_5": embedding[:5].tolist() if embedding is not None else [],
         },
         "original_filename": row.get("original_filename"),
         "created_at": row.get("created_at"),
@@ -274,19 +450,20 @@ async def get_cv(cv_id: str):
 @router.delete("/{cv_id}")
 async def delete_cv(cv_id: str):
     """Delete CV and its storage file."""
-    supabase = get_supabase()
     user_id = _get_user_id()
 
-    r = supabase.table("cv_documents").select("original_file_path").eq("id", cv_id).eq("user_id", user_id).execute()
-    if not r.data or len(r.data) == 0:
+    row = await cv_repository.get_cv(cv_id, "original_file_path", user_id=user_id)
+    if row is None:
         raise HTTPException(404, "CV not found")
 
-    path = r.data[0].get("original_file_path")
+    path = row.get("original_file_path")
     if path:
         try:
-            supabase.storage.from_("cv-originals").remove([path])
+            await delete_file(path)
         except Exception as e:
             logger.warning(f"Storage delete failed: {e}")
+        evict_original(path)
 
-    supabase.table("cv_documents").delete().eq("id", cv_id).eq("user_id", user_id).execute()
+    await cv_repository.delete_cv(cv_id, user_id)
+    await invalidate_results()
     return {"cv_id": cv_id, "status": "deleted"}
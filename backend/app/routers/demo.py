@@ -2,29 +2,29 @@
 Demo router - load sample PDFs, job offers.
 """
 
-import json
+import asyncio
 import logging
-import uuid
+import time
+from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException
 
-from app.core.supabase_client import get_supabase
-from app.services.ocr_service import extract_text
-from app.services.llm_structuring import structure_cv_flexible
-from app.services.embedding_service import generate_embedding
-from app.services.storage_service import upload_file
+from app.core.config import DEMO_USER_ID, settings
+from app.schemas.pagination import count_option
+from app.services import cv_repository
+from app.services.bulk_writer import BulkWriter
+from app.services.cv_pipeline import process_cv, save_cvs
+from app.services.job_matching_service import load_sample_job_offers, sync_sample_job_offers
+from app.services.result_cache import invalidate_results
 
 router = APIRouter(prefix="/api/demo", tags=["Demo"])
 logger = logging.getLogger(__name__)
 
-DEMO_USER_ID = "00000000-0000-0000-0000-000000000000"
-
 # Project root (backend/app/routers/demo.py -> project root)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
 SAMPLES_RESUMES_DIR = PROJECT_ROOT / "samples" / "resumes"
-JOB_OFFERS_PATH = PROJECT_ROOT / "samples" / "job_offers.json"
 
 # Fallback: 4 text-only CVs if PDFs not found (original demo)
 DEMO_CV_TEXTS = [
@@ -64,42 +64,6 @@ Kubernetes, Terraform, Docker, Jenkins.""",
 ]
 
 
-def _build_structured(llm_result: dict) -> dict:
-    data = llm_result.get("data", {}) or {}
-    exp, edu, skills = [], [], []
-    for s in data.get("sections", []):
-        t = s.get("section_type", "")
-        c = s.get("content", {}) or {}
-        if t == "experience":
-            exp.extend(c.get("experiences", []))
-        elif t in ("formation", "education"):
-            edu.extend(c.get("education", []))
-        elif t in ("compétences", "skills"):
-            skills.extend(c.get("skills", []))
-    return {
-        "candidate_info": data.get("candidate_info", {}) or {},
-        "sections": data.get("sections", []) or [],
-        "experiences": exp,
-        "education": edu,
-        "skills": skills,
-        "career_summary": data.get("career_summary", {}) or {},
-    }
-
-
-def _quality(structured: dict) -> float:
-    s = 0.0
-    ci = structured.get("candidate_info", {}) or {}
-    if ci.get("full_name"):
-        s += 0.3
-    if ci.get("email"):
-        s += 0.2
-    if structured.get("experiences"):
-        s += 0.3
-    if structured.get("skills"):
-        s += 0.2
-    return min(s, 1.0)
-
-
 def _get_sample_pdf_paths() -> List[Path]:
     """Get list of sample PDF paths. Returns empty if dir missing."""
     if not SAMPLES_RESUMES_DIR.exists():
@@ -110,72 +74,28 @@ def _get_sample_pdf_paths() -> List[Path]:
 async def _process_one_cv(
     file_content: bytes,
     filename: str,
-    supabase,
     source: str = "sample",
+    raw_text: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Run full pipeline on one CV. Returns cv_id and step_log."""
-    from app.routers.cv import _build_structured_data, _calculate_quality_score
-
-    cv_id = str(uuid.uuid4())
-    step_log = {"filename": filename, "cv_id": cv_id, "steps": []}
-
-    # 1. Upload to storage
-    try:
-        storage_path = await upload_file(
-            file_content=file_content,
-            filename=filename,
-            user_id=DEMO_USER_ID,
-            cv_id=cv_id,
-        )
-        step_log["steps"].append({"name": "Storage", "status": "completed"})
-    except Exception as e:
-        logger.warning(f"Storage upload failed for {filename}: {e}")
-        storage_path = f"{DEMO_USER_ID}/{cv_id}/{filename}"
-        step_log["steps"].append({"name": "Storage", "status": "skipped", "note": str(e)})
-
-    # 2. OCR
-    ocr_result = await extract_text(
-        file_content=file_content,
-        filename=filename,
-        content_type="application/pdf",
+    """
+    Run the shared CV pipeline on one demo CV, without inserting it.
+    Returns cv_id, row and step_log. The upload is best-effort (reported as skipped
+    on failure); text-only CVs skip OCR and the upload.
+    """
+    result = await process_cv(
+        file_content,
+        filename,
+        "application/pdf",
+        user_id=DEMO_USER_ID,
+        source=source,
+        gdpr_consent=True,
+        raw_text=raw_text,
+        upload=raw_text is None,
+        require_upload=False,
+        save=False,
     )
-    raw_text = ocr_result.get("raw_text", "") or ""
-    step_log["steps"].append({"name": "OCR", "status": "completed"})
-
-    # 3. LLM
-    llm_result = await structure_cv_flexible(raw_text, ocr_result)
-    structured_data = _build_structured_data(llm_result)
-    step_log["steps"].append({
-        "name": "LLM",
-        "status": "completed" if llm_result.get("success") else "partial",
-    })
-
-    # 4. Embedding
-    embedding = await generate_embedding(raw_text)
-    step_log["steps"].append({"name": "Embedding", "status": "completed", "dim": len(embedding)})
-
-    # 5. Quality
-    quality_score = _calculate_quality_score(structured_data)
-
-    # 6. Save to DB
-    row = {
-        "id": cv_id,
-        "user_id": DEMO_USER_ID,
-        "original_file_path": storage_path,
-        "raw_text": raw_text,
-        "structured_data": structured_data,
-        "embedding": embedding,
-        "quality_score": quality_score,
-        "status": "active",
-        "source_type": source,
-        "original_filename": filename,
-        "mime_type": "application/pdf",
-        "file_size_bytes": len(file_content),
-        "gdpr_consent": True,
-    }
-    supabase.table("cv_documents").insert(row).execute()
-
-    return {"cv_id": cv_id, "step_log": step_log}
+    step_log = {"filename": filename, "cv_id": result["cv_id"], "steps": result["steps"]}
+    return {"cv_id": result["cv_id"], "row": result["row"], "step_log": step_log}
 
 
 @router.get("/load")
@@ -184,11 +104,10 @@ async def load_demo_data(use_pdfs: bool = True):
     Load sample data.
     - use_pdfs=true: Process 10 sample PDFs from samples/resumes/ (full pipeline)
     - use_pdfs=false: Process 4 text CVs (original demo, no PDFs)
+    CVs are processed concurrently (DEMO_LOAD_CONCURRENCY) and written in batches by
+    a BulkWriter. The response reports wall time and time spent per stage.
     """
-    supabase = get_supabase()
-    steps: List[Dict[str, Any]] = []
-    cv_ids: List[str] = []
-
+    t0 = time.perf_counter()
     if use_pdfs:
         pdf_paths = _get_sample_pdf_paths()
         if not pdf_paths:
@@ -196,94 +115,110 @@ async def load_demo_data(use_pdfs: bool = True):
             use_pdfs = False
 
     if use_pdfs:
-        pdf_paths = _get_sample_pdf_paths()
-        for i, path in enumerate(pdf_paths):
+        jobs = [
+            {"filename": path.name, "path": path, "source": "sample", "raw_text": None}
+            for path in pdf_paths
+        ]
+    else:
+        # Text-only fallback (original 4 CVs)
+        jobs = [
+            {"filename": f"demo_cv_{i + 1}.pdf", "cv_index": i + 1, "source": "demo", "raw_text": raw_text}
+            for i, raw_text in enumerate(DEMO_CV_TEXTS)
+        ]
+
+    semaphore = asyncio.Semaphore(max(1, settings.DEMO_LOAD_CONCURRENCY))
+    # Rows are written in batches while the remaining CVs are still being processed
+    writer = BulkWriter(save_cvs)
+
+    async def run(job: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
             try:
-                file_content = path.read_bytes()
+                raw_text = job["raw_text"]
+                file_content = raw_text.encode() if raw_text is not None else job["path"].read_bytes()
                 result = await _process_one_cv(
                     file_content=file_content,
-                    filename=path.name,
-                    supabase=supabase,
-                    source="sample",
+                    filename=job["filename"],
+                    source=job["source"],
+                    raw_text=raw_text,
                 )
-                cv_ids.append(result["cv_id"])
-                steps.append(result["step_log"])
+                if "cv_index" in job:
+                    result["step_log"] = {"cv_index": job["cv_index"], **result["step_log"]}
+                result["written"] = writer.add(result["row"])
+                return result
             except Exception as e:
-                logger.error(f"Failed to process {path.name}: {e}")
-                steps.append({
-                    "filename": path.name,
+                logger.error(f"Failed to process {job['filename']}: {e}")
+                return {"step_log": {
+                    "filename": job["filename"],
                     "error": str(e),
                     "steps": [{"name": "error", "status": "failed"}],
-                })
-    else:
-        # Text-only fallback (original 4 CVs)
-        for i, raw_text in enumerate(DEMO_CV_TEXTS):
-            cv_id = str(uuid.uuid4())
-            step_log = {"cv_index": i + 1, "cv_id": cv_id, "steps": []}
-
-            ocr_result = {"raw_text": raw_text, "success": True}
-            llm_result = await structure_cv_flexible(raw_text, ocr_result)
-            structured = _build_structured(llm_result)
-            quality = _quality(structured)
-            embedding = await generate_embedding(raw_text)
-
-            filename = f"demo_cv_{i + 1}.pdf"
-            storage_path = f"{DEMO_USER_ID}/{cv_id}/{filename}"
-
-            row = {
-                "id": cv_id,
-                "user_id": DEMO_USER_ID,
-                "original_file_path": storage_path,
-                "raw_text": raw_text,
-                "structured_data": structured,
-                "embedding": embedding,
-                "quality_score": quality,
-                "status": "active",
-                "source_type": "demo",
-                "original_filename": filename,
-                "mime_type": "application/pdf",
-                "file_size_bytes": len(raw_text.encode()),
-                "gdpr_consent": True,
-            }
-            supabase.table("cv_documents").insert(row).execute()
-            cv_ids.append(cv_id)
-            step_log["steps"] = [
-                {"name": "OCR", "status": "completed"},
-                {"name": "LLM", "status": "completed"},
-                {"name": "Embedding", "status": "completed", "dim": len(embedding)},
-            ]
-            steps.append(step_log)
+                }}
+
+    results = await asyncio.gather(*(run(job) for job in jobs))
+    t_flush = time.perf_counter()
+    await writer.close()
+
+    steps: List[Dict[str, Any]] = []
+    cv_ids: List[str] = []
+    for result in results:
+        step_log = result["step_log"]
+        if "written" in result:
+            try:
+                await result["written"]
+                cv_ids.append(result["cv_id"])
+            except Exception as e:
+                logger.error(f"Failed to store {step_log['filename']}: {e}")
+                step_log = {**step_log, "error": str(e)}
+                step_log["steps"] = step_log["steps"] + [{"name": "insert", "status": "failed", "note": str(e)}]
+        steps.append(step_log)
+
+    stage_ms: Dict[str, float] = defaultdict(float)
+    for step_log in steps:
+        for stage in step_log["steps"]:
+            stage_ms[stage["name"]] += stage.get("duration_ms", 0.0)
+    # Only the final flush is on the critical path; earlier batches overlapped processing
+    stage_ms["insert"] += (time.perf_counter() - t_flush) * 1000
+
+    if cv_ids:
+        await invalidate_results()
+
+    # Sample job offers: embedded once, matched against the pool on first load
+    try:
+        job_offers_added = await sync_sample_job_offers(user_id=DEMO_USER_ID)
+    except Exception as e:
+        logger.warning(f"Sample job offers not stored: {e}")
+        job_offers_added = 0
 
     return {
         "message": f"Loaded {len(cv_ids)} CVs",
         "cv_ids": cv_ids,
         "steps": steps,
         "total": len(cv_ids),
+        "job_offers_added": job_offers_added,
+        "wall_time_ms": round((time.perf_counter() - t0) * 1000, 1),
+        # Summed over CVs - compare with wall_time_ms to see the overlap
+        "stage_time_ms": {name: round(ms, 1) for name, ms in stage_ms.items()},
     }
 
 
 @router.get("/job-offers")
 async def get_job_offers():
     """Return example job offers for matching."""
-    if not JOB_OFFERS_PATH.exists():
-        return {"job_offers": []}
     try:
-        data = json.loads(JOB_OFFERS_PATH.read_text(encoding="utf-8"))
-        return {"job_offers": data}
+        return {"job_offers": load_sample_job_offers()}
     except Exception as e:
         logger.error(f"Failed to load job offers: {e}")
         return {"job_offers": []}
 
 
 @router.get("/status")
-async def demo_status():
-    """Return count of demo/sample CVs in DB."""
-    supabase = get_supabase()
-    r = (
-        supabase.table("cv_documents")
-        .select("id", count="exact")
-        .in_("source_type", ["demo", "sample"])
-        .execute()
-    )
-    count = getattr(r, "count", None) or len(r.data or [])
-    return {"demo_count": count, "total": count}
+async def demo_status(count: str = "exact"):
+    """
+    Return count of demo/sample CVs in DB.
+    count: "exact" or "planned"/"estimated" for a planner estimate on large tables.
+    """
+    try:
+        count_mode = count_option(count) or "exact"
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    total = await cv_repository.count_cvs(["demo", "sample"], count_mode)
+    return {"demo_count": total, "total": total}
@@ -0,0 +1,72 @@
+"""
+Jobs router - stored job offers and their precomputed candidate matches.
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+
+from app.core.config import DEMO_USER_ID, settings
+from app.schemas.projections import parse_fields, project, select_clause
+from app.schemas.requests import JobOfferCreate
+from app.services.job_matching_service import (
+    get_job_matches,
+    get_job_offers,
+    refresh_matches_for_job,
+    resolve_job_id,
+    upsert_job_offers,
+)
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+logger = logging.getLogger(__name__)
+
+
+@router.post("")
+async def create_job_offer(job: JobOfferCreate):
+    """Store a job offer with its embedding and compute its top-k candidates once."""
+    stored = await upsert_job_offers([job.model_dump()], user_id=DEMO_USER_ID)
+    if not stored:
+        raise HTTPException(500, "Job offer could not be stored")
+    return stored[0]
+
+
+@router.get("")
+async def list_job_offers(status: str = "open"):
+    """List job offers (without embeddings)."""
+    offers = await get_job_offers(status)
+    return {"job_offers": offers, "total": len(offers)}
+
+
+@router.get("/{job_id}/matches")
+async def job_matches(
+    job_id: str,
+    limit: int = 20,
+    fields: Optional[str] = None,
+):
+    """
+    Precomputed top candidates for a job - a single indexed read of job_matches.
+    job_id: uuid or external id ("job-003").
+    fields: comma-separated CV columns (default: compact summary).
+    """
+    try:
+        names = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    stored_id = await resolve_job_id(job_id)
+    if stored_id is None:
+        raise HTTPException(404, "Job offer not found")
+    results = await get_job_matches(stored_id, select_clause(names), min(limit, settings.JOB_MATCHES_TOP_K))
+    for result in results:
+        result["cv"] = project(result["cv"], names)
+    return {"job_id": job_id, "results": results, "total": len(results)}
+
+
+@router.post("/{job_id}/refresh")
+async def refresh_job_matches(job_id: str):
+    """Recompute a job's matches against the whole CV pool."""
+    stored_id = await resolve_job_id(job_id)
+    if stored_id is None:
+        raise HTTPException(404, "Job offer not found")
+    count = await refresh_matches_for_job(stored_id)
+    return {"job_id": job_id, "matches": count}
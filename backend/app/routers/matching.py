@@ -2,13 +2,24 @@
 Matching router - semantic matching for job offers.
 """
 
+import json
 import logging
+from collections import defaultdict
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from app.core.supabase_client import get_supabase
-from app.services.embedding_service import generate_embedding
+from app.core.config import settings
+from app.schemas.filters import SEARCHABLE_STATUSES, build_match_filters
+from app.schemas.projections import parse_fields, project, select_clause
+from app.schemas.requests import BatchMatchRequest
+from app.services import cv_repository
+from app.services.embedding_service import generate_embedding, generate_embeddings
+from app.services.job_matching_service import job_embedding_text
+from app.services.result_cache import cache_key, get_cached, normalize_query, set_cached
+from app.services.skill_normalizer import normalize_skills
+from app.services.skills_service import find_cv_ids_by_skills
 
 router = APIRouter(prefix="/api/matching", tags=["Matching"])
 logger = logging.getLogger(__name__)
@@ -19,44 +30,143 @@ async def semantic_matching(
     job_description: str,
     required_skills: Optional[List[str]] = None,
     top_n: int = 10,
+    fields: Optional[str] = None,
+    status: Optional[List[str]] = Query(None),
+    source_type: Optional[List[str]] = Query(None),
+    seniority: Optional[str] = None,
+    location: Optional[str] = None,
+    skills: Optional[List[str]] = Query(None),
+    any_skills: Optional[List[str]] = Query(None),
 ):
     """
     Semantic matching: find CVs most similar to job description.
     Uses pgvector cosine similarity.
+    fields: comma-separated CV columns (default: compact summary).
+    status/source_type/seniority/location: filters applied inside the vector
+    index scan - the result is a full top_n of matching CVs. status defaults to
+    active (no half-processed or failed CVs).
+    skills (all required) / any_skills: resolved through the normalized cv_skills
+    index into a CV id prefilter for the same scan.
     """
-    query_text = job_description
-    if required_skills:
-        query_text += " " + " ".join(required_skills or [])
+    try:
+        names = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    columns = select_clause(names)
+    status = status or list(SEARCHABLE_STATUSES)
 
-    query_embedding = await generate_embedding(query_text)
+    # Keyed on the embedded text itself: skill order changes the embedding, so the skills
+    # must not go through cache_key's order-insensitive list handling
+    embedding_text = job_embedding_text(job_description, required_skills)
+    key = cache_key(
+        "semantic_matching", text=normalize_query(embedding_text),
+        top_n=top_n, columns=columns, status=status, source_type=source_type,
+        seniority=seniority and normalize_query(seniority), location=location and normalize_query(location),
+        skills=normalize_skills(skills) or None, any_skills=normalize_skills(any_skills) or None,
+    )
+    cached, generation = await get_cached(key)
+    if cached is not None:
+        return {**cached, "query": job_description}
 
-    supabase = get_supabase()
-    r = supabase.rpc(
+    cv_ids = None
+    if skills or any_skills:
+        cv_ids = await find_cv_ids_by_skills(all_skills=skills, any_skills=any_skills)
+        if not cv_ids:
+            return {"query": job_description, "results": [], "total": 0}
+
+    query_embedding = await generate_embedding(embedding_text)
+
+    matches = await cv_repository.rpc(
         "match_cv_documents",
         {
             "query_embedding": query_embedding,
             "match_threshold": 0.3,
             "match_count": top_n,
+            # HNSW returns at most ef_search rows
+            "ef_search": max(settings.MATCHING_EF_SEARCH, top_n),
+            "filters": build_match_filters(
+                status=status,
+                source_type=source_type,
+                seniority=seniority,
+                location=location,
+                cv_ids=cv_ids,
+            ),
         },
-    ).execute()
+    )
 
-    if not hasattr(r, "data") or not r.data:
+    if not matches:
         return {"query": job_description, "results": [], "total": 0}
 
-    ids = [row["id"] for row in r.data]
-    rows = supabase.table("cv_documents").select("*").in_("id", ids).execute()
+    ids = [row["id"] for row in matches]
+    cv_list = await cv_repository.get_cvs(ids, columns)
 
     # Preserve similarity order
-    id_to_sim = {str(row["id"]): row["similarity"] for row in r.data}
-    cv_list = rows.data or []
+    id_to_sim = {str(row["id"]): row["similarity"] for row in matches}
     cv_list.sort(key=lambda x: id_to_sim.get(str(x["id"]), 0), reverse=True)
 
     results = []
     for cv in cv_list:
         cv_id = str(cv["id"])
         results.append({
-            "cv": cv,
+            "cv": project(cv, names),
             "similarity_score": id_to_sim.get(cv_id, 0),
         })
 
-    return {"query": job_description, "results": results, "total": len(results)}
+    response = {"query": job_description, "results": results, "total": len(results)}
+    await set_cached(key, response, generation)
+    return response
+
+
+@router.post("/batch")
+async def batch_matching(request: BatchMatchRequest):
+    """
+    Batch matching: top-k active CVs for many job descriptions.
+    All descriptions are embedded in one batch; each chunk of jobs is matched by a
+    single set-returning RPC. Streams one NDJSON line per job as its chunk completes.
+    """
+    try:
+        names = parse_fields(request.fields)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    columns = select_clause(names)
+
+    jobs = request.jobs
+    embeddings = await generate_embeddings(
+        [job_embedding_text(job.description, job.required_skills) for job in jobs]
+    )
+    chunk_size = max(1, settings.MATCHING_BATCH_CHUNK)
+
+    async def _stream():
+        for start in range(0, len(jobs), chunk_size):
+            chunk = jobs[start:start + chunk_size]
+            matches = await cv_repository.rpc(
+                "match_cv_documents_batch",
+                {
+                    "query_embeddings": embeddings[start:start + chunk_size],
+                    "match_threshold": request.match_threshold,
+                    "match_count": request.top_n,
+                    "ef_search": max(settings.MATCHING_EF_SEARCH, request.top_n),
+                    "filters": build_match_filters(status=list(SEARCHABLE_STATUSES)),
+                },
+            )
+
+            # One row fetch for every CV matched by any job in the chunk
+            ids = list({str(m["id"]) for m in matches})
+            cvs = {str(row["id"]): project(row, names) for row in await cv_repository.get_cvs(ids, columns)}
+
+            by_job = defaultdict(list)
+            for m in matches:
+                cv = cvs.get(str(m["id"]))
+                if cv is not None:
+                    by_job[m["query_index"]].append({"cv": cv, "similarity_score": m["similarity"]})
+
+            for offset, job in enumerate(chunk):
+                results = by_job.get(offset, [])
+                yield json.dumps({
+                    "job_index": start + offset,
+                    "job_id": job.id,
+                    "results": results,
+                    "total": len(results),
+                }) + "\n"
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
@@ -2,60 +2,208 @@
 Scoring router - multi-criteria candidate scoring.
 """
 
+import asyncio
+import heapq
+import json
 import logging
-from typing import List, Optional
+from typing import AsyncIterator, Awaitable, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from app.core.supabase_client import get_supabase
+from app.core.config import settings
+from app.schemas.projections import parse_fields, project, select_clause
+from app.services import cv_repository
+from app.services.job_matching_service import get_job_offer
+from app.services.scoring_engine import CRITERIA, resolve_weights, score_candidates_matrix
+from app.services.skill_normalizer import normalize_skills
+from app.services.skills_service import find_cv_ids_by_skills
 
 router = APIRouter(prefix="/api/scoring", tags=["Scoring"])
 logger = logging.getLogger(__name__)
 
+_SCORING_FIELDS = ("skills", "experiences", "education", "quality_score")
+
 
 @router.post("/candidates")
 async def score_candidates(
     cv_ids: List[str],
     job_id: Optional[str] = None,
     criteria: Optional[dict] = None,
+    fields: Optional[str] = None,
+    top_n: Optional[int] = None,
+    skills: Optional[List[str]] = Query(None),
+    any_skills: Optional[List[str]] = Query(None),
+    stream: bool = False,
 ):
     """
     Score candidates by multi-criteria (skills match, experience, etc.).
+    job_id: job_offers id or sample id ("job-001") - skills are scored against its
+    required_skills after alias normalization ("JS" -> "javascript").
+    criteria: weights for skills/experience/education/quality (missing keys use defaults).
+    top_n: return only the best N candidates.
+    skills / any_skills: keep only candidates having all / any of these skills
+    (normalized cv_skills index) before scoring.
+    fields: comma-separated CV columns returned per result (default: compact summary).
+    stream: return NDJSON - one line per candidate as each chunk is scored, then a
+    summary line with the overall top_n.
     """
     if not cv_ids:
         return {"results": [], "total": 0}
 
-    weights = criteria or {
-        "skills": 0.4,
-        "experience": 0.3,
-        "education": 0.2,
-        "quality": 0.1,
-    }
+    try:
+        names = parse_fields(fields)
+        weights = resolve_weights(criteria)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    if skills or any_skills:
+        allowed = set(await find_cv_ids_by_skills(all_skills=skills, any_skills=any_skills))
+        cv_ids = [cv_id for cv_id in cv_ids if cv_id in allowed]
+        if not cv_ids:
+            return {"results": [], "total": 0, "job_id": job_id}
+
+    job_skills = None
+    if job_id:
+        job = await get_job_offer(job_id)
+        if job is None:
+            raise HTTPException(404, "Job offer not found")
+        job_skills = job.get("required_skills") or []
+
+    scorer = _score_in_database if settings.SCORING_IN_DATABASE else _score_in_api
+
+    # Streaming emits every candidate, so chunks are only cut to top_n when buffering
+    chunk_limit = None if stream else top_n
+
+    def score_chunk(chunk: List[str]) -> Awaitable[List[dict]]:
+        return scorer(chunk, weights, job_skills, chunk_limit, names)
+
+    cv_ids = list(dict.fromkeys(cv_ids))
+    if stream:
+        return StreamingResponse(
+            _stream_results(cv_ids, score_chunk, top_n, job_id),
+            media_type="application/x-ndjson",
+        )
+
+    # Running top-k: memory stays O(top_n) whatever the number of ids
+    top = _TopK(top_n)
+    async for chunk_results in _scored_chunks(cv_ids, score_chunk):
+        top.extend(chunk_results)
+    results = top.sorted()
+    return {"results": results, "total": len(results), "scored": top.seen, "job_id": job_id}
+
+
+class _TopK:
+    """Best-n results by score (all results if n is None), via a min-heap."""
+
+    def __init__(self, n: Optional[int]):
+        self.n = n
+        self.seen = 0
+        self._heap: List[tuple] = []
+
+    def extend(self, results: List[dict]) -> None:
+        for result in results:
+            self.seen += 1
+            # seen as tie-breaker: earlier results win ties, dicts are never compared
+            item = (result["score"], -self.seen, result)
+            if self.n is None or len(self._heap) < self.n:
+                heapq.heappush(self._heap, item)
+            elif item > self._heap[0]:
+                heapq.heapreplace(self._heap, item)
+
+    def sorted(self) -> List[dict]:
+        return [item[2] for item in sorted(self._heap, reverse=True)]
+
+
+async def _scored_chunks(cv_ids: List[str], score_chunk) -> AsyncIterator[List[dict]]:
+    """
+    Score ids in chunks of SCORING_CHUNK_SIZE, at most SCORING_CONCURRENCY at a time.
+    Bounded chunks keep every request under PostgREST URL/body limits. Yields each
+    chunk's results as soon as it completes.
+    """
+    size = max(1, settings.SCORING_CHUNK_SIZE)
+    semaphore = asyncio.Semaphore(max(1, settings.SCORING_CONCURRENCY))
+
+    async def run(chunk: List[str]) -> List[dict]:
+        async with semaphore:
+            return await score_chunk(chunk)
+
+    tasks = [asyncio.create_task(run(cv_ids[i:i + size])) for i in range(0, len(cv_ids), size)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _stream_results(cv_ids: List[str], score_chunk, top_n: Optional[int], job_id: Optional[str]):
+    """NDJSON: one line per scored candidate as chunks complete, then a summary line."""
+    top = _TopK(top_n)
+    async for chunk_results in _scored_chunks(cv_ids, score_chunk):
+        top.extend(chunk_results)
+        for result in chunk_results:
+            yield json.dumps({"type": "result", **result}) + "\n"
+    yield json.dumps({
+        "type": "summary",
+        "scored": top.seen,
+        "job_id": job_id,
+        "top": [{"cv_id": r["cv_id"], "score": r["score"]} for r in top.sorted()],
+    }) + "\n"
+
+
+async def _score_in_database(cv_ids, weights, job_skills, top_n, names) -> List[dict]:
+    """Score with the score_cv_documents RPC - only ids, scores and breakdowns cross the wire."""
+    required = normalize_skills(job_skills)
+    scored = await cv_repository.rpc(
+        "score_cv_documents",
+        {
+            "cv_ids": cv_ids,
+            "w_skills": weights["skills"],
+            "w_experience": weights["experience"],
+            "w_education": weights["education"],
+            "w_quality": weights["quality"],
+            "required_skills": required if job_skills is not None else None,
+            "result_limit": top_n,
+        },
+    )
+    if not scored:
+        return []
 
-    supabase = get_supabase()
-    rows = supabase.table("cv_documents").select("*").in_("id", cv_ids).execute()
-    cvs = rows.data or []
+    # Projected CV fields for the returned candidates only
+    ids = [str(s["id"]) for s in scored]
+    rows = await cv_repository.get_cvs(ids, select_clause(names))
+    cvs = {str(row["id"]): project(row, names) for row in rows}
 
     results = []
-    for cv in cvs:
-        structured = cv.get("structured_data", {}) or {}
-        skills_score = min(len(structured.get("skills", [])) / 10.0, 1.0) * weights["skills"]
-        exp_score = min(len(structured.get("experiences", [])) / 5.0, 1.0) * weights["experience"]
-        edu_score = min(len(structured.get("education", [])) / 3.0, 1.0) * weights["education"]
-        quality_score = (cv.get("quality_score") or 0) * weights["quality"]
-
-        total = skills_score + exp_score + edu_score + quality_score
+    for s in scored:
+        matched = s.get("matched_skills") or []
         results.append({
-            "cv_id": str(cv["id"]),
-            "cv": cv,
-            "score": round(min(total, 1.0), 2),
-            "breakdown": {
-                "skills": round(skills_score, 2),
-                "experience": round(exp_score, 2),
-                "education": round(edu_score, 2),
-                "quality": round(quality_score, 2),
-            },
+            "cv_id": str(s["id"]),
+            "cv": cvs.get(str(s["id"])),
+            "score": s["score"],
+            "breakdown": {c: s[c] for c in CRITERIA},
+            "matched_skills": matched,
+            "missing_skills": [skill for skill in required if skill not in matched],
         })
+    return results
+
 
-    results.sort(key=lambda x: x["score"], reverse=True)
-    return {"results": results, "total": len(results)}
+async def _score_in_api(cv_ids, weights, job_skills, top_n, names) -> List[dict]:
+    """Score with the NumPy engine (before migration 008 is applied)."""
+    # Scoring only needs skills, list lengths + quality - never fetch raw_text/embedding for it
+    columns = select_clause(names, extra=_SCORING_FIELDS)
+    cvs = await cv_repository.get_cvs(cv_ids, columns)
+
+    results = []
+    for s in score_candidates_matrix(cvs, weights, job_skills=job_skills, top_k=top_n):
+        cv = cvs[s["index"]]
+        results.append({
+            "cv_id": str(cv["id"]),
+            "cv": project(cv, names),
+            "score": s["score"],
+            "breakdown": s["breakdown"],
+            "matched_skills": s["matched_skills"],
+            "missing_skills": s["missing_skills"],
+        })
+    return results
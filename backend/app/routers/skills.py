@@ -0,0 +1,39 @@
+"""
+Skills router - indexed skill lookups over the normalized cv_skills table.
+"""
+
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.config import DEMO_USER_ID
+from app.services.skills_service import find_cv_ids_by_skills, suggest_skills
+
+router = APIRouter(prefix="/api/skills", tags=["Skills"])
+logger = logging.getLogger(__name__)
+
+
+@router.get("/search")
+async def search_by_skills(
+    all_skills: Optional[List[str]] = Query(None, alias="all"),
+    any_skills: Optional[List[str]] = Query(None, alias="any"),
+    limit: Optional[int] = None,
+):
+    """
+    CV ids matching a skill query: every skill in `all` AND at least one in `any`.
+    Skills are alias-normalized ("k8s" -> "kubernetes"). Ids are ranked by matched count
+    and can be passed to /api/scoring/candidates or used as a matching prefilter.
+    """
+    if not all_skills and not any_skills:
+        raise HTTPException(400, "Provide at least one skill in 'all' or 'any'")
+    cv_ids = await find_cv_ids_by_skills(all_skills=all_skills, any_skills=any_skills, user_id=DEMO_USER_ID, limit=limit)
+    return {"cv_ids": cv_ids, "total": len(cv_ids)}
+
+
+@router.get("/suggest")
+async def skill_suggestions(q: str, limit: int = 10):
+    """Known skills similar to q, with the number of CVs having each."""
+    if not q.strip():
+        return {"suggestions": []}
+    return {"suggestions": await suggest_skills(q, limit)}
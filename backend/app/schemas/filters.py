@@ -0,0 +1,33 @@
+"""
+Structured filters for vector search - passed to match_cv_documents as `filters`
+and applied inside the index scan (see migration 005).
+"""
+
+from typing import Any, Dict, List, Optional
+
+# Statuses search and matching return by default - 'processing' rows (ingest still
+# running, embedding already checkpointed) and failed 'error' rows are left out
+SEARCHABLE_STATUSES = ("active",)
+
+
+def build_match_filters(
+    user_id: Optional[str] = None,
+    status: Optional[List[str]] = None,
+    source_type: Optional[List[str]] = None,
+    seniority: Optional[str] = None,
+    location: Optional[str] = None,
+    skills: Optional[List[str]] = None,
+    cv_ids: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Build the filters JSON for match_cv_documents, dropping empty values."""
+    filters: Dict[str, Any] = {
+        "user_id": user_id,
+        "status": [s for s in (status or []) if s] or None,
+        "source_type": [s for s in (source_type or []) if s] or None,
+        "seniority": (seniority or "").strip() or None,
+        "location": (location or "").strip() or None,
+        "skills": [s.strip() for s in (skills or []) if s and s.strip()] or None,
+        # Candidate set from a prefilter (e.g. find_cvs_by_skills); [] means no candidates
+        "cv_ids": list(cv_ids) if cv_ids is not None else None,
+    }
+    return {k: v for k, v in filters.items() if v is not None}
@@ -0,0 +1,49 @@
+"""
+Keyset (cursor) pagination helpers for list endpoints.
+Cursors are opaque base64url tokens over the (created_at, id) sort key.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+# PostgREST count modes: exact = COUNT(*), planned = planner estimate,
+# estimated = exact below the configured threshold then planned, none = skip
+COUNT_MODES = ("exact", "planned", "estimated", "none")
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Encode the sort key of the last row on a page."""
+    payload = json.dumps({"c": row["created_at"], "i": str(row["id"])}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor into (created_at, id). Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        # Validate both parts - they are interpolated into a PostgREST filter
+        created_at = datetime.fromisoformat(str(payload["c"])).isoformat()
+        row_id = str(uuid.UUID(str(payload["i"])))
+        return created_at, row_id
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_filter(cursor: str) -> str:
+    """
+    PostgREST or-filter selecting rows strictly after the cursor
+    for ORDER BY created_at DESC, id DESC.
+    """
+    created_at, row_id = decode_cursor(cursor)
+    return f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id})'
+
+
+def count_option(count: str) -> Optional[str]:
+    """Map a ?count= value to the postgrest-py count argument."""
+    if count not in COUNT_MODES:
+        raise ValueError(f"Unknown count mode: {count}. Allowed: {', '.join(COUNT_MODES)}")
+    return None if count == "none" else count
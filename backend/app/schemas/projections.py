@@ -0,0 +1,104 @@
+"""
+Field projections for cv_documents - pushed down into the Supabase select.
+List endpoints return a compact summary by default; callers opt into heavy
+columns (raw_text, structured_data, embedding) with ?fields=.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+# Public field name -> PostgREST select expression
+CV_FIELDS: Dict[str, str] = {
+    "id": "id",
+    "user_id": "user_id",
+    "status": "status",
+    "quality_score": "quality_score",
+    "source_type": "source_type",
+    "original_filename": "original_filename",
+    "original_file_path": "original_file_path",
+    "mime_type": "mime_type",
+    "file_size_bytes": "file_size_bytes",
+    "gdpr_consent": "gdpr_consent",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+    "processing_error": "processing_error",
+    "completed_stages": "completed_stages",
+    "prompt_version": "prompt_version",
+    "llm_model": "llm_model",
+    "embedding_model": "embedding_model",
+    "raw_text": "raw_text",
+    "structured_data": "structured_data",
+    "embedding": "embedding",
+    # structured_data sub-paths, selected alone and returned nested (see project)
+    "candidate_info": "candidate_info:structured_data->candidate_info",
+    "skills": "skills:structured_data->skills",
+    "experiences": "experiences:structured_data->experiences",
+    "education": "education:structured_data->education",
+    "career_summary": "career_summary:structured_data->career_summary",
+}
+
+# Sub-paths of structured_data - project() nests them back under "structured_data"
+STRUCTURED_DATA_FIELDS = ("candidate_info", "skills", "experiences", "education", "career_summary")
+
+# What list pages render: name, file, status, skills chips
+CV_SUMMARY_FIELDS = (
+    "id",
+    "status",
+    "quality_score",
+    "source_type",
+    "original_filename",
+    "created_at",
+    "candidate_info",
+    "skills",
+)
+
+# Everything except the embedding
+CV_FULL_FIELDS = tuple(f for f in CV_FIELDS if f != "embedding")
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """
+    Parse a ?fields= value into a list of field names.
+    Empty -> summary view, "full" or "*" -> all columns except embedding.
+    Raises ValueError on unknown field names.
+    """
+    if not fields or not fields.strip():
+        return list(CV_SUMMARY_FIELDS)
+    value = fields.strip()
+    if value in ("*", "full"):
+        return list(CV_FULL_FIELDS)
+    if value == "summary":
+        return list(CV_SUMMARY_FIELDS)
+
+    names = [f.strip() for f in value.split(",") if f.strip()]
+    unknown = [f for f in names if f not in CV_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(CV_FIELDS)}"
+        )
+    if "id" not in names:
+        names.insert(0, "id")
+    return list(dict.fromkeys(names))
+
+
+def select_clause(names: Iterable[str], extra: Iterable[str] = ()) -> str:
+    """Build the select string for the given field names (plus internal extras)."""
+    ordered = list(dict.fromkeys([*names, *extra]))
+    return ",".join(CV_FIELDS[n] for n in ordered)
+
+
+def project(row: Dict[str, Any], names: Iterable[str]) -> Dict[str, Any]:
+    """
+    Keep only the requested fields of a row (drops internal extras). structured_data
+    sub-paths are nested under "structured_data", the shape clients read from the
+    full column ({"structured_data": {"candidate_info": ..., "skills": ...}}).
+    """
+    names = list(names)
+    full_structured = "structured_data" in names
+    out: Dict[str, Any] = {}
+    for n in names:
+        if n in STRUCTURED_DATA_FIELDS:
+            if not full_structured:
+                out.setdefault("structured_data", {})[n] = row.get(n)
+        else:
+            out[n] = row.get(n)
+    return out
@@ -0,0 +1,32 @@
+"""
+Request bodies for endpoints that take more than a few query parameters.
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchMatchJob(BaseModel):
+    """One job description in a batch matching request."""
+    id: Optional[str] = None
+    description: str
+    required_skills: List[str] = Field(default_factory=list)
+
+
+class BatchMatchRequest(BaseModel):
+    """Match many job descriptions against the CV pool in one call."""
+    jobs: List[BatchMatchJob] = Field(..., min_length=1)
+    top_n: int = Field(default=10, ge=1, le=100)
+    match_threshold: float = 0.3
+    fields: Optional[str] = None
+
+
+class JobOfferCreate(BaseModel):
+    """A job offer to store, embed and match against the CV pool."""
+    title: str
+    description: Optional[str] = None
+    required_skills: List[str] = Field(default_factory=list)
+    location: Optional[str] = None
+    department: Optional[str] = None
+    external_id: Optional[str] = None
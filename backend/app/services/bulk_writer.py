@@ -0,0 +1,119 @@
+"""
+Bulk writer - buffers rows and writes them in multi-row requests, flushed when
+the buffer reaches a batch size or after a flush interval, whichever comes first.
+A failed batch is retried with backoff; if it still fails it is split in halves
+until the failing rows are isolated, so every row gets its own outcome.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+
+
+class BulkWriter:
+    """
+    writer = BulkWriter(save_cvs)
+    future = writer.add(row)   # resolves when the row is written, raises its own error
+    await writer.close()       # flush what is left
+
+    write(rows) must be idempotent (e.g. an upsert on the primary key) - a retried
+    request may have succeeded the first time.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[List[Row]], Awaitable[Any]],
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: float = 0.2,
+    ):
+        self.write = write
+        self.batch_size = max(1, batch_size or settings.BULK_WRITE_BATCH_SIZE)
+        self.flush_interval = flush_interval if flush_interval is not None else settings.BULK_WRITE_FLUSH_MS / 1000
+        self.max_retries = max_retries if max_retries is not None else settings.BULK_WRITE_RETRIES
+        self.retry_backoff = retry_backoff
+        self.written = 0
+        self.failed = 0
+        self.requests = 0
+        self._buffer: List[Tuple[Row, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    def add(self, row: Row) -> asyncio.Future:
+        """Queue a row; returns a future resolved once it is written."""
+        future = asyncio.get_running_loop().create_future()
+        self._buffer.append((row, future))
+        if len(self._buffer) >= self.batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        return future
+
+    async def flush(self) -> None:
+        """Write everything buffered so far."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._buffer = self._buffer, []
+        for start in range(0, len(batch), self.batch_size):
+            await self._write_batch(batch[start:start + self.batch_size], self.max_retries)
+
+    async def close(self) -> None:
+        """Flush the buffer and wait for in-flight flushes."""
+        await self.flush()
+        while self._flushes:
+            await asyncio.gather(*self._flushes)
+
+    async def __aenter__(self) -> "BulkWriter":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _start_flush(self) -> None:
+        task = asyncio.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._timer = None
+        # Tracked in _flushes, so close() waits for it like any other flush
+        self._start_flush()
+
+    async def _write_batch(self, batch: List[Tuple[Row, asyncio.Future]], retries: int) -> None:
+        rows = [row for row, _ in batch]
+        for attempt in range(retries + 1):
+            self.requests += 1
+            try:
+                await self.write(rows)
+                break
+            except Exception as e:
+                error = e
+                if attempt < retries:
+                    logger.warning(f"Bulk write of {len(rows)} rows failed (attempt {attempt + 1}), retrying: {e}")
+                    await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+        else:
+            if len(batch) == 1:
+                self.failed += 1
+                _, future = batch[0]
+                if not future.done():
+                    future.set_exception(error)
+                return
+            # Attribute the failure: errors left after retries are row-specific, no more retries
+            mid = len(batch) // 2
+            await self._write_batch(batch[:mid], 0)
+            await self._write_batch(batch[mid:], 0)
+            return
+
+        self.written += len(batch)
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
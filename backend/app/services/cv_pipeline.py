@@ -0,0 +1,455 @@
+"""
+CV pipeline - upload -> OCR -> LLM -> embedding -> insert for one CV, shared by
+the ingest endpoint, demo loading and scripts. Built on services/pipeline.py:
+the upload overlaps OCR -> LLM, the embedding overlaps the LLM call, and each
+stage has a timeout and a process-wide concurrency limit (PIPELINE_* settings).
+Single ingests checkpoint every stage output on the row, so resume_cv() picks a
+failed or interrupted ingest up where it stopped; reprocess_cv() re-runs single
+stages of a stored CV after a prompt or model change.
+"""
+
+import asyncio
+import io
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, Iterable, List, Optional, Union
+
+from app.core.config import settings
+from app.services import cv_repository
+from app.services.embedding_service import generate_embedding
+from app.services.job_matching_service import refresh_matches_for_cv
+from app.services.llm_structuring import PROMPT_VERSION, structure_cv_flexible
+from app.services.ocr_service import extract_text
+from app.services.pipeline import Stage, run_stages, timings
+from app.services.skills_service import store_cv_skills
+from app.services.storage_service import stream_download, upload_file
+from app.services.upload_spool import SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+
+def build_structured_data(llm_result: dict) -> dict:
+    """Convert LLM result to structured_data for storage."""
+    data = llm_result.get("data", {}) or {}
+    candidate_info = data.get("candidate_info", {}) or {}
+    sections = data.get("sections", []) or []
+    career = data.get("career_summary", {}) or {}
+
+    experiences = []
+    education = []
+    skills = []
+
+    for s in sections:
+        content = s.get("content", {}) or {}
+        if s.get("section_type") == "experience":
+            experiences.extend(content.get("experiences", []))
+        elif s.get("section_type") in ("formation", "education"):
+            education.extend(content.get("education", []))
+        elif s.get("section_type") in ("compétences", "skills"):
+            skills.extend(content.get("skills", []))
+
+    return {
+        "candidate_info": candidate_info,
+        "sections": sections,
+        "experiences": experiences,
+        "education": education,
+        "skills": skills,
+        "career_summary": career,
+    }
+
+
+def quality_score(structured: dict) -> float:
+    """Simple quality score."""
+    score = 0.0
+    ci = structured.get("candidate_info", {}) or {}
+    if ci.get("full_name"):
+        score += 0.3
+    if ci.get("email"):
+        score += 0.2
+    if structured.get("experiences"):
+        score += 0.3
+    if structured.get("skills"):
+        score += 0.2
+    return min(score, 1.0)
+
+
+# Stages whose output is checkpointed on the row, in pipeline order
+CHECKPOINT_STAGES = ("storage", "ocr", "llm", "embedding")
+# A CV is fully processed once these are stored - the original is only needed for OCR
+PROCESSING_STAGES = ("ocr", "llm", "embedding")
+
+
+def _llm_fields(llm: Dict[str, Any]) -> Dict[str, Any]:
+    """Columns written from the llm stage output."""
+    return {
+        "structured_data": llm["structured_data"],
+        "quality_score": quality_score(llm["structured_data"]),
+        "prompt_version": llm["prompt_version"],
+        "llm_model": llm["llm_model"],
+    }
+
+
+def _embedding_fields(embedding: List[float]) -> Dict[str, Any]:
+    """Columns written from the embedding stage output (no model for the all-zero fallback)."""
+    return {"embedding": embedding, "embedding_model": settings.EMBEDDING_MODEL if any(embedding) else None}
+
+
+async def derive_cvs(rows: List[Dict[str, Any]]) -> None:
+    """Derive normalized skills and matches against open jobs for stored CV rows, concurrently."""
+
+    def derive(row: Dict[str, Any]) -> None:
+        store_cv_skills(row["id"], row["structured_data"].get("skills"))
+        refresh_matches_for_cv(row["id"])
+
+    await asyncio.gather(*(asyncio.to_thread(derive, row) for row in rows))
+
+
+async def save_cvs(rows: List[Dict[str, Any]]) -> None:
+    """
+    Write CV rows in one request, then derive their data (normalized skills,
+    matches against open jobs) concurrently. Idempotent - usable as a BulkWriter sink.
+    """
+    if not rows:
+        return
+    await cv_repository.upsert_cvs(rows)
+    await derive_cvs(rows)
+
+
+async def _run_pipeline(
+    base: Dict[str, Any],
+    open_file: Callable[[], Awaitable[BinaryIO]],
+    done: Dict[str, Any],
+    raw_text: Optional[str] = None,
+    upload: bool = True,
+    require_upload: bool = True,
+    save: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run the stages for a CV row. base: the row's file columns (id, user_id,
+    original_file_path, ...). done: stage name -> output restored from a checkpoint;
+    those stages are not run again. save=True: the row already exists - each stage
+    output is checkpointed as it completes and the row is activated at the end.
+    """
+    cv_id = base["id"]
+    completed: List[str] = [name for name in CHECKPOINT_STAGES if name in done]
+
+    def checkpointed(name: str, run, fields, is_complete=lambda result: True):
+        async def wrapped(ctx):
+            if name in done:
+                return done[name]
+            result = await run(ctx)
+            complete = is_complete(result)
+            if complete:
+                completed.append(name)
+            if save:
+                await cv_repository.checkpoint_cv(cv_id, name if complete else None, fields(result))
+            return result
+
+        return wrapped
+
+    def described(name: str, describe):
+        return lambda result: {"status": "restored"} if name in done else describe(result)
+
+    async def storage(ctx):
+        if not upload:
+            return base["original_file_path"]
+        with await open_file() as f:
+            return await upload_file(f, base["original_filename"], base["user_id"], cv_id)
+
+    async def ocr(ctx):
+        if raw_text is not None:
+            return {"raw_text": raw_text, "success": True, "method": "provided"}
+        with await open_file() as f:
+            return await extract_text(file_content=f, filename=base["original_filename"], content_type=base["mime_type"])
+
+    async def llm(ctx):
+        result = await structure_cv_flexible(ctx["ocr"].get("raw_text", "") or "", ctx["ocr"])
+        success = bool(result.get("success"))
+        return {
+            "structured_data": build_structured_data(result),
+            "success": success,
+            # The fallback structure was not produced by any prompt or model
+            "prompt_version": PROMPT_VERSION if success else None,
+            "llm_model": settings.LLM_MODEL if success else None,
+        }
+
+    async def embedding(ctx):
+        return await generate_embedding(ctx["ocr"].get("raw_text", "") or "")
+
+    async def row(ctx):
+        return {
+            **base,
+            "original_file_path": ctx["storage"],
+            "raw_text": ctx["ocr"].get("raw_text", "") or "",
+            **_llm_fields(ctx["llm"]),
+            **_embedding_fields(ctx["embedding"]),
+            "status": "active",
+            "processing_error": None,
+            "completed_stages": [name for name in CHECKPOINT_STAGES if name in completed],
+        }
+
+    async def activate(ctx):
+        await cv_repository.checkpoint_cv(cv_id, fields={"status": "active", "processing_error": None})
+        await derive_cvs([ctx["row"]])
+
+    context: Dict[str, Any] = {}
+    t0 = time.perf_counter()
+    try:
+        steps = await run_stages(
+            [
+                Stage(
+                    "storage",
+                    # A skipped upload is not checkpointed - the fallback path holds no file
+                    checkpointed("storage", storage, lambda path: {"original_file_path": path}, lambda _: upload),
+                    timeout=settings.PIPELINE_STORAGE_TIMEOUT,
+                    fallback=None if require_upload else (lambda ctx, e: base["original_file_path"]),
+                    describe=described("storage", lambda r: {}),
+                ),
+                Stage(
+                    "ocr",
+                    checkpointed("ocr", ocr, lambda r: {"raw_text": r.get("raw_text", "") or ""}, lambda r: r.get("success")),
+                    timeout=settings.PIPELINE_OCR_TIMEOUT,
+                    max_concurrency=settings.PIPELINE_OCR_CONCURRENCY,
+                    describe=described("ocr", lambda r: {"method": r.get("method")}),
+                ),
+                Stage(
+                    "llm",
+                    checkpointed(
+                        "llm",
+                        llm,
+                        _llm_fields,
+                        # A failed Groq call keeps the fallback structure but stays resumable
+                        lambda r: r["success"],
+                    ),
+                    deps=("ocr",),
+                    timeout=settings.PIPELINE_LLM_TIMEOUT,
+                    max_concurrency=settings.PIPELINE_LLM_CONCURRENCY,
+                    describe=described("llm", lambda r: {} if r["success"] else {"status": "partial"}),
+                ),
+                Stage(
+                    "embedding",
+                    # All zeros means the model is unavailable - retry on resume
+                    checkpointed("embedding", embedding, _embedding_fields, lambda r: any(r)),
+                    deps=("ocr",),
+                    timeout=settings.PIPELINE_EMBEDDING_TIMEOUT,
+                    max_concurrency=settings.PIPELINE_EMBEDDING_CONCURRENCY,
+                    describe=described("embedding", lambda r: {"dim": len(r)}),
+                ),
+                Stage("row", row, deps=("storage", "llm", "embedding")),
+                *([Stage("activate", activate, deps=("row",))] if save else []),
+            ],
+            context,
+        )
+    except Exception as e:
+        if save:
+            try:
+                await cv_repository.checkpoint_cv(
+                    cv_id, fields={"status": "error", "processing_error": str(e) or type(e).__name__}
+                )
+            except Exception as mark_error:
+                logger.warning(f"Could not mark CV {cv_id} as failed: {mark_error}")
+        raise
+    return {
+        "cv_id": cv_id,
+        "row": context["row"],
+        "steps": steps,
+        "timings_ms": {**timings(steps), "total": round((time.perf_counter() - t0) * 1000, 1)},
+    }
+
+
+async def process_cv(
+    file_content: Union[bytes, SpooledUpload],
+    filename: str,
+    content_type: str,
+    user_id: str,
+    source: str,
+    gdpr_consent: bool = False,
+    raw_text: Optional[str] = None,
+    upload: bool = True,
+    require_upload: bool = True,
+    save: bool = True,
+    cv_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run the full pipeline for one CV and store it.
+    file_content: bytes, or a SpooledUpload (ingest endpoint) - each stage reads it
+    through its own handle, nothing is copied into bytes.
+    raw_text: skip OCR and use this text (text-only demo CVs).
+    upload=False: do not upload; the row still gets the conventional storage path.
+    require_upload=False: a failed upload is reported as "skipped" instead of failing the CV.
+    save=True: the row is created first with status 'processing' and each stage's output
+    is saved as it completes, so a failed or interrupted ingest can be resumed with
+    resume_cv(cv_id). save=False: build the row without writing it - batch callers
+    queue rows on a BulkWriter(save_cvs).
+    Returns {cv_id, row, steps, timings_ms}. Raises if a required stage fails.
+    """
+    cv_id = cv_id or str(uuid.uuid4())
+    base = {
+        "id": cv_id,
+        "user_id": user_id,
+        "original_file_path": f"{user_id}/{cv_id}/{filename}",
+        "source_type": source,
+        "original_filename": filename,
+        "mime_type": content_type,
+        "file_size_bytes": file_content.size if isinstance(file_content, SpooledUpload) else len(file_content),
+        "gdpr_consent": gdpr_consent,
+    }
+    if save:
+        await cv_repository.upsert_cvs([{
+            **base,
+            "raw_text": "",
+            "structured_data": {},
+            "quality_score": 0.0,
+            "status": "processing",
+            "completed_stages": [],
+        }])
+
+    async def open_file() -> BinaryIO:
+        if isinstance(file_content, SpooledUpload):
+            return file_content.open()
+        return io.BytesIO(file_content)
+
+    return await _run_pipeline(
+        base, open_file, {}, raw_text=raw_text, upload=upload, require_upload=require_upload, save=save
+    )
+
+
+async def resume_cv(cv_id: str) -> Dict[str, Any]:
+    """
+    Resume a failed or interrupted ingest from its checkpoints: stages listed in
+    completed_stages are restored from the row, the others run again. The original
+    is downloaded from Storage only if OCR has to run again.
+    Returns what process_cv returns plus "restored" (stages not re-run).
+    Raises LookupError if the CV does not exist, ValueError if it cannot be resumed.
+    """
+    stored = await cv_repository.get_cv_with_embedding(cv_id)
+    if stored is None:
+        raise LookupError(f"CV {cv_id} not found")
+    completed = set(stored.get("completed_stages") or [])
+
+    done: Dict[str, Any] = {}
+    if "storage" in completed:
+        done["storage"] = stored["original_file_path"]
+    if "ocr" in completed:
+        done["ocr"] = {"raw_text": stored.get("raw_text") or "", "success": True, "method": "checkpoint"}
+    if "llm" in completed:
+        done["llm"] = {
+            "structured_data": stored.get("structured_data") or {},
+            "success": True,
+            "prompt_version": stored.get("prompt_version"),
+            "llm_model": stored.get("llm_model"),
+        }
+    if "embedding" in completed and stored.get("embedding") is not None:
+        done["embedding"] = stored["embedding"].tolist()
+    if "ocr" not in done and "storage" not in done:
+        raise ValueError(f"CV {cv_id} has no stored original or text to resume from - upload it again")
+
+    base = {
+        key: stored.get(key)
+        for key in (
+            "id",
+            "user_id",
+            "original_file_path",
+            "source_type",
+            "original_filename",
+            "mime_type",
+            "file_size_bytes",
+            "gdpr_consent",
+        )
+    }
+    spool = SpooledUpload(int(settings.UPLOAD_SPOOL_MEMORY_MB * 1024 * 1024), filename=base["original_filename"] or "")
+
+    async def open_file() -> BinaryIO:
+        if spool.size == 0:
+            async for chunk in stream_download(stored["original_file_path"]):
+                spool.write(chunk)
+            spool.finish()
+        return spool.open()
+
+    try:
+        # The original is already in Storage (or never made it) - nothing to upload
+        result = await _run_pipeline(base, open_file, done, upload=False, require_upload=False, save=True)
+    finally:
+        spool.close()
+    return {**result, "restored": [name for name in CHECKPOINT_STAGES if name in done]}
+
+
+class RateLimited(Exception):
+    """The LLM provider rate-limited the request; retry after retry_after seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limited, retry after {retry_after:.0f} s")
+        self.retry_after = retry_after
+
+
+async def reprocess_cv(
+    cv_id: str,
+    stages: Iterable[str],
+    before_llm: Optional[Callable[[], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """
+    Re-run "llm" and/or "embedding" for a stored CV from its raw_text - no download,
+    no OCR. Each stage's output is saved only if it succeeds, so a failure keeps the
+    current data; skills and matches are then derived again.
+    before_llm: awaited before the Groq call (rate pacing).
+    Returns {cv_id, steps, timings_ms}. Raises RateLimited on a Groq 429,
+    LookupError if the CV does not exist, ValueError if it has no raw_text.
+    """
+    stages = [name for name in ("llm", "embedding") if name in set(stages)]
+    stored = await cv_repository.get_cv(cv_id, "id,raw_text,structured_data")
+    if stored is None:
+        raise LookupError(f"CV {cv_id} not found")
+    raw_text = stored.get("raw_text") or ""
+    if not raw_text:
+        raise ValueError(f"CV {cv_id} has no stored raw_text")
+
+    async def llm(ctx):
+        if before_llm is not None:
+            await before_llm()
+        result = await structure_cv_flexible(raw_text, {"raw_text": raw_text, "success": True, "method": "stored"})
+        if not result.get("success"):
+            if "retry_after" in result:
+                raise RateLimited(result["retry_after"])
+            raise RuntimeError(result.get("error") or "LLM structuring failed")
+        output = {
+            "structured_data": build_structured_data(result),
+            "success": True,
+            "prompt_version": PROMPT_VERSION,
+            "llm_model": settings.LLM_MODEL,
+        }
+        await cv_repository.checkpoint_cv(cv_id, "llm", _llm_fields(output))
+        return output
+
+    async def embedding(ctx):
+        vector = await generate_embedding(raw_text)
+        if not any(vector):
+            raise RuntimeError("Embedding model unavailable")
+        await cv_repository.checkpoint_cv(cv_id, "embedding", _embedding_fields(vector))
+        return vector
+
+    async def derive(ctx):
+        structured_data = ctx["llm"]["structured_data"] if "llm" in ctx else stored.get("structured_data") or {}
+        await derive_cvs([{"id": cv_id, "structured_data": structured_data}])
+
+    runs = {
+        # Same stage names as process_cv, so PIPELINE_*_CONCURRENCY limits are shared with ingestion
+        "llm": Stage("llm", llm, timeout=settings.PIPELINE_LLM_TIMEOUT, max_concurrency=settings.PIPELINE_LLM_CONCURRENCY),
+        "embedding": Stage(
+            "embedding",
+            embedding,
+            timeout=settings.PIPELINE_EMBEDDING_TIMEOUT,
+            max_concurrency=settings.PIPELINE_EMBEDDING_CONCURRENCY,
+        ),
+    }
+    context: Dict[str, Any] = {}
+    t0 = time.perf_counter()
+    steps = await run_stages(
+        [*(runs[name] for name in stages), Stage("derive", derive, deps=tuple(stages))],
+        context,
+    )
+    return {
+        "cv_id": cv_id,
+        "steps": steps,
+        "timings_ms": {**timings(steps), "total": round((time.perf_counter() - t0) * 1000, 1)},
+    }
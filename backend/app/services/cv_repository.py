@@ -0,0 +1,206 @@
+"""
+CV repository - async data access for cv_documents and the search/scoring RPCs.
+All calls go through the pooled async Supabase client, so a slow query only
+suspends its own request instead of blocking the worker's event loop.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.supabase_client import get_async_supabase
+from app.services.embedding_codec import decode_embedding, encode_embedding, to_array
+
+CV_TABLE = "cv_documents"
+
+# Stored columns except the embedding (and the generated fts / skills_tsv)
+CV_COLUMNS = (
+    "id",
+    "user_id",
+    "original_file_path",
+    "raw_text",
+    "structured_data",
+    "quality_score",
+    "status",
+    "source_type",
+    "original_filename",
+    "mime_type",
+    "file_size_bytes",
+    "gdpr_consent",
+    "created_at",
+    "updated_at",
+    "processing_error",
+    "completed_stages",
+    "prompt_version",
+    "llm_model",
+    "embedding_model",
+)
+
+
+async def rpc(function: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Call a Postgres function and return its rows."""
+    supabase = await get_async_supabase()
+    r = await supabase.rpc(function, params).execute()
+    return r.data or []
+
+
+def _pack_row(row: Dict[str, Any], dtype: str) -> Dict[str, Any]:
+    packed = {k: v for k, v in row.items() if k != "embedding"}
+    if row.get("embedding") is not None:
+        packed["embedding_b64"] = encode_embedding(row["embedding"], dtype)
+        packed["embedding_dtype"] = dtype
+    return packed
+
+
+async def upsert_cvs(rows: List[Dict[str, Any]]) -> None:
+    """
+    Write many CV rows in one request. Upsert on id, so a retried write is harmless.
+    Embeddings go base64-packed through upsert_cv_documents_packed unless
+    EMBEDDING_TRANSPORT is "json".
+    """
+    if not rows:
+        return
+    supabase = await get_async_supabase()
+    dtype = settings.EMBEDDING_TRANSPORT
+    if dtype == "json":
+        await supabase.table(CV_TABLE).upsert(rows, on_conflict="id").execute()
+        return
+    await supabase.rpc("upsert_cv_documents_packed", {"rows": [_pack_row(r, dtype) for r in rows]}).execute()
+
+
+async def checkpoint_cv(cv_id: str, stage: Optional[str] = None, fields: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Save fields on a CV row (keys not given stay unchanged) and, if stage is given,
+    add it to completed_stages. Atomic per call (checkpoint_cv RPC, migration 011).
+    """
+    fields = dict(fields or {})
+    dtype = settings.EMBEDDING_TRANSPORT
+    if fields.get("embedding") is not None and dtype != "json":
+        fields = _pack_row(fields, dtype)
+    await rpc("checkpoint_cv", {"cv_id": cv_id, "stage": stage, "fields": fields})
+
+
+async def list_resumable_cvs(stale_before: str, stages: Tuple[str, ...], limit: int = 100) -> List[Dict[str, Any]]:
+    """
+    CVs to resume, least recently touched first: failed ones, ones still
+    'processing' since before stale_before (ISO timestamp), and active ones
+    missing one of stages in completed_stages.
+    """
+    supabase = await get_async_supabase()
+    r = await (
+        supabase.table(CV_TABLE)
+        .select("id,status,completed_stages,updated_at")
+        .or_(
+            "status.eq.error,"
+            f'and(status.eq.processing,updated_at.lt."{stale_before}"),'
+            f"and(status.eq.active,completed_stages.not.cs.{{{','.join(stages)}}})"
+        )
+        .order("updated_at")
+        .limit(limit)
+        .execute()
+    )
+    return r.data or []
+
+
+async def find_stale_cvs(
+    prompt_version: str,
+    llm_model: str,
+    embedding_model: str,
+    after_id: Optional[str] = None,
+    limit: int = 100,
+) -> List[Dict[str, Any]]:
+    """Active CVs made with other versions, by id: [{id, stale_llm, stale_embedding}]."""
+    return await rpc(
+        "find_stale_cvs",
+        {
+            "current_prompt_version": prompt_version,
+            "current_llm_model": llm_model,
+            "current_embedding_model": embedding_model,
+            "after_id": after_id,
+            "result_limit": limit,
+        },
+    )
+
+
+async def get_cv(cv_id: str, columns: str = "*", user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """One CV row, or None if not found (or not owned by user_id)."""
+    supabase = await get_async_supabase()
+    query = supabase.table(CV_TABLE).select(columns).eq("id", cv_id)
+    if user_id:
+        query = query.eq("user_id", user_id)
+    r = await query.execute()
+    return r.data[0] if r.data else None
+
+
+async def get_cv_with_embedding(cv_id: str) -> Optional[Dict[str, Any]]:
+    """
+    One full CV row with "embedding" as a float32 array (None if missing), or None if
+    not found. Selects the packed embedding_b64 column unless EMBEDDING_TRANSPORT is "json".
+    """
+    if settings.EMBEDDING_TRANSPORT == "json":
+        row = await get_cv(cv_id)
+        if row is not None:
+            row["embedding"] = to_array(row.get("embedding"))
+        return row
+    row = await get_cv(cv_id, ",".join(CV_COLUMNS) + ",embedding_b64")
+    if row is not None:
+        packed = row.pop("embedding_b64", None)
+        row["embedding"] = decode_embedding(packed) if packed else None
+    return row
+
+
+async def get_cvs(ids: List[str], columns: str, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """CV rows for ids, in no particular order."""
+    if not ids:
+        return []
+    supabase = await get_async_supabase()
+    query = supabase.table(CV_TABLE).select(columns).in_("id", ids)
+    if user_id:
+        query = query.eq("user_id", user_id)
+    r = await query.execute()
+    return r.data or []
+
+
+async def list_cvs(
+    user_id: str,
+    columns: str,
+    limit: int,
+    count_mode: Optional[str] = None,
+    keyset: Optional[str] = None,
+    page: int = 1,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    A user's CVs, newest first. keyset (see schemas.pagination.keyset_filter)
+    continues after a cursor; otherwise offset paging by page. Returns (rows, count).
+    """
+    supabase = await get_async_supabase()
+    query = (
+        supabase.table(CV_TABLE)
+        .select(columns, count=count_mode)
+        .eq("user_id", user_id)
+        .order("created_at", desc=True)
+        .order("id", desc=True)
+    )
+    if keyset:
+        query = query.or_(keyset).limit(limit)
+    else:
+        start = (page - 1) * limit
+        query = query.range(start, start + limit - 1)
+    r = await query.execute()
+    return r.data or [], getattr(r, "count", None)
+
+
+async def count_cvs(source_types: List[str], count_mode: str = "exact") -> int:
+    """Number of CVs with these source types - count only, no rows transferred."""
+    supabase = await get_async_supabase()
+    r = await (
+        supabase.table(CV_TABLE)
+        .select("id", count=count_mode, head=True)
+        .in_("source_type", source_types)
+        .execute()
+    )
+    return getattr(r, "count", None) or 0
+
+
+async def delete_cv(cv_id: str, user_id: str) -> None:
+    supabase = await get_async_supabase()
+    await supabase.table(CV_TABLE).delete().eq("id", cv_id).eq("user_id", user_id).execute()
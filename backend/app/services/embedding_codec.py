@@ -0,0 +1,52 @@
+"""
+Embedding codec - packs embeddings as base64 of big-endian float32 (or float16)
+for the upsert_cv_documents_packed RPC and the embedding_b64 computed column
+(migration 010), instead of JSON lists / pgvector text of 384 decimal floats.
+Decodes straight into NumPy arrays.
+"""
+
+import base64
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+# Transport dtype -> big-endian NumPy dtype, as decoded by vector_from_base64
+DTYPES = {"float32": ">f4", "float16": ">f2"}
+
+EmbeddingLike = Union[Sequence[float], np.ndarray]
+
+
+def _dtype(dtype: str) -> str:
+    if dtype not in DTYPES:
+        raise ValueError(f"Unknown embedding dtype: {dtype} (expected one of {', '.join(DTYPES)})")
+    return DTYPES[dtype]
+
+
+def encode_embedding(values: EmbeddingLike, dtype: str = "float32") -> str:
+    """Pack an embedding as base64 of big-endian floats. float16 rounds to ~3 significant digits."""
+    return base64.b64encode(np.asarray(values, dtype=_dtype(dtype)).tobytes()).decode("ascii")
+
+
+def decode_embedding(packed: str, dtype: str = "float32") -> np.ndarray:
+    """Unpack a base64 embedding into a native float32 array."""
+    return np.frombuffer(base64.b64decode(packed), dtype=_dtype(dtype)).astype(np.float32)
+
+
+def parse_vector_text(text: str) -> np.ndarray:
+    """pgvector text output ("[0.1,0.2,...]") -> float32 array."""
+    body = text.strip().strip("[]")
+    if not body:
+        return np.zeros(0, dtype=np.float32)
+    return np.array(body.split(","), dtype=np.float32)
+
+
+def to_array(value: Union[None, str, EmbeddingLike]) -> Optional[np.ndarray]:
+    """
+    Embedding as returned by PostgREST (pgvector text), a JSON list or an array
+    -> float32 array. None stays None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return parse_vector_text(value)
+    return np.asarray(value, dtype=np.float32)
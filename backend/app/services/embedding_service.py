@@ -2,6 +2,7 @@
 Embedding service - sentence-transformers all-MiniLM-L6-v2 (384 dimensions).
 """
 
+import asyncio
 import logging
 from typing import List
 
@@ -32,8 +33,25 @@ async def generate_embedding(text: str) -> List[float]:
         return [0.0] * settings.EMBEDDING_DIMENSION
 
     try:
-        embedding = model.encode(text, convert_to_numpy=True)
+        # Encoding is CPU-bound - run it off the event loop so other stages overlap it
+        embedding = await asyncio.to_thread(model.encode, text, convert_to_numpy=True)
         return embedding.tolist()
     except Exception as e:
         logger.error(f"Embedding generation failed: {e}")
         return [0.0] * settings.EMBEDDING_DIMENSION
+
+
+async def generate_embeddings(texts: List[str]) -> List[List[float]]:
+    """Generate 384-dim embeddings for many texts in one batched encode."""
+    model = _get_model()
+    if not texts:
+        return []
+    if not model:
+        return [[0.0] * settings.EMBEDDING_DIMENSION for _ in texts]
+
+    try:
+        embeddings = await asyncio.to_thread(model.encode, texts, convert_to_numpy=True, batch_size=32)
+        return [e.tolist() if t else [0.0] * settings.EMBEDDING_DIMENSION for e, t in zip(embeddings, texts)]
+    except Exception as e:
+        logger.error(f"Batch embedding generation failed: {e}")
+        return [[0.0] * settings.EMBEDDING_DIMENSION for _ in texts]
@@ -0,0 +1,190 @@
+"""
+Job matching service - stored job offer embeddings and the materialized
+job_matches table (top-k candidates per job, refreshed incrementally).
+Request-path calls use the async client; refresh_matches_for_cv runs in the
+pipeline's worker threads.
+"""
+
+import json
+import logging
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.supabase_client import get_async_supabase, get_supabase
+from app.services.embedding_service import generate_embeddings
+
+logger = logging.getLogger(__name__)
+
+# Project root (backend/app/services/job_matching_service.py -> project root)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+JOB_OFFERS_PATH = PROJECT_ROOT / "samples" / "job_offers.json"
+
+JOB_FIELDS = "id,external_id,title,description,required_skills,location,department,status,created_at"
+
+_sample_cache: Tuple[Optional[float], List[Dict[str, Any]]] = (None, [])
+
+
+def job_embedding_text(description: str, required_skills: Optional[List[str]]) -> str:
+    """Text embedded for a job: description plus required skills."""
+    if required_skills:
+        return description + " " + " ".join(required_skills)
+    return description
+
+
+def load_sample_job_offers() -> List[Dict[str, Any]]:
+    """Sample job offers from samples/job_offers.json, re-read only when the file changes."""
+    global _sample_cache
+    if not JOB_OFFERS_PATH.exists():
+        return []
+    mtime = JOB_OFFERS_PATH.stat().st_mtime
+    if _sample_cache[0] != mtime:
+        _sample_cache = (mtime, json.loads(JOB_OFFERS_PATH.read_text(encoding="utf-8")))
+    return _sample_cache[1]
+
+
+async def upsert_job_offers(jobs: List[Dict[str, Any]], user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Embed and store job offers (one batched encode), then refresh their matches.
+    Jobs with an `external_id` are upserted on it; others are inserted.
+    """
+    if not jobs:
+        return []
+    embeddings = await generate_embeddings(
+        [job_embedding_text(j.get("description") or j["title"], j.get("required_skills")) for j in jobs]
+    )
+    rows = []
+    for job, embedding in zip(jobs, embeddings):
+        rows.append({
+            "user_id": user_id,
+            "external_id": job.get("external_id"),
+            "title": job["title"],
+            "description": job.get("description"),
+            "required_skills": job.get("required_skills") or [],
+            "location": job.get("location"),
+            "department": job.get("department"),
+            "status": job.get("status", "open"),
+            "embedding": embedding,
+            "embedding_model": settings.EMBEDDING_MODEL,
+        })
+
+    supabase = await get_async_supabase()
+    if all(r["external_id"] for r in rows):
+        r = await supabase.table("job_offers").upsert(rows, on_conflict="external_id").execute()
+    else:
+        r = await supabase.table("job_offers").insert(rows).execute()
+    stored = r.data or []
+    # One at a time: each refresh scans the whole CV pool
+    for job in stored:
+        await refresh_matches_for_job(str(job["id"]))
+    return [{k: job.get(k) for k in JOB_FIELDS.split(",")} for job in stored]
+
+
+async def sync_sample_job_offers(user_id: Optional[str] = None) -> int:
+    """Store sample job offers that are not in job_offers yet. Returns how many were added."""
+    samples = load_sample_job_offers()
+    if not samples:
+        return 0
+    supabase = await get_async_supabase()
+    r = await (
+        supabase.table("job_offers")
+        .select("external_id")
+        .in_("external_id", [s["id"] for s in samples])
+        .execute()
+    )
+    existing = {row["external_id"] for row in r.data or []}
+    missing = [{**s, "external_id": s["id"]} for s in samples if s["id"] not in existing]
+    stored = await upsert_job_offers(missing, user_id=user_id)
+    return len(stored)
+
+
+async def get_job_offers(status: str = "open") -> List[Dict[str, Any]]:
+    """Job offers with this status, newest first (without embeddings)."""
+    supabase = await get_async_supabase()
+    r = await (
+        supabase.table("job_offers")
+        .select(JOB_FIELDS)
+        .eq("status", status)
+        .order("created_at", desc=True)
+        .execute()
+    )
+    return r.data or []
+
+
+async def get_job_offer(job_id: str) -> Optional[Dict[str, Any]]:
+    """Job offer by id (uuid) or external/sample id ("job-001"), falling back to samples."""
+    try:
+        uuid.UUID(job_id)
+        column = "id"
+    except ValueError:
+        column = "external_id"
+    try:
+        supabase = await get_async_supabase()
+        r = await supabase.table("job_offers").select(JOB_FIELDS).eq(column, job_id).execute()
+        if r.data:
+            return r.data[0]
+    except Exception as e:
+        logger.warning(f"Job offer lookup failed for {job_id}: {e}")
+    return next((j for j in load_sample_job_offers() if j.get("id") == job_id), None)
+
+
+async def resolve_job_id(job_id: str) -> Optional[str]:
+    """Stored job offer uuid for a uuid or external id ("job-003"); None if not stored."""
+    try:
+        return str(uuid.UUID(job_id))
+    except ValueError:
+        pass
+    supabase = await get_async_supabase()
+    r = await supabase.table("job_offers").select("id").eq("external_id", job_id).limit(1).execute()
+    return str(r.data[0]["id"]) if r.data else None
+
+
+async def refresh_matches_for_job(job_id: str) -> int:
+    """Recompute a job's top-k against the whole CV pool."""
+    supabase = await get_async_supabase()
+    r = await supabase.rpc(
+        "refresh_job_matches_for_job",
+        {
+            "p_job_id": job_id,
+            "match_count": settings.JOB_MATCHES_TOP_K,
+            "match_threshold": settings.JOB_MATCH_THRESHOLD,
+        },
+    ).execute()
+    return r.data or 0
+
+
+def refresh_matches_for_cv(cv_id: str) -> int:
+    """Score one CV against open jobs only. Never raises - matches are derived data."""
+    try:
+        supabase = get_supabase()
+        r = supabase.rpc(
+            "refresh_job_matches_for_cv",
+            {
+                "p_cv_id": cv_id,
+                "match_count": settings.JOB_MATCHES_TOP_K,
+                "match_threshold": settings.JOB_MATCH_THRESHOLD,
+            },
+        ).execute()
+        return r.data or 0
+    except Exception as e:
+        logger.warning(f"Job match refresh failed for CV {cv_id}: {e}")
+        return 0
+
+
+async def get_job_matches(job_id: str, columns: str, limit: int) -> List[Dict[str, Any]]:
+    """Read a job's stored top-k with CV rows embedded - one indexed read."""
+    supabase = await get_async_supabase()
+    r = await (
+        supabase.table("job_matches")
+        .select(f"similarity,computed_at,cv:cv_documents({columns})")
+        .eq("job_id", job_id)
+        .order("similarity", desc=True)
+        .limit(limit)
+        .execute()
+    )
+    return [
+        {"cv": row["cv"], "similarity_score": row["similarity"], "computed_at": row["computed_at"]}
+        for row in r.data or []
+        if row.get("cv")
+    ]
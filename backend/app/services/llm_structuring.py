@@ -12,6 +12,10 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Stored with each CV (prompt_version) - bump when _build_prompt or the system
+# message changes, so scripts/reprocess_cvs.py re-structures older CVs
+PROMPT_VERSION = "1"
+
 
 async def structure_cv_flexible(raw_text: str, ocr_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -53,8 +57,21 @@ async def structure_cv_flexible(raw_text: str, ocr_data: Dict[str, Any]) -> Dict
                 "success": True,
                 "data": structured,
                 "model": settings.LLM_MODEL,
+                "prompt_version": PROMPT_VERSION,
                 "confidence": _calculate_confidence(structured),
             }
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 429:
+            logger.error(f"Groq LLM error: {e}", exc_info=True)
+            return {"success": False, "error": str(e), "data": _fallback_parsing(raw_text)["data"]}
+        # Rate limited: callers that can wait (reprocessing) back off for retry_after seconds
+        logger.warning(f"Groq rate limit hit: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "retry_after": _retry_after(e.response),
+            "data": _fallback_parsing(raw_text)["data"],
+        }
     except Exception as e:
         logger.error(f"Groq LLM error: {e}", exc_info=True)
         return {
@@ -64,6 +81,14 @@ async def structure_cv_flexible(raw_text: str, ocr_data: Dict[str, Any]) -> Dict
         }
 
 
+def _retry_after(response: httpx.Response, default: float = 10.0) -> float:
+    """Seconds to wait from a 429's Retry-After header (default if missing or unparsable)."""
+    try:
+        return max(0.0, float(response.headers.get("retry-after", default)))
+    except ValueError:
+        return default
+
+
 def _build_prompt(raw_text: str) -> str:
     """Build the structuring prompt."""
     return f"""You are a CV analysis expert. Extract and structure ALL information from this CV in a flexible way.
@@ -3,9 +3,12 @@ OCR service using Docling.
 Extracts text from PDF, DOCX, and images.
 """
 
+import asyncio
 import io
 import logging
-from typing import Any, Dict
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Union
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +21,25 @@ try:
 except ImportError as e:
     logger.warning(f"Docling not available, using fallback: {e}")
 
+# bytes, or a seekable binary file (e.g. a SpooledUpload handle) - read from the start
+Document = Union[bytes, BinaryIO]
+
+
+def _stream(document: Document) -> BinaryIO:
+    """Seekable stream at the start of the document, without copying bytes."""
+    if isinstance(document, (bytes, bytearray)):
+        return io.BytesIO(document)
+    document.seek(0)
+    return document
+
+
+def _file_path(document: Document) -> Optional[Path]:
+    """Path of a document backed by a file on disk (spooled uploads), else None."""
+    name = getattr(document, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return Path(name)
+    return None
+
 
 def _get_converter():
     """Lazy-load Docling converter."""
@@ -31,12 +53,13 @@ def _get_converter():
 
 
 async def extract_text(
-    file_content: bytes,
+    file_content: Document,
     filename: str,
     content_type: str,
 ) -> Dict[str, Any]:
     """
     Extract text from document using Docling (or fallback).
+    file_content: bytes or a seekable binary file.
     """
     conv = _get_converter()
     if conv:
@@ -44,14 +67,16 @@ async def extract_text(
     return await _extract_fallback(file_content, content_type)
 
 
-async def _extract_with_docling(file_content: bytes, filename: str) -> Dict[str, Any]:
+async def _extract_with_docling(file_content: Document, filename: str) -> Dict[str, Any]:
     """Extract using Docling."""
     conv = _get_converter()
     if not conv:
         return await _extract_fallback(file_content, "application/pdf")
     try:
-        file_obj = io.BytesIO(file_content)
-        result = conv.convert(source=file_obj, max_num_pages=100)
+        # Spooled files are converted from disk, the rest from memory
+        source = _file_path(file_content) or _stream(file_content)
+        # Conversion is CPU-bound - keep it off the event loop
+        result = await asyncio.to_thread(conv.convert, source=source, max_num_pages=100)
 
         raw_text = ""
         metadata = {"pages": 0, "tables": 0, "status": "unknown"}
@@ -79,13 +104,19 @@ async def _extract_with_docling(file_content: bytes, filename: str) -> Dict[str,
         return await _extract_fallback(file_content, "application/pdf")
 
 
-async def _extract_fallback(file_content: bytes, content_type: str) -> Dict[str, Any]:
+def _pypdf2_text(file_content: Document) -> str:
+    """Text of every PDF page (PyPDF2)."""
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(_stream(file_content))
+    return "\n".join(p.extract_text() or "" for p in reader.pages)
+
+
+async def _extract_fallback(file_content: Document, content_type: str) -> Dict[str, Any]:
     """Fallback extraction (PyPDF2 for PDF, etc.)."""
     if content_type == "application/pdf":
         try:
-            import PyPDF2
-            reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            text = "\n".join(p.extract_text() or "" for p in reader.pages)
+            text = await asyncio.to_thread(_pypdf2_text, file_content)
             return {
                 "success": True,
                 "raw_text": text,
@@ -100,8 +131,8 @@ async def _extract_fallback(file_content: bytes, content_type: str) -> Dict[str,
         try:
             import pytesseract
             from PIL import Image
-            img = Image.open(io.BytesIO(file_content))
-            text = pytesseract.image_to_string(img)
+            img = Image.open(_stream(file_content))
+            text = await asyncio.to_thread(pytesseract.image_to_string, img)
             return {
                 "success": True,
                 "raw_text": text,
@@ -0,0 +1,143 @@
+"""
+Original file cache - recently viewed CV originals on local disk, size-bounded
+with LRU eviction. Stored objects are immutable ({user_id}/{cv_id}/{filename},
+uploaded without upsert), so a cached copy never needs revalidation.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.services.storage_service import stream_download
+
+logger = logging.getLogger(__name__)
+
+
+def original_etag(storage_path: str) -> str:
+    """Strong ETag for an original - derived from its immutable storage path."""
+    return '"' + hashlib.sha256(storage_path.encode()).hexdigest()[:32] + '"'
+
+
+class _DiskLRU:
+    """Files named by path hash; recency kept in memory and rebuilt from mtimes at startup."""
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        directory.mkdir(parents=True, exist_ok=True)
+        files = [f for f in directory.iterdir() if f.is_file() and not f.name.endswith(".part")]
+        for f in sorted(files, key=lambda f: f.stat().st_mtime):
+            self._entries[f.name] = f.stat().st_size
+            self.size += self._entries[f.name]
+        self._evict()
+
+    @staticmethod
+    def _name(storage_path: str) -> str:
+        return hashlib.sha256(storage_path.encode()).hexdigest()
+
+    def get(self, storage_path: str) -> Optional[Path]:
+        name = self._name(storage_path)
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+        path = self.directory / name
+        try:
+            # mtime is the recency order after a restart
+            os.utime(path)
+        except FileNotFoundError:
+            self.discard(storage_path)
+            return None
+        return path
+
+    async def fill(self, storage_path: str) -> Path:
+        """Stream the object from Storage into the cache (atomic rename) and return its path."""
+        name = self._name(storage_path)
+        part = self.directory / f"{name}.{uuid.uuid4().hex}.part"
+        size = 0
+        try:
+            with open(part, "wb") as f:
+                async for chunk in stream_download(storage_path):
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(part, self.directory / name)
+        finally:
+            part.unlink(missing_ok=True)
+        with self._lock:
+            self.size += size - self._entries.pop(name, 0)
+            self._entries[name] = size
+            self._evict(keep=name)
+        return self.directory / name
+
+    def discard(self, storage_path: str) -> None:
+        name = self._name(storage_path)
+        with self._lock:
+            self.size -= self._entries.pop(name, 0)
+        (self.directory / name).unlink(missing_ok=True)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Drop least recently used files until under max_bytes (caller holds the lock)."""
+        while self.size > self.max_bytes and self._entries:
+            name, size = next(iter(self._entries.items()))
+            if name == keep:
+                break
+            del self._entries[name]
+            self.size -= size
+            (self.directory / name).unlink(missing_ok=True)
+
+
+_cache: Optional[_DiskLRU] = None
+_cache_disabled = False
+
+
+def _get_cache() -> Optional[_DiskLRU]:
+    """Lazy-create the cache; None when disabled or the directory is not writable."""
+    global _cache, _cache_disabled
+    if _cache is None and not _cache_disabled:
+        if settings.ORIGINALS_CACHE_MAX_MB <= 0:
+            _cache_disabled = True
+            return None
+        try:
+            _cache = _DiskLRU(Path(settings.ORIGINALS_CACHE_DIR), settings.ORIGINALS_CACHE_MAX_MB * 1024 * 1024)
+        except OSError as e:
+            logger.warning(f"Originals cache disabled ({settings.ORIGINALS_CACHE_DIR}): {e}")
+            _cache_disabled = True
+    return _cache
+
+
+async def get_original_path(storage_path: str) -> Optional[Path]:
+    """
+    Local path of an original, downloading it into the cache on a miss.
+    Returns None if the cache is disabled or the download fails - callers fall back
+    to streaming from Storage.
+    """
+    cache = _get_cache()
+    if cache is None:
+        return None
+    path = cache.get(storage_path)
+    if path is not None:
+        return path
+    try:
+        return await cache.fill(storage_path)
+    except Exception as e:
+        logger.warning(f"Caching original failed for {storage_path}: {e}")
+        return None
+
+
+def evict_original(storage_path: str) -> None:
+    """Remove a deleted CV's original from the cache. Never raises."""
+    try:
+        cache = _get_cache()
+        if cache is not None:
+            cache.discard(storage_path)
+    except Exception as e:
+        logger.warning(f"Evicting cached original failed for {storage_path}: {e}")
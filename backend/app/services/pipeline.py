@@ -0,0 +1,116 @@
+"""
+Pipeline - run async stages as a dependency graph. Each stage starts as soon as
+the stages it depends on have finished, so independent stages overlap.
+Stages can have a timeout, a concurrency limit shared by every pipeline run, and
+a fallback that lets the pipeline continue when they fail.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Stage name -> semaphore shared by all runs (e.g. at most 2 OCR conversions at once)
+_limits: Dict[str, asyncio.Semaphore] = {}
+# Stage name -> runs waiting for / holding a slot of its limit
+_waiting: Dict[str, int] = {}
+_running: Dict[str, int] = {}
+
+
+@dataclass
+class Stage:
+    """
+    A named step; run(context) sees the results of earlier stages under their names.
+    timeout: seconds before the stage fails with TimeoutError.
+    max_concurrency: runs of this stage (by name) in flight across all pipelines.
+    fallback(context, error): result used when the stage fails (status "skipped").
+    describe(result): extra fields for the stage report (e.g. {"dim": 384}).
+    """
+
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    deps: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    max_concurrency: Optional[int] = None
+    fallback: Optional[Callable[[Dict[str, Any], Exception], Any]] = None
+    describe: Optional[Callable[[Any], Dict[str, Any]]] = None
+
+
+def _limit(stage: Stage) -> Optional[asyncio.Semaphore]:
+    if not stage.max_concurrency:
+        return None
+    if stage.name not in _limits:
+        _limits[stage.name] = asyncio.Semaphore(stage.max_concurrency)
+    return _limits[stage.name]
+
+
+async def _run_one(stage: Stage, context: Dict[str, Any]) -> Any:
+    limit = _limit(stage)
+    if limit is None:
+        return await asyncio.wait_for(stage.run(context), stage.timeout)
+    _waiting[stage.name] = _waiting.get(stage.name, 0) + 1
+    try:
+        await limit.acquire()
+    finally:
+        _waiting[stage.name] -= 1
+    _running[stage.name] = _running.get(stage.name, 0) + 1
+    try:
+        return await asyncio.wait_for(stage.run(context), stage.timeout)
+    finally:
+        _running[stage.name] -= 1
+        limit.release()
+
+
+def stage_load() -> Dict[str, Dict[str, int]]:
+    """Per limited stage: runs in progress and runs queued for a slot, across all pipelines."""
+    return {name: {"running": _running.get(name, 0), "waiting": _waiting.get(name, 0)} for name in _limits}
+
+
+async def run_stages(stages: List[Stage], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Run stages (listed after their dependencies), storing each result in
+    context[stage.name]. Returns one report per stage, in declaration order:
+    {"name", "status", "duration_ms", ...}. On the first failure of a stage
+    without fallback the remaining stages are cancelled and the exception is raised.
+    """
+    reports: Dict[str, Dict[str, Any]] = {}
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run(stage: Stage) -> None:
+        if stage.deps:
+            await asyncio.gather(*(tasks[d] for d in stage.deps))
+        report: Dict[str, Any] = {"name": stage.name, "status": "completed"}
+        t0 = time.perf_counter()
+        try:
+            context[stage.name] = await _run_one(stage, context)
+            if stage.describe:
+                report.update(stage.describe(context[stage.name]))
+        except Exception as e:
+            if stage.fallback is None:
+                report["status"] = "failed"
+                raise
+            context[stage.name] = stage.fallback(context, e)
+            report.update(status="skipped", note=str(e) or type(e).__name__)
+        finally:
+            report["duration_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+            reports[stage.name] = report
+
+    for stage in stages:
+        unknown = [d for d in stage.deps if d not in tasks]
+        if unknown:
+            raise ValueError(f"Stage {stage.name} depends on unknown or later stages: {', '.join(unknown)}")
+        tasks[stage.name] = asyncio.create_task(run(stage))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+    return [reports[s.name] for s in stages if s.name in reports]
+
+
+def timings(reports: List[Dict[str, Any]]) -> Dict[str, float]:
+    """{stage name: duration_ms} from run_stages reports."""
+    return {r["name"]: r["duration_ms"] for r in reports}
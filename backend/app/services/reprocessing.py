@@ -0,0 +1,116 @@
+"""
+Reprocessing - finds CVs produced with an older structuring prompt (PROMPT_VERSION),
+LLM_MODEL or EMBEDDING_MODEL and re-runs only the stale stage from the stored
+raw_text (cv_pipeline.reprocess_cv). CVs are processed with bounded concurrency,
+Groq calls are paced to a per-minute budget, and a rate limit pauses every worker
+for the provider's Retry-After before the CV is retried.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.services import cv_repository
+from app.services.cv_pipeline import RateLimited, reprocess_cv
+from app.services.llm_structuring import PROMPT_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+class _Pacer:
+    """Spaces calls at least 60 / per_minute seconds apart across workers; pause() holds them all."""
+
+    def __init__(self, per_minute: int):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+        self._resume_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        # A rate limit hit while waiting for the slot pushes it back
+        while loop.time() < self._resume_at:
+            await asyncio.sleep(self._resume_at - loop.time())
+
+    def pause(self, seconds: float) -> None:
+        self._resume_at = max(self._resume_at, asyncio.get_running_loop().time() + seconds)
+
+
+def stale_stages(row: Dict[str, Any], stages: Iterable[str] = ("llm", "embedding")) -> List[str]:
+    """Stages to re-run for a find_stale_cvs row, limited to stages."""
+    return [name for name in stages if row.get(f"stale_{name}")]
+
+
+async def reprocess_stale_cvs(
+    stages: Iterable[str] = ("llm", "embedding"),
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    llm_per_minute: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    dry_run: bool = False,
+    on_result: Optional[Callable[[str, List[str], str], None]] = None,
+) -> Dict[str, int]:
+    """
+    Reprocess every stale CV (at most limit), page by page.
+    on_result(cv_id, stages, outcome) is called per CV ("reprocessed", "would reprocess",
+    or "failed: ...").
+    Returns {"stale", "reprocessed", "failed"}.
+    """
+    stages = tuple(stages)
+    concurrency = max(1, concurrency or settings.REPROCESS_CONCURRENCY)
+    max_retries = settings.REPROCESS_MAX_RETRIES if max_retries is None else max_retries
+    pacer = _Pacer(settings.REPROCESS_LLM_PER_MINUTE if llm_per_minute is None else llm_per_minute)
+    semaphore = asyncio.Semaphore(concurrency)
+    counts = {"stale": 0, "reprocessed": 0, "failed": 0}
+
+    def report(cv_id: str, todo: List[str], outcome: str) -> None:
+        if on_result is not None:
+            on_result(cv_id, todo, outcome)
+
+    async def one(cv_id: str, todo: List[str]) -> None:
+        async with semaphore:
+            for attempt in range(max_retries + 1):
+                try:
+                    await reprocess_cv(cv_id, todo, before_llm=pacer.wait)
+                    counts["reprocessed"] += 1
+                    report(cv_id, todo, "reprocessed")
+                    return
+                except RateLimited as e:
+                    if attempt == max_retries:
+                        error = e
+                        break
+                    logger.warning(f"Reprocessing {cv_id}: {e} (attempt {attempt + 1})")
+                    pacer.pause(e.retry_after)
+                except Exception as e:
+                    error = e
+                    break
+            counts["failed"] += 1
+            report(cv_id, todo, f"failed: {error}")
+
+    after_id = None
+    while limit is None or counts["stale"] < limit:
+        page_size = 100 if limit is None else min(100, limit - counts["stale"])
+        rows = await cv_repository.find_stale_cvs(
+            PROMPT_VERSION, settings.LLM_MODEL, settings.EMBEDDING_MODEL, after_id=after_id, limit=page_size
+        )
+        if not rows:
+            break
+        after_id = rows[-1]["id"]
+        jobs = [(str(row["id"]), stale_stages(row, stages)) for row in rows]
+        jobs = [(cv_id, todo) for cv_id, todo in jobs if todo]
+        counts["stale"] += len(jobs)
+        if dry_run:
+            for cv_id, todo in jobs:
+                report(cv_id, todo, "would reprocess")
+        else:
+            await asyncio.gather(*(one(cv_id, todo) for cv_id, todo in jobs))
+        if len(rows) < page_size:
+            break
+    return counts
@@ -0,0 +1,179 @@
+"""
+Result cache - search responses keyed by normalized query and parameters, with a
+TTL and a generation counter bumped by every write to the CV pool.
+
+In-process LRU by default. Set CACHE_REDIS_URL to share entries and the generation
+between workers (requires the `redis` package, asyncio client).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_GENERATION_KEY = "ats:cache:generation"
+_ENTRY_PREFIX = "ats:cache:"
+
+
+class _MemoryBackend:
+    """Process-local LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get_generation(self) -> int:
+        return self.generation
+
+    async def bump_generation(self) -> int:
+        with self._lock:
+            self.generation += 1
+            # Older generations can never be read again
+            self._entries.clear()
+            return self.generation
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def close(self) -> None:
+        pass
+
+
+class _RedisBackend:
+    """Shared backend: entries expire through Redis TTLs, generation is an INCR counter."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    async def ping(self) -> None:
+        await self._client.ping()
+
+    async def get_generation(self) -> int:
+        return int(await self._client.get(_GENERATION_KEY) or 0)
+
+    async def bump_generation(self) -> int:
+        return int(await self._client.incr(_GENERATION_KEY))
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self._client.get(_ENTRY_PREFIX + key)
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        await self._client.setex(_ENTRY_PREFIX + key, ttl, json.dumps(value, default=str))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+_backend = None
+_backend_lock = asyncio.Lock()
+
+
+async def _get_backend():
+    """Lazy-create the backend; falls back to memory if Redis is unreachable."""
+    global _backend
+    if _backend is not None:
+        return _backend
+    async with _backend_lock:
+        if _backend is None and settings.CACHE_REDIS_URL:
+            try:
+                backend = _RedisBackend(settings.CACHE_REDIS_URL)
+                # Connections are lazy - without a round trip a down server only shows up per request
+                await backend.ping()
+                _backend = backend
+            except Exception as e:
+                logger.warning(f"Redis cache unavailable, using in-process cache: {e}")
+        if _backend is None:
+            _backend = _MemoryBackend(settings.SEARCH_CACHE_MAX_ENTRIES)
+    return _backend
+
+
+def normalize_query(text: str) -> str:
+    """Collapse whitespace and case - the embedding model and full-text search are uncased."""
+    return " ".join(text.split()).lower()
+
+
+def cache_key(namespace: str, **params: Any) -> str:
+    """
+    Stable key for a namespace and its parameters. Lists are order-insensitive -
+    pass order-sensitive input (text that is embedded) as a string.
+    """
+    canonical = {
+        k: sorted(v) if isinstance(v, (list, tuple, set)) else v
+        for k, v in params.items()
+        if v is not None
+    }
+    payload = json.dumps([namespace, canonical], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def get_cached(key: str) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+    """
+    (cached response, generation) for key. Pass the generation to set_cached, so a
+    response computed across an invalidation is stored under the old, unreadable
+    generation instead of the new one. Never raises; generation is None on errors.
+    """
+    if settings.SEARCH_CACHE_TTL <= 0:
+        return None, None
+    try:
+        backend = await _get_backend()
+        generation = await backend.get_generation()
+        return await backend.get(f"{generation}:{key}"), generation
+    except Exception as e:
+        logger.warning(f"Result cache read failed: {e}")
+        return None, None
+
+
+async def set_cached(key: str, value: Dict[str, Any], generation: Optional[int]) -> None:
+    """Store a response under the generation get_cached returned. Never raises."""
+    if settings.SEARCH_CACHE_TTL <= 0 or generation is None:
+        return
+    try:
+        backend = await _get_backend()
+        await backend.set(f"{generation}:{key}", value, settings.SEARCH_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Result cache write failed: {e}")
+
+
+async def invalidate_results() -> None:
+    """Bump the generation after the CV pool changes. Never raises."""
+    try:
+        await (await _get_backend()).bump_generation()
+    except Exception as e:
+        logger.warning(f"Result cache invalidation failed: {e}")
+
+
+async def close_result_cache() -> None:
+    """Close the Redis connection pool, if any (app shutdown)."""
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
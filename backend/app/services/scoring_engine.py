@@ -0,0 +1,119 @@
+"""
+Scoring engine - weighted multi-criteria candidate scoring in one NumPy pass.
+Skills are normalized (skill_normalizer) and compared against the job's required
+skills through a compact candidate x job-skill boolean matrix.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.skill_normalizer import normalize_skills
+
+CRITERIA = ("skills", "experience", "education", "quality")
+
+DEFAULT_WEIGHTS = {
+    "skills": 0.4,
+    "experience": 0.3,
+    "education": 0.2,
+    "quality": 0.1,
+}
+
+# Saturation points for count-based features: 10 skills, 5 experiences, 3 degrees
+_SKILLS_CAP = 10.0
+_EXPERIENCE_CAP = 5.0
+_EDUCATION_CAP = 3.0
+
+
+def resolve_weights(criteria: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """Merge caller weights over the defaults. Raises ValueError on unknown criteria."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for key, value in (criteria or {}).items():
+        if key not in CRITERIA:
+            raise ValueError(f"Unknown criterion: {key}. Allowed: {', '.join(CRITERIA)}")
+        weights[key] = float(value)
+    return weights
+
+
+def score_candidates_matrix(
+    cvs: List[Dict[str, Any]],
+    weights: Dict[str, float],
+    job_skills: Optional[List[str]] = None,
+    top_k: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Score candidates. Each cv needs skills, experiences, education, quality_score.
+    With job_skills, the skills criterion is the fraction of required skills the
+    candidate has; without, it is the saturated count of listed skills.
+    Returns [{index, score, breakdown, matched_skills, missing_skills}] best first.
+    """
+    n = len(cvs)
+    if n == 0:
+        return []
+
+    required = normalize_skills(job_skills)
+    vocab = {skill: j for j, skill in enumerate(required)}
+    m = len(vocab)
+
+    # Python pass only extracts raw features; all arithmetic happens below in NumPy
+    raw = []
+    rows: List[int] = []
+    cols: List[int] = []
+    for i, cv in enumerate(cvs):
+        if m:
+            skills = normalize_skills(cv.get("skills"))
+            for skill in skills:
+                j = vocab.get(skill)
+                if j is not None:
+                    rows.append(i)
+                    cols.append(j)
+        else:
+            # No job: only the count matters, so skip normalization (as the SQL path does)
+            skills = cv.get("skills") or []
+        raw.append((
+            len(skills),
+            len(cv.get("experiences") or []),
+            len(cv.get("education") or []),
+            cv.get("quality_score") or 0.0,
+        ))
+    counts = np.array(raw, dtype=np.float32)
+
+    match = np.zeros((n, m), dtype=bool)
+    if rows:
+        match[rows, cols] = True
+    if m:
+        skills_feature = match.sum(axis=1, dtype=np.float32) / m
+    else:
+        skills_feature = np.minimum(counts[:, 0] / _SKILLS_CAP, 1.0)
+
+    features = np.column_stack([
+        skills_feature,
+        np.minimum(counts[:, 1] / _EXPERIENCE_CAP, 1.0),
+        np.minimum(counts[:, 2] / _EDUCATION_CAP, 1.0),
+        counts[:, 3],
+    ])
+    breakdown = features * np.array([weights[c] for c in CRITERIA], dtype=np.float32)
+    totals = np.minimum(breakdown.sum(axis=1), 1.0)
+
+    # Only the top_k rows are turned back into Python objects
+    if top_k is not None and 0 < top_k < n:
+        top = np.argpartition(-totals, top_k - 1)[:top_k]
+        order = top[np.argsort(-totals[top], kind="stable")]
+    else:
+        order = np.argsort(-totals, kind="stable")
+
+    # Convert the selected rows back to Python objects in bulk
+    scores = np.round(totals[order], 2).tolist()
+    parts = np.round(breakdown[order], 2).tolist()
+    hits = match[order].tolist()
+    results = []
+    for k, i in enumerate(order.tolist()):
+        row_hits = hits[k]
+        results.append({
+            "index": i,
+            "score": scores[k],
+            "breakdown": dict(zip(CRITERIA, parts[k])),
+            "matched_skills": [s for s, hit in zip(required, row_hits) if hit],
+            "missing_skills": [s for s, hit in zip(required, row_hits) if not hit],
+        })
+    return results
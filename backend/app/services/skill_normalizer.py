@@ -0,0 +1,106 @@
+"""
+Skill normalization - maps the many spellings the LLM produces ("JS", "Postgres",
+"k8s") onto one canonical name, so skills can be compared and indexed.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional
+
+# Canonical name -> known aliases (lowercase). Inverted once into SKILL_ALIASES.
+_CANONICAL_SKILLS = {
+    "javascript": ["js", "java script", "ecmascript", "es6", "vanilla js"],
+    "typescript": ["ts"],
+    "python": ["python3", "python 3", "py"],
+    "postgresql": ["postgres", "postgre", "psql", "postgre sql"],
+    "mysql": ["my sql"],
+    "mongodb": ["mongo"],
+    "kubernetes": ["k8s", "kube"],
+    "terraform": ["hashicorp terraform"],
+    "docker": ["docker compose", "docker-compose"],
+    "aws": ["amazon web services", "amazon aws"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "azure": ["microsoft azure"],
+    "react": ["reactjs", "react.js", "react js"],
+    "nextjs": ["next.js", "next js", "next"],
+    "nodejs": ["node", "node.js", "node js"],
+    "vuejs": ["vue", "vue.js"],
+    "angular": ["angularjs", "angular.js"],
+    "fastapi": ["fast api"],
+    "django": ["django rest framework", "drf"],
+    "spring": ["spring boot", "springboot", "spring framework"],
+    "machine learning": ["ml"],
+    "deep learning": ["dl"],
+    "natural language processing": ["nlp"],
+    "computer vision": [],
+    "tensorflow": ["tensor flow", "tf2"],
+    "pytorch": ["torch", "py torch"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "ci/cd": ["cicd", "ci cd", "continuous integration", "continuous delivery"],
+    "rest api": ["rest", "restful", "restful api", "rest apis"],
+    "graphql": ["graph ql"],
+    "css": ["css3"],
+    "html": ["html5"],
+    "sql": ["structured query language"],
+    "linux": ["gnu/linux", "unix/linux"],
+    "c++": ["cpp", "c plus plus"],
+    "c#": ["csharp", "c sharp"],
+    "golang": ["go", "go lang"],
+    "redis": ["redis cache"],
+    "figma": ["figma design"],
+    "owasp": ["owasp top 10"],
+    "penetration testing": ["pentest", "pentesting", "pen testing"],
+    "siem": ["security information and event management"],
+}
+
+SKILL_ALIASES = {
+    alias: canonical
+    for canonical, aliases in _CANONICAL_SKILLS.items()
+    for alias in [canonical, *aliases]
+}
+
+_WHITESPACE = re.compile(r"\s+")
+_SKILL_NAME_KEYS = ("name", "skill", "skill_name", "label", "title")
+
+
+@lru_cache(maxsize=16384)
+def normalize_skill(skill: str) -> str:
+    """Canonical lowercase name for one skill string."""
+    key = _WHITESPACE.sub(" ", skill.strip().lower()).strip(" .,;:")
+    return SKILL_ALIASES.get(key, key)
+
+
+def skill_name(item: Any) -> Optional[str]:
+    """Skill text from an LLM skills entry - plain string or {"name": ...}-like dict."""
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict):
+        for key in _SKILL_NAME_KEYS:
+            value = item.get(key)
+            if isinstance(value, str) and value.strip():
+                return value
+    return None
+
+
+def normalize_skills(items: Optional[Iterable[Any]]) -> List[str]:
+    """Unique canonical skills from a structured_data.skills list (order preserved)."""
+    seen = {}
+    for item in items or []:
+        # Plain strings are the common case - skip skill_name() for them
+        name = item if type(item) is str else skill_name(item)
+        # Grouped entries ({"category": "...", "skills": [...]}) are flattened
+        if name is None:
+            if isinstance(item, dict) and isinstance(item.get("skills"), list):
+                for sub in normalize_skills(item["skills"]):
+                    seen[sub] = None
+            continue
+        if "," in name:
+            for part in name.split(","):
+                norm = normalize_skill(part)
+                if norm:
+                    seen[norm] = None
+        else:
+            norm = normalize_skill(name)
+            if norm:
+                seen[norm] = None
+    return list(seen)
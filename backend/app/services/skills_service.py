@@ -0,0 +1,76 @@
+"""
+Skills service - normalized cv_skills rows written at ingestion, and indexed
+AND/OR skill lookups returning CV ids. Lookups (request handlers) use the async
+client; store_cv_skills runs in the pipeline's worker threads.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core.supabase_client import get_async_supabase, get_supabase
+from app.services.skill_normalizer import normalize_skill, normalize_skills, skill_name
+
+logger = logging.getLogger(__name__)
+
+
+def skill_rows(cv_id: str, skills: Optional[List[Any]]) -> List[Dict[str, Any]]:
+    """cv_skills rows for one CV: canonical name plus the first raw spelling seen."""
+    rows: Dict[str, Dict[str, Any]] = {}
+    for item in skills or []:
+        raw = skill_name(item)
+        if raw is None:
+            # Grouped entries ({"category": ..., "skills": [...]})
+            if isinstance(item, dict) and isinstance(item.get("skills"), list):
+                for row in skill_rows(cv_id, item["skills"]):
+                    rows.setdefault(row["skill_norm"], row)
+            continue
+        for part in raw.split(","):
+            norm = normalize_skill(part)
+            if norm:
+                rows.setdefault(norm, {"cv_id": cv_id, "skill_norm": norm, "skill_raw": part.strip()})
+    return list(rows.values())
+
+
+def store_cv_skills(cv_id: str, skills: Optional[List[Any]]) -> int:
+    """Replace a CV's cv_skills rows. Never raises - the table is derived data."""
+    try:
+        supabase = get_supabase()
+        supabase.table("cv_skills").delete().eq("cv_id", cv_id).execute()
+        rows = skill_rows(cv_id, skills)
+        if rows:
+            supabase.table("cv_skills").insert(rows).execute()
+        return len(rows)
+    except Exception as e:
+        logger.warning(f"Storing skills failed for CV {cv_id}: {e}")
+        return 0
+
+
+async def find_cv_ids_by_skills(
+    all_skills: Optional[List[str]] = None,
+    any_skills: Optional[List[str]] = None,
+    user_id: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[str]:
+    """CV ids having every skill in all_skills and at least one of any_skills, best match first."""
+    all_norm = normalize_skills(all_skills)
+    any_norm = normalize_skills(any_skills)
+    if not all_norm and not any_norm:
+        return []
+    supabase = await get_async_supabase()
+    r = await supabase.rpc(
+        "find_cvs_by_skills",
+        {
+            "all_skills": all_norm or None,
+            "any_skills": any_norm or None,
+            "filter_user_id": user_id,
+            "result_limit": limit,
+        },
+    ).execute()
+    return [str(row["cv_id"]) for row in r.data or []]
+
+
+async def suggest_skills(query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Canonical skills similar to query (trigram), with how many CVs have them."""
+    supabase = await get_async_supabase()
+    r = await supabase.rpc("suggest_skills", {"query": query.strip(), "result_limit": limit}).execute()
+    return r.data or []
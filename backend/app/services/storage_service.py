@@ -1,90 +1,322 @@
 """
-Supabase storage service - upload files, generate signed URLs.
+Supabase storage service - upload files, generate signed URLs (cached per path).
+
+Uploads go straight from memory (or a spooled upload file) to the Storage REST API
+over a pooled async HTTP client; files above STORAGE_RESUMABLE_THRESHOLD_MB use
+the resumable (TUS) endpoint in 6 MB chunks.
 """
 
+import base64
+import io
 import logging
-import os
-import tempfile
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+import httpx
 
 from app.core.config import settings
-from app.core.supabase_client import get_supabase
 
 logger = logging.getLogger(__name__)
 
 BUCKET = "cv-originals"
 
+# Supabase resumable uploads require 6 MB chunks (except the last one)
+_TUS_CHUNK = 6 * 1024 * 1024
+_STREAM_CHUNK = 64 * 1024
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Signed URLs by (path, expires_in) -> (reuse until, url); bounded LRU
+_SIGNED_URL_CACHE_MAX = 4096
+_signed_urls: "OrderedDict[Tuple[str, int], Tuple[float, str]]" = OrderedDict()
+_signed_url_lock = threading.Lock()
+
+UploadSource = Union[bytes, BinaryIO]
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Shared AsyncClient - connections to Storage are kept alive between uploads."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=settings.STORAGE_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.STORAGE_HTTP_MAX_CONNECTIONS,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close pooled Storage connections (application shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _storage_url() -> str:
+    url = (settings.SUPABASE_URL or "").strip().rstrip("/")
+    if not url:
+        raise RuntimeError("SUPABASE_URL must be set in backend/.env")
+    return f"{url}/storage/v1"
+
+
+def _auth_headers() -> Dict[str, str]:
+    key = (settings.SUPABASE_SERVICE_ROLE_KEY or "").strip()
+    return {"authorization": f"Bearer {key}", "apikey": key}
+
+
+def _source_size(source: UploadSource) -> int:
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    position = source.tell()
+    size = source.seek(0, io.SEEK_END)
+    source.seek(position)
+    return size - position
+
+
+def _read_range(source: UploadSource, offset: int, size: int, base: int) -> bytes:
+    """size bytes at offset of the upload (base: start position of a file source)."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source[offset:offset + size])
+    source.seek(base + offset)
+    return source.read(size)
+
+
+async def _iter_file(source: BinaryIO) -> AsyncIterator[bytes]:
+    while True:
+        chunk = source.read(_STREAM_CHUNK)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def _upload_single(path: str, source: UploadSource, size: int, content_type: str) -> None:
+    """One POST; bytes are sent as-is, file sources are streamed in 64 KB reads."""
+    client = _get_http_client()
+    r = await client.post(
+        f"{_storage_url()}/object/{BUCKET}/{quote(path)}",
+        content=source if isinstance(source, (bytes, bytearray)) else _iter_file(source),
+        headers={
+            **_auth_headers(),
+            "content-type": content_type,
+            "content-length": str(size),
+            "cache-control": "max-age=3600",
+            "x-upsert": "false",
+        },
+    )
+    r.raise_for_status()
+
+
+def _tus_metadata(path: str, content_type: str) -> str:
+    fields = {"bucketName": BUCKET, "objectName": path, "contentType": content_type, "cacheControl": "3600"}
+    return ",".join(f"{k} {base64.b64encode(v.encode()).decode()}" for k, v in fields.items())
+
+
+async def _upload_resumable(path: str, source: UploadSource, size: int, content_type: str) -> None:
+    """
+    TUS upload: create the upload, then PATCH 6 MB chunks. A failed chunk is
+    retried from the offset the server reports (HEAD), up to STORAGE_UPLOAD_RETRIES times.
+    """
+    client = _get_http_client()
+    tus = {**_auth_headers(), "tus-resumable": "1.0.0"}
+    r = await client.post(
+        f"{_storage_url()}/upload/resumable",
+        headers={
+            **tus,
+            "upload-length": str(size),
+            "upload-metadata": _tus_metadata(path, content_type),
+            "x-upsert": "false",
+        },
+    )
+    r.raise_for_status()
+    location = r.headers["location"]
+
+    base = 0 if isinstance(source, (bytes, bytearray)) else source.tell()
+    offset = 0
+    retries = settings.STORAGE_UPLOAD_RETRIES
+    while offset < size:
+        chunk = _read_range(source, offset, _TUS_CHUNK, base)
+        try:
+            r = await client.patch(
+                location,
+                content=chunk,
+                headers={
+                    **tus,
+                    "upload-offset": str(offset),
+                    "content-type": "application/offset+octet-stream",
+                },
+            )
+            r.raise_for_status()
+            offset = int(r.headers.get("upload-offset", offset + len(chunk)))
+        except httpx.HTTPError as e:
+            if retries <= 0:
+                raise
+            retries -= 1
+            logger.warning(f"Resumable upload chunk at {offset} failed, resuming: {e}")
+            head = await client.head(location, headers=tus)
+            head.raise_for_status()
+            offset = int(head.headers["upload-offset"])
+
 
 async def upload_file(
-    file_content: bytes,
+    file_content: UploadSource,
     filename: str,
     user_id: str,
     cv_id: str,
 ) -> str:
     """
     Upload file to Supabase Storage. Path: {user_id}/{cv_id}/{filename}
+    file_content: bytes, or a binary file object read from its current position.
     Returns the storage path.
     """
-    supabase = get_supabase()
     path = f"{user_id}/{cv_id}/{filename}"
+    content_type = _get_content_type(filename)
 
     try:
-        # storage3 expects a file path (str), not BytesIO - use temp file
-        ext = "." + filename.split(".")[-1] if "." in filename else ""
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext or ".bin") as tmp:
-            tmp.write(file_content)
-            tmp_path = tmp.name
-        try:
-            supabase.storage.from_(BUCKET).upload(
-                path=path,
-                file=tmp_path,
-                file_options={"content-type": _get_content_type(filename)},
-            )
-        finally:
-            os.unlink(tmp_path)
+        size = _source_size(file_content)
+        if size >= settings.STORAGE_RESUMABLE_THRESHOLD_MB * 1024 * 1024:
+            await _upload_resumable(path, file_content, size, content_type)
+        else:
+            await _upload_single(path, file_content, size, content_type)
         return path
     except Exception as e:
         logger.error(f"Storage upload failed: {e}")
         raise
 
 
-def download_file(file_path: str) -> Optional[bytes]:
+async def open_download(file_path: str, byte_range: Optional[str] = None) -> httpx.Response:
     """
-    Download file content from Supabase Storage.
-    Returns None if file doesn't exist.
+    Start streaming an object over the pooled client, optionally with a Range header
+    ("bytes=0-1023"). Read it with aiter_bytes() and aclose() it when done.
+    Raises httpx.HTTPStatusError on HTTP errors (e.g. 404, 416).
     """
+    client = _get_http_client()
+    headers = _auth_headers()
+    if byte_range:
+        headers["Range"] = byte_range
+    request = client.build_request("GET", f"{_storage_url()}/object/{BUCKET}/{quote(file_path)}", headers=headers)
+    r = await client.send(request, stream=True)
+    if r.is_error:
+        await r.aclose()
+        r.raise_for_status()
+    return r
+
+
+async def stream_download(file_path: str) -> AsyncIterator[bytes]:
+    """Stream an object from Storage in chunks over the pooled client. Raises on HTTP errors."""
+    r = await open_download(file_path)
     try:
-        supabase = get_supabase()
-        result = supabase.storage.from_(BUCKET).download(file_path)
-        return result
-    except Exception as e:
-        logger.warning(f"Storage download failed for {file_path}: {e}")
+        async for chunk in r.aiter_bytes(_STREAM_CHUNK):
+            yield chunk
+    finally:
+        await r.aclose()
+
+
+async def delete_file(file_path: str) -> None:
+    """Delete an object from Storage over the pooled client. Raises on HTTP errors."""
+    client = _get_http_client()
+    r = await client.request(
+        "DELETE", f"{_storage_url()}/object/{BUCKET}", json={"prefixes": [file_path]}, headers=_auth_headers()
+    )
+    r.raise_for_status()
+
+
+def _signed_url_from(item: Dict[str, Any]) -> Optional[str]:
+    """Absolute URL from a Storage sign response ({"signedURL": "/object/sign/...?token=..."})."""
+    url = item.get("signedURL") or item.get("signedUrl")
+    if not url:
         return None
+    return url if url.startswith("http") else f"{_storage_url()}/{url.lstrip('/')}"
+
+
+def _cached_signed_url(file_path: str, expires_in: int) -> Optional[str]:
+    with _signed_url_lock:
+        entry = _signed_urls.get((file_path, expires_in))
+        if entry is None:
+            return None
+        reuse_until, url = entry
+        if reuse_until <= time.monotonic():
+            del _signed_urls[(file_path, expires_in)]
+            return None
+        _signed_urls.move_to_end((file_path, expires_in))
+        return url
+
 
+def _store_signed_url(file_path: str, expires_in: int, url: str) -> None:
+    # Stop handing a URL out well before it expires: 10% of its lifetime, at least a minute
+    lifetime = expires_in - max(60, expires_in // 10)
+    if lifetime <= 0:
+        return
+    with _signed_url_lock:
+        _signed_urls[(file_path, expires_in)] = (time.monotonic() + lifetime, url)
+        _signed_urls.move_to_end((file_path, expires_in))
+        while len(_signed_urls) > _SIGNED_URL_CACHE_MAX:
+            _signed_urls.popitem(last=False)
 
-def create_signed_url(file_path: str, expires_in: int = 3600) -> Optional[str]:
+
+async def create_signed_url(file_path: str, expires_in: int = 3600) -> Optional[str]:
     """
     Create a signed URL for secure access to the original document.
+    Reuses a cached URL for the same path while it has enough lifetime left; a miss
+    is one request over the pooled client. Never raises.
     """
+    url = _cached_signed_url(file_path, expires_in)
+    if url:
+        return url
     try:
-        supabase = get_supabase()
-        result = supabase.storage.from_(BUCKET).create_signed_url(
-            path=file_path,
-            expires_in=expires_in,
+        client = _get_http_client()
+        r = await client.post(
+            f"{_storage_url()}/object/sign/{BUCKET}/{quote(file_path)}",
+            json={"expiresIn": expires_in},
+            headers=_auth_headers(),
         )
-        # Handle APIResponse - result may have .data or be a dict
-        if hasattr(result, "data") and isinstance(result.data, dict):
-            return result.data.get("signedUrl") or result.data.get("signed_url")
-        if hasattr(result, "data") and isinstance(result.data, str):
-            return result.data
-        if isinstance(result, dict):
-            return result.get("signedUrl") or result.get("signed_url")
-        return None
+        r.raise_for_status()
+        url = _signed_url_from(r.json())
+        if url:
+            _store_signed_url(file_path, expires_in, url)
+        return url
     except Exception as e:
         logger.error(f"Signed URL creation failed: {e}")
         return None
 
 
+async def create_signed_urls(file_paths: List[str], expires_in: int = 3600) -> Dict[str, Optional[str]]:
+    """
+    Signed URLs for many paths: cached ones are reused, the rest are created in one
+    batch request. Returns {path: url or None}. Never raises.
+    """
+    urls: Dict[str, Optional[str]] = {}
+    missing = []
+    for path in dict.fromkeys(file_paths):
+        urls[path] = _cached_signed_url(path, expires_in)
+        if urls[path] is None:
+            missing.append(path)
+    if not missing:
+        return urls
+    try:
+        client = _get_http_client()
+        r = await client.post(
+            f"{_storage_url()}/object/sign/{BUCKET}",
+            json={"expiresIn": expires_in, "paths": missing},
+            headers=_auth_headers(),
+        )
+        r.raise_for_status()
+        for item in r.json():
+            url = None if item.get("error") else _signed_url_from(item)
+            if item.get("path") in urls and url:
+                urls[item["path"]] = url
+                _store_signed_url(item["path"], expires_in, url)
+    except Exception as e:
+        logger.error(f"Batch signed URL creation failed: {e}")
+    return urls
+
+
 def _get_content_type(filename: str) -> str:
     """Infer content type from filename."""
     lower = filename.lower()
@@ -0,0 +1,244 @@
+"""
+Upload spool - holds an upload's bytes once, enforcing the size limit and hashing
+as chunks arrive. Small files stay in memory; past UPLOAD_SPOOL_MEMORY_MB the
+content moves to a temp file (named with the upload's extension, so Docling can
+convert it from disk). Pipeline stages open their own read handle instead of
+sharing one bytes copy, so the upload and OCR can read it concurrently.
+
+spool_multipart parses a multipart/form-data request body as it streams in and
+writes the file part straight into a SpooledUpload - there is no intermediate
+copy (Starlette's form parser would spool it first).
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from app.core.config import settings
+
+# Text fields of a multipart form (source, gdpr_consent, ...) are tiny
+_MAX_FIELD_BYTES = 64 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """The upload is larger than the allowed size."""
+
+
+class InvalidMultipart(ValueError):
+    """The request body is not a usable multipart/form-data body."""
+
+
+class SpooledUpload:
+    """
+    upload, fields = await spool_multipart(request, "file", max_bytes)
+    with upload.open() as f: ...   # independent handle, from the start
+    upload.close()                 # removes the temp file, if any
+    """
+
+    def __init__(self, memory_limit: int, filename: str = "", content_type: str = ""):
+        self.memory_limit = memory_limit
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._buffer: Optional[io.BytesIO] = io.BytesIO()
+        self._data: Optional[bytes] = None
+        self._path: Optional[str] = None
+        self._file: Optional[BinaryIO] = None
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def path(self) -> Optional[str]:
+        """Temp file path when spooled to disk, else None."""
+        return self._path
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        self._hash.update(chunk)
+        if self._buffer is not None and self.size > self.memory_limit:
+            fd, self._path = tempfile.mkstemp(prefix="ats-upload-", suffix=Path(self.filename).suffix)
+            self._file = os.fdopen(fd, "wb")
+            self._file.write(self._buffer.getbuffer())
+            self._buffer = None
+        if self._buffer is not None:
+            self._buffer.write(chunk)
+        else:
+            self._file.write(chunk)
+
+    def finish(self) -> None:
+        """Done writing - freeze the memory buffer or flush the temp file."""
+        if self._buffer is not None:
+            self._data = self._buffer.getvalue()
+            self._buffer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def open(self) -> BinaryIO:
+        """A new read handle positioned at the start. Close it when done."""
+        if self._data is not None:
+            # BytesIO over immutable bytes shares their memory - no copy per handle
+            return io.BytesIO(self._data)
+        return open(self._path, "rb")
+
+    def close(self) -> None:
+        """Release the memory buffer or remove the temp file. Never raises."""
+        self._buffer = None
+        self._data = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._path:
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass
+            self._path = None
+
+
+def _too_large(max_bytes: int) -> UploadTooLarge:
+    return UploadTooLarge(f"File too large (max {max_bytes // (1024 * 1024)} MB)")
+
+
+class _FormReader:
+    """MultipartParser callbacks: one file field into a SpooledUpload, other fields as text."""
+
+    def __init__(self, file_field: str, max_bytes: int, memory_limit: int):
+        self.file_field = file_field
+        self.max_bytes = max_bytes
+        self.memory_limit = memory_limit
+        self.upload: Optional[SpooledUpload] = None
+        self.fields: Dict[str, str] = {}
+        # File bytes parsed from the last body chunk, written outside the parser callbacks
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_name = b""
+        self._header_value = b""
+        self._name = ""
+        self._text: Optional[bytearray] = None
+        self._to_file = False
+        # Set by the closing boundary - a body without it was cut short
+        self.complete = False
+
+    def callbacks(self):
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_end": self.on_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+        self._name = ""
+        self._text = None
+        self._to_file = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_name.lower()] = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if b"name" not in options:
+            raise InvalidMultipart('Multipart part without a "name"')
+        self._name = options[b"name"].decode("utf-8", "replace")
+        if b"filename" in options:
+            # Only the first file part with the expected name is kept; other files are skipped
+            if self._name == self.file_field and self.upload is None:
+                self.upload = SpooledUpload(
+                    self.memory_limit,
+                    filename=options[b"filename"].decode("utf-8", "replace"),
+                    content_type=self._headers.get(b"content-type", b"").decode("latin-1").strip(),
+                )
+                self._to_file = True
+        else:
+            self._text = bytearray()
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._to_file:
+            if self.upload.size + self.pending_size + (end - start) > self.max_bytes:
+                raise _too_large(self.max_bytes)
+            self.pending.append(data[start:end])
+            self.pending_size += end - start
+        elif self._text is not None:
+            if len(self._text) + (end - start) > _MAX_FIELD_BYTES:
+                raise InvalidMultipart(f"Form field {self._name!r} is too large")
+            self._text += data[start:end]
+
+    def on_part_end(self) -> None:
+        if self._text is not None:
+            self.fields[self._name] = self._text.decode("utf-8", "replace")
+        self._text = None
+        self._to_file = False
+
+    def on_end(self) -> None:
+        self.complete = True
+
+
+async def spool_multipart(
+    request, file_field: str, max_bytes: int, memory_limit: Optional[int] = None
+) -> Tuple[Optional[SpooledUpload], Dict[str, str]]:
+    """
+    Parse a multipart/form-data request body as it arrives. The file_field part goes
+    straight into a SpooledUpload, hashed per chunk; UploadTooLarge is raised as soon
+    as it passes max_bytes, and the rest of the body is never read. Other text
+    fields are returned as strings.
+    Returns (upload, fields) - upload is None if the form has no such file.
+    Raises InvalidMultipart on a malformed body.
+    """
+    if memory_limit is None:
+        memory_limit = int(settings.UPLOAD_SPOOL_MEMORY_MB * 1024 * 1024)
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise InvalidMultipart("Expected a multipart/form-data body")
+
+    reader = _FormReader(file_field, max_bytes, memory_limit)
+    parser = MultipartParser(params[b"boundary"], reader.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if reader.pending:
+                data = b"".join(reader.pending)
+                reader.pending.clear()
+                reader.pending_size = 0
+                if reader.upload.path is None and reader.upload.size + len(data) <= memory_limit:
+                    reader.upload.write(data)
+                else:
+                    # Disk writes off the event loop
+                    await asyncio.to_thread(reader.upload.write, data)
+        parser.finalize()
+        # finalize() does not check the parser reached the closing boundary
+        if not reader.complete:
+            raise InvalidMultipart("Incomplete multipart body")
+        if reader.upload is not None:
+            reader.upload.finish()
+    except BaseException as e:
+        if reader.upload is not None:
+            reader.upload.close()
+        if isinstance(e, FormParserError):
+            raise InvalidMultipart("Invalid multipart body") from e
+        raise
+    return reader.upload, reader.fields
@@ -0,0 +1,115 @@
+"""
+Request handlers must not block the event loop on Supabase: with a slow fake async
+client, concurrent requests have to overlap instead of running one after another.
+
+    cd backend && python -m pytest -q tests
+"""
+
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from app.routers import cv, matching
+from app.services import cv_repository, job_matching_service, skills_service
+
+DELAY = 0.2
+CONCURRENT = 5
+
+
+class _SlowQuery:
+    """Any builder chain (.table().select().eq()..., .rpc()) ending in a slow execute()."""
+
+    def __init__(self, client: "_SlowClient", data):
+        self._client = client
+        self._data = data
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    async def execute(self):
+        self._client.in_flight += 1
+        self._client.max_in_flight = max(self._client.max_in_flight, self._client.in_flight)
+        try:
+            await asyncio.sleep(DELAY)
+        finally:
+            self._client.in_flight -= 1
+        return SimpleNamespace(data=self._data, count=None)
+
+
+class _SlowClient:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def rpc(self, function, params):
+        if function == "find_cvs_by_skills":
+            return _SlowQuery(self, [{"cv_id": str(uuid.uuid4()), "matched": 1}])
+        return _SlowQuery(self, [])
+
+    def table(self, name):
+        return _SlowQuery(self, [])
+
+
+@pytest.fixture
+def slow_client(monkeypatch):
+    client = _SlowClient()
+
+    async def get_async_supabase():
+        return client
+
+    async def generate_embedding(text):
+        return [0.0] * settings.EMBEDDING_DIMENSION
+
+    monkeypatch.setattr(cv_repository, "get_async_supabase", get_async_supabase)
+    monkeypatch.setattr(skills_service, "get_async_supabase", get_async_supabase)
+    monkeypatch.setattr(job_matching_service, "get_async_supabase", get_async_supabase)
+    monkeypatch.setattr(cv, "generate_embedding", generate_embedding)
+    monkeypatch.setattr(matching, "generate_embedding", generate_embedding)
+    # Every request must reach the client, not the result cache
+    monkeypatch.setattr(settings, "SEARCH_CACHE_TTL", 0)
+    return client
+
+
+async def _gather_requests(method: str, path: str, json=None):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        t0 = time.perf_counter()
+        responses = await asyncio.gather(
+            *(http.request(method, path, json=json) for _ in range(CONCURRENT))
+        )
+        return responses, time.perf_counter() - t0
+
+
+@pytest.mark.parametrize(
+    "method, path, body",
+    [
+        ("GET", "/api/skills/search?all=python", None),
+        ("GET", "/api/skills/suggest?q=pyth", None),
+        ("GET", "/api/jobs", None),
+        ("GET", f"/api/jobs/{uuid.uuid4()}/matches", None),
+        # cv_repository
+        ("GET", "/api/cv/search", None),
+        ("GET", "/api/cv/search?q=python+developer", None),
+        ("POST", "/api/matching/semantic?job_description=python+developer", None),
+        ("POST", "/api/scoring/candidates", {"cv_ids": [str(uuid.uuid4()) for _ in range(3)]}),
+    ],
+)
+def test_concurrent_requests_overlap(slow_client, method, path, body):
+    responses, elapsed = asyncio.run(_gather_requests(method, path, body))
+
+    assert all(r.status_code == 200 for r in responses), [r.text for r in responses]
+    assert slow_client.max_in_flight == CONCURRENT
+    # Serialized, the batch would take CONCURRENT * DELAY (1 s)
+    assert elapsed < DELAY * CONCURRENT / 2
+
+
+def test_unknown_external_job_id_is_404(slow_client):
+    responses, _ = asyncio.run(_gather_requests("GET", "/api/jobs/job-404/matches"))
+
+    assert all(r.status_code == 404 for r in responses)
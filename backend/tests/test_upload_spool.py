@@ -0,0 +1,143 @@
+"""
+Streaming multipart parsing for /api/cv/ingest (services/upload_spool.py).
+
+    cd backend && python -m pytest -q tests
+"""
+
+import asyncio
+import hashlib
+import os
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from app.services.upload_spool import InvalidMultipart, UploadTooLarge, spool_multipart
+
+BOUNDARY = "spool-test-boundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def _multipart(fields=(), files=()) -> bytes:
+    """Body with text fields [(name, value)] and files [(name, filename, content_type, data)]."""
+    parts = []
+    for name, value in fields:
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+            + value.encode() + b"\r\n"
+        )
+    for name, filename, content_type, data in files:
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n".encode()
+            + data + b"\r\n"
+        )
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+class _Request:
+    """The part of a Starlette Request spool_multipart uses; counts the bytes read."""
+
+    def __init__(self, body: bytes, content_type: str = CONTENT_TYPE, chunk_size: int = 1000):
+        self.headers = {"content-type": content_type}
+        self.body = body
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+
+    async def stream(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            chunk = self.body[start:start + self.chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+
+def _spool(request: _Request, max_bytes: int = 1_000_000, memory_limit: int = 4096):
+    return asyncio.run(spool_multipart(request, "file", max_bytes, memory_limit=memory_limit))
+
+
+def test_small_file_stays_in_memory_and_fields_pass_through():
+    data = os.urandom(3000)
+    body = _multipart(
+        fields=[("source", "referral"), ("gdpr_consent", "true")],
+        files=[("file", "cv.pdf", "application/pdf", data)],
+    )
+    upload, fields = _spool(_Request(body))
+    try:
+        assert fields == {"source": "referral", "gdpr_consent": "true"}
+        assert upload.path is None
+        assert (upload.filename, upload.content_type, upload.size) == ("cv.pdf", "application/pdf", 3000)
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+        with upload.open() as f:
+            assert f.read() == data
+    finally:
+        upload.close()
+
+
+def test_large_file_spills_to_disk_with_its_extension():
+    data = os.urandom(10_000)
+    body = _multipart(files=[("file", "cv.docx", "application/octet-stream", data)])
+    upload, _ = _spool(_Request(body))
+    path = upload.path
+    try:
+        assert path is not None and path.endswith(".docx")
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+        with upload.open() as f:
+            assert f.read() == data
+    finally:
+        upload.close()
+    assert not os.path.exists(path)
+
+
+def test_too_large_stops_reading_the_body():
+    body = _multipart(files=[("file", "cv.pdf", "application/pdf", os.urandom(20_000))])
+    request = _Request(body)
+    with pytest.raises(UploadTooLarge):
+        _spool(request, max_bytes=5000)
+    assert request.bytes_read < len(body) / 2
+
+
+def test_missing_file_part_returns_none():
+    upload, fields = _spool(_Request(_multipart(fields=[("source", "upload")])))
+    assert upload is None
+    assert fields == {"source": "upload"}
+
+
+@pytest.mark.parametrize(
+    "body, content_type",
+    [
+        (b"not a multipart body", CONTENT_TYPE),
+        # Cut short before the closing boundary
+        (_multipart(files=[("file", "cv.pdf", "application/pdf", b"x" * 100)])[:-40], CONTENT_TYPE),
+        (_multipart(fields=[("source", "upload")]), "application/json"),
+        (_multipart(fields=[("source", "upload")]), "multipart/form-data"),
+    ],
+)
+def test_malformed_body_is_rejected(body, content_type):
+    with pytest.raises(InvalidMultipart):
+        _spool(_Request(body, content_type))
+
+
+async def _post_ingest(body: bytes, content_type: str = CONTENT_TYPE) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        return await http.post("/api/cv/ingest", content=body, headers={"content-type": content_type})
+
+
+def test_ingest_rejects_an_oversized_file_with_413(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE_MB", 1)
+    body = _multipart(files=[("file", "cv.pdf", "application/pdf", b"x" * (1024 * 1024 + 1))])
+    response = asyncio.run(_post_ingest(body))
+    assert response.status_code == 413
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        _multipart(fields=[("source", "upload")]),
+        b"not a multipart body",
+    ],
+)
+def test_ingest_rejects_missing_file_or_malformed_body_with_400(body):
+    response = asyncio.run(_post_ingest(body))
+    assert response.status_code == 400
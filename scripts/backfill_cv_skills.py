@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Backfill the normalized cv_skills table (migration 009) from existing cv_documents.
+Safe to re-run: rows are upserted on (cv_id, skill_norm).
+
+    python scripts/backfill_cv_skills.py --batch 500
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core.supabase_client import get_supabase  # noqa: E402
+from app.services.skills_service import skill_rows  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    supabase = get_supabase()
+    last_id = None
+    cvs = skills = 0
+    while True:
+        query = supabase.table("cv_documents").select("id,skills:structured_data->skills").order("id").limit(args.batch)
+        if last_id:
+            query = query.gt("id", last_id)
+        page = query.execute().data or []
+        if not page:
+            break
+        rows = [row for cv in page for row in skill_rows(str(cv["id"]), cv.get("skills"))]
+        if rows:
+            supabase.table("cv_skills").upsert(rows, on_conflict="cv_id,skill_norm").execute()
+        cvs += len(page)
+        skills += len(rows)
+        last_id = page[-1]["id"]
+        print(f"{cvs} CVs, {skills} skill rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Throughput of concurrent list queries: the synchronous Supabase client called from
+async handlers (blocks the event loop) vs the async repository over the pooled
+client. Requires backend/.env with Supabase credentials.
+
+    python scripts/benchmark_async_db.py --requests 200 --concurrency 1 4 16 32
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core.supabase_client import close_async_supabase, get_supabase  # noqa: E402
+from app.schemas.projections import CV_SUMMARY_FIELDS, select_clause  # noqa: E402
+from app.services import cv_repository  # noqa: E402
+
+USER_ID = "00000000-0000-0000-0000-000000000000"
+COLUMNS = select_clause(CV_SUMMARY_FIELDS)
+
+
+async def _sync_handler(supabase) -> None:
+    """What the routers did before: a blocking .execute() inside async def."""
+    (
+        supabase.table("cv_documents")
+        .select(COLUMNS)
+        .eq("user_id", USER_ID)
+        .order("created_at", desc=True)
+        .limit(20)
+        .execute()
+    )
+
+
+async def _async_handler(_) -> None:
+    await cv_repository.list_cvs(USER_ID, COLUMNS, 20)
+
+
+async def _throughput(handler, arg, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await handler(arg)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (time.perf_counter() - t0)
+
+
+async def _run(args) -> None:
+    supabase = get_supabase()
+    # Warm up connections and the async client
+    await _sync_handler(supabase)
+    await _async_handler(None)
+
+    print(f"{args.requests} list queries per run (requests/s)")
+    print(f"  {'concurrency':>11} {'sync client':>12} {'async repo':>12}")
+    for concurrency in args.concurrency:
+        sync_rps = await _throughput(_sync_handler, supabase, args.requests, concurrency)
+        async_rps = await _throughput(_async_handler, None, args.requests, concurrency)
+        print(f"  {concurrency:>11} {sync_rps:>12.1f} {async_rps:>12.1f}")
+    await close_async_supabase()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Payload size and encode/decode time of embedding transports: JSON float lists
+(what PostgREST upserts send), pgvector text (what selects return) and the
+base64-packed float32 / float16 codec of migration 010. No database needed.
+
+    python scripts/benchmark_embedding_codec.py --rows 1000 --dim 384
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.services.embedding_codec import decode_embedding, encode_embedding, parse_vector_text  # noqa: E402
+
+
+def _vector_text(values) -> str:
+    return "[" + ",".join(repr(float(v)) for v in values) + "]"
+
+
+TRANSPORTS = {
+    # name: (encode(list) -> str, decode(str) -> array)
+    "json": (json.dumps, lambda s: np.asarray(json.loads(s), dtype=np.float32)),
+    "pgvector text": (_vector_text, parse_vector_text),
+    "base64 float32": (lambda v: encode_embedding(v, "float32"), lambda s: decode_embedding(s, "float32")),
+    "base64 float16": (lambda v: encode_embedding(v, "float16"), lambda s: decode_embedding(s, "float16")),
+}
+
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.rows, args.dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    # What generate_embedding returns: Python float lists
+    lists = [v.tolist() for v in vectors]
+
+    print(f"{args.rows} embeddings x {args.dim} dims")
+    print(f"{'transport':<16} {'bytes/vector':>12} {'encode ms':>10} {'decode ms':>10} {'min cosine':>11}")
+    baseline = None
+    for name, (encode, decode) in TRANSPORTS.items():
+        t0 = time.perf_counter()
+        encoded = [encode(v) for v in lists]
+        encode_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        decoded = [decode(s) for s in encoded]
+        decode_ms = (time.perf_counter() - t0) * 1000
+
+        size = sum(len(s) for s in encoded) / args.rows
+        baseline = baseline or size
+        worst = min(_cosine(a, b) for a, b in zip(vectors, decoded))
+        print(
+            f"{name:<16} {size:>12.0f} {encode_ms:>10.1f} {decode_ms:>10.1f} {worst:>11.6f}"
+            f"  ({size / baseline:.0%} of json)"
+        )
+
+
+if __name__ == "__main__":
+    main()
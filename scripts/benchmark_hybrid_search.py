@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark hybrid search: one fused RPC vs two separate queries (vector + full-text)
+fused client-side. Requires backend/.env with Supabase credentials and migration 002.
+
+    python scripts/benchmark_hybrid_search.py --runs 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core.supabase_client import get_supabase  # noqa: E402
+from app.services.embedding_service import generate_embedding  # noqa: E402
+
+QUERIES = ["Terraform", "PyTorch", "Kubernetes AWS", "React TypeScript", "Java Spring"]
+RRF_K = 60
+
+
+def _single_rpc(supabase, query: str, embedding, limit: int):
+    return supabase.rpc(
+        "hybrid_search_cv_documents",
+        {"query_text": query, "query_embedding": embedding, "match_count": limit},
+    ).execute().data or []
+
+
+def _two_queries(supabase, query: str, embedding, limit: int):
+    vec = supabase.rpc(
+        "match_cv_documents",
+        {"query_embedding": embedding, "match_threshold": 0.0, "match_count": limit * 2},
+    ).execute().data or []
+    fts = (
+        supabase.table("cv_documents")
+        .select("id")
+        .text_search("fts", query, options={"config": "simple", "type": "websearch"})
+        .limit(limit * 2)
+        .execute()
+        .data
+        or []
+    )
+    scores = {}
+    for ranked in (vec, fts):
+        for rank, row in enumerate(ranked, start=1):
+            scores[row["id"]] = scores.get(row["id"], 0.0) + 1.0 / (RRF_K + rank)
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+
+def _time(fn, runs: int) -> list:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    supabase = get_supabase()
+    print(f"{'query':<20} {'single RPC p50':>16} {'two queries p50':>16}")
+    for query in QUERIES:
+        embedding = asyncio.run(generate_embedding(query))
+        one = _time(lambda: _single_rpc(supabase, query, embedding, args.limit), args.runs)
+        two = _time(lambda: _two_queries(supabase, query, embedding, args.limit), args.runs)
+        print(f"{query:<20} {statistics.median(one):>13.1f} ms {statistics.median(two):>13.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
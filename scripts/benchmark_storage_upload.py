@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark CV uploads to Supabase Storage: the previous temp-file + storage3 path
+vs direct uploads over the pooled async client. Requires backend/.env with Supabase
+credentials and the cv-originals bucket. Uploaded objects are removed afterwards.
+
+    python scripts/benchmark_storage_upload.py --uploads 40 --size-kb 300 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core.supabase_client import get_supabase  # noqa: E402
+from app.services.storage_service import BUCKET, close_http_client, upload_file  # noqa: E402
+
+PREFIX = "benchmark"
+
+
+def _legacy_upload(supabase, content: bytes, path: str) -> None:
+    """Previous implementation: write a temp file, hand its path to storage3, unlink."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        tmp.write(content)
+        tmp_path = tmp.name
+    try:
+        supabase.storage.from_(BUCKET).upload(
+            path=path, file=tmp_path, file_options={"content-type": "application/pdf"}
+        )
+    finally:
+        os.unlink(tmp_path)
+
+
+async def _run(args) -> None:
+    supabase = get_supabase()
+    content = os.urandom(args.size_kb * 1024)
+    run_id = uuid.uuid4().hex[:8]
+    paths = []
+
+    # Legacy path was sequential (sync storage3 call inside the request)
+    t0 = time.perf_counter()
+    for i in range(args.uploads):
+        path = f"{PREFIX}/{run_id}/legacy/{i}.pdf"
+        _legacy_upload(supabase, content, path)
+        paths.append(path)
+    legacy_s = time.perf_counter() - t0
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i: int) -> str:
+        async with semaphore:
+            return await upload_file(content, f"{i}.pdf", PREFIX, f"{run_id}/direct")
+
+    t0 = time.perf_counter()
+    paths.extend(await asyncio.gather(*(one(i) for i in range(args.uploads))))
+    direct_s = time.perf_counter() - t0
+    await close_http_client()
+
+    for start in range(0, len(paths), 100):
+        supabase.storage.from_(BUCKET).remove(paths[start:start + 100])
+
+    print(f"{args.uploads} uploads of {args.size_kb} KB")
+    print(f"  temp file + storage3 (sequential): {args.uploads / legacy_s:8.1f} uploads/s")
+    print(f"  direct, pooled (concurrency {args.concurrency:<3}):  {args.uploads / direct_s:8.1f} uploads/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=40)
+    parser.add_argument("--size-kb", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Report the recall / latency trade-off of the vector index against exact search.
+For each ef_search (or ivfflat probes) value, runs match_cv_documents for a set of
+queries and compares the top-k ids with the brute-force result (exact=true).
+Requires backend/.env with Supabase credentials and migration 004.
+
+    python scripts/benchmark_vector_recall.py --k 10 --ef 10 20 40 80 160
+    python scripts/benchmark_vector_recall.py --probes 1 5 10 20
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core.supabase_client import get_supabase  # noqa: E402
+from app.services.embedding_service import generate_embedding  # noqa: E402
+
+EXTRA_QUERIES = ["Terraform Kubernetes", "PyTorch NLP", "React TypeScript", "Java Spring", "penetration testing"]
+
+
+def _load_queries() -> list:
+    path = ROOT / "samples" / "job_offers.json"
+    offers = json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+    texts = [f"{o['title']} {o.get('description', '')}" for o in offers]
+    return texts + EXTRA_QUERIES
+
+
+def _match(supabase, embedding, k: int, **params):
+    t0 = time.perf_counter()
+    r = supabase.rpc(
+        "match_cv_documents",
+        {"query_embedding": embedding, "match_threshold": -1.0, "match_count": k, **params},
+    ).execute()
+    return [row["id"] for row in (r.data or [])], (time.perf_counter() - t0) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--ef", type=int, nargs="*", default=[10, 20, 40, 80, 160, 320])
+    parser.add_argument("--probes", type=int, nargs="*", default=[])
+    args = parser.parse_args()
+
+    supabase = get_supabase()
+    embeddings = [asyncio.run(generate_embedding(q)) for q in _load_queries()]
+
+    truth, exact_ms = [], []
+    for emb in embeddings:
+        ids, ms = _match(supabase, emb, args.k, exact=True)
+        truth.append(set(ids))
+        exact_ms.append(ms)
+
+    sweep = [("ef_search", v) for v in args.ef] + [("ivfflat_probes", v) for v in args.probes]
+    print(f"{len(embeddings)} queries, k={args.k}")
+    print(f"{'setting':<22} {'recall@k':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    print(f"{'exact':<22} {1.0:>9.3f} {statistics.median(exact_ms):>9.1f} {_p95(exact_ms):>9.1f}")
+    for param, value in sweep:
+        recalls, latencies = [], []
+        for emb, expected in zip(embeddings, truth):
+            ids, ms = _match(supabase, emb, args.k, **{param: value})
+            recalls.append(len(expected & set(ids)) / len(expected) if expected else 1.0)
+            latencies.append(ms)
+        label = f"{param}={value}"
+        print(f"{label:<22} {statistics.mean(recalls):>9.3f} {statistics.median(latencies):>9.1f} {_p95(latencies):>9.1f}")
+
+
+def _p95(samples: list) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Ingest CV files from a folder through the same pipeline as POST /api/cv/ingest.
+Requires backend/.env with Supabase credentials (and GROQ_API_KEY for structuring).
+
+    python scripts/ingest_cvs.py samples/resumes --concurrency 4 --source import
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core.config import settings  # noqa: E402
+from app.core.supabase_client import close_async_supabase  # noqa: E402
+from app.services.bulk_writer import BulkWriter  # noqa: E402
+from app.services.cv_pipeline import process_cv, save_cvs  # noqa: E402
+from app.services.result_cache import invalidate_results  # noqa: E402
+from app.services.storage_service import _get_content_type, close_http_client  # noqa: E402
+
+USER_ID = "00000000-0000-0000-0000-000000000000"
+
+
+async def _run(args) -> None:
+    files = sorted(
+        p for p in Path(args.folder).iterdir()
+        if p.is_file() and _get_content_type(p.name) in settings.ALLOWED_CONTENT_TYPES
+    )
+    if not files:
+        print(f"No supported files in {args.folder}")
+        return
+
+    # Stage limits (PIPELINE_*_CONCURRENCY) still apply across these CVs
+    semaphore = asyncio.Semaphore(args.concurrency)
+    writer = BulkWriter(save_cvs)
+    failed = 0
+
+    async def one(path: Path) -> None:
+        nonlocal failed
+        async with semaphore:
+            try:
+                result = await process_cv(
+                    path.read_bytes(),
+                    path.name,
+                    _get_content_type(path.name),
+                    user_id=USER_ID,
+                    source=args.source,
+                    gdpr_consent=args.gdpr_consent,
+                    save=False,
+                )
+            except Exception as e:
+                failed += 1
+                print(f"  {path.name}: failed - {e}")
+                return
+        # Wait for the batched write outside the semaphore - the slot goes to the next file
+        try:
+            await writer.add(result["row"])
+            print(f"  {path.name}: {result['cv_id']} ({result['timings_ms']['total']:.0f} ms)")
+        except Exception as e:
+            failed += 1
+            print(f"  {path.name}: not stored - {e}")
+
+    t0 = time.perf_counter()
+    # The last partial batch is flushed by the writer's interval timer
+    await asyncio.gather(*(one(p) for p in files))
+    await writer.close()
+    await invalidate_results()
+    await close_async_supabase()
+    await close_http_client()
+    print(f"Ingested {len(files) - failed}/{len(files)} CVs in {time.perf_counter() - t0:.1f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--source", default="import")
+    parser.add_argument("--gdpr-consent", action="store_true")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
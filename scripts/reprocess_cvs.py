@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Re-run only the stale stages of stored CVs after a prompt or model change:
+structuring when PROMPT_VERSION (llm_structuring.py) or LLM_MODEL differ from the
+row's, the embedding when EMBEDDING_MODEL does (migration 012). Works from the
+stored raw_text - no download, no OCR. Requires backend/.env with Supabase
+credentials (and GROQ_API_KEY for structuring).
+
+    python scripts/reprocess_cvs.py --dry-run
+    python scripts/reprocess_cvs.py --stage llm --concurrency 2 --llm-per-minute 30
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core.supabase_client import close_async_supabase  # noqa: E402
+from app.services.reprocessing import reprocess_stale_cvs  # noqa: E402
+from app.services.result_cache import invalidate_results  # noqa: E402
+
+
+async def _run(args) -> None:
+    t0 = time.perf_counter()
+    counts = await reprocess_stale_cvs(
+        stages=args.stage or ("llm", "embedding"),
+        limit=args.limit,
+        concurrency=args.concurrency,
+        llm_per_minute=args.llm_per_minute,
+        dry_run=args.dry_run,
+        on_result=lambda cv_id, stages, outcome: print(f"  {cv_id} [{', '.join(stages)}]: {outcome}"),
+    )
+    if counts["reprocessed"]:
+        await invalidate_results()
+    await close_async_supabase()
+    print(
+        f"{counts['stale']} stale CVs, {counts['reprocessed']} reprocessed, {counts['failed']} failed"
+        f" in {time.perf_counter() - t0:.1f} s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stage", action="append", choices=("llm", "embedding"),
+                        help="only this stage (repeatable; default both)")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=None, help="default REPROCESS_CONCURRENCY")
+    parser.add_argument("--llm-per-minute", type=int, default=None, help="default REPROCESS_LLM_PER_MINUTE")
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
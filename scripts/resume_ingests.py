@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Resume failed or interrupted ingests from their checkpoints (migration 011): CVs in
+status 'error', CVs still 'processing' after --stale-minutes, and active CVs with
+a stage left to redo (e.g. a failed Groq call). Stored stage outputs are reused,
+so OCR is never run twice. Requires backend/.env with Supabase credentials.
+
+    python scripts/resume_ingests.py --stale-minutes 15 --concurrency 2
+    python scripts/resume_ingests.py --dry-run
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from app.core.supabase_client import close_async_supabase  # noqa: E402
+from app.services import cv_repository  # noqa: E402
+from app.services.cv_pipeline import PROCESSING_STAGES, resume_cv  # noqa: E402
+from app.services.result_cache import invalidate_results  # noqa: E402
+from app.services.storage_service import close_http_client  # noqa: E402
+
+
+async def _run(args) -> None:
+    stale_before = (datetime.now(timezone.utc) - timedelta(minutes=args.stale_minutes)).isoformat()
+    rows = await cv_repository.list_resumable_cvs(stale_before, PROCESSING_STAGES, args.limit)
+    if not rows:
+        print("Nothing to resume")
+        await close_async_supabase()
+        return
+
+    if args.dry_run:
+        for row in rows:
+            missing = [s for s in PROCESSING_STAGES if s not in (row.get("completed_stages") or [])]
+            print(f"  {row['id']}: {row['status']}, missing {', '.join(missing) or 'activation'}")
+        await close_async_supabase()
+        return
+
+    # Stage limits (PIPELINE_*_CONCURRENCY) still apply across these CVs
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failed = 0
+
+    async def one(cv_id: str) -> None:
+        nonlocal failed
+        async with semaphore:
+            try:
+                result = await resume_cv(cv_id)
+                restored = ", ".join(result["restored"]) or "nothing"
+                print(f"  {cv_id}: resumed (restored {restored}, {result['timings_ms']['total']:.0f} ms)")
+            except Exception as e:
+                failed += 1
+                print(f"  {cv_id}: failed - {e}")
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(row["id"]) for row in rows))
+    await invalidate_results()
+    await close_async_supabase()
+    await close_http_client()
+    print(f"Resumed {len(rows) - failed}/{len(rows)} CVs in {time.perf_counter() - t0:.1f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stale-minutes", type=float, default=15,
+                        help="resume 'processing' CVs not updated for this long")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+-- ATS Intelligent System - Hybrid lexical + vector search
+-- Run after 001_initial.sql
+
+-- =============================================================================
+-- Full-text column over raw_text and skills
+-- =============================================================================
+-- 'simple' config: no stemming/stop words, so exact skill tokens ("Terraform",
+-- "PyTorch") match as written, in any CV language. Skills are weighted above body text.
+ALTER TABLE cv_documents
+    ADD COLUMN IF NOT EXISTS fts tsvector
+    GENERATED ALWAYS AS (
+        setweight(jsonb_to_tsvector('simple', coalesce(structured_data->'skills', '[]'::jsonb), '["string"]'), 'A')
+        || setweight(to_tsvector('simple', coalesce(raw_text, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_cv_documents_fts ON cv_documents USING GIN (fts);
+
+-- =============================================================================
+-- RPC: Hybrid search (full-text + pgvector, reciprocal rank fusion)
+-- =============================================================================
+-- Both retrievals run in one call; each contributes 1 / (rrf_k + rank).
+CREATE OR REPLACE FUNCTION hybrid_search_cv_documents(
+    query_text text,
+    query_embedding vector(384),
+    match_count int DEFAULT 10,
+    full_text_weight float DEFAULT 1.0,
+    semantic_weight float DEFAULT 1.0,
+    rrf_k int DEFAULT 60,
+    filter_user_id uuid DEFAULT NULL
+)
+RETURNS TABLE (id uuid, score float, similarity float, fts_rank int, semantic_rank int)
+LANGUAGE sql
+STABLE
+AS $$
+WITH full_text AS (
+    SELECT
+        cv_documents.id,
+        row_number() OVER (
+            ORDER BY ts_rank_cd(cv_documents.fts, websearch_to_tsquery('simple', query_text)) DESC
+        )::int AS rank_ix
+    FROM cv_documents
+    WHERE cv_documents.fts @@ websearch_to_tsquery('simple', query_text)
+      AND (filter_user_id IS NULL OR cv_documents.user_id = filter_user_id)
+    ORDER BY rank_ix
+    LIMIT match_count * 2
+),
+semantic AS (
+    SELECT
+        cv_documents.id,
+        1 - (cv_documents.embedding <=> query_embedding) AS similarity,
+        row_number() OVER (ORDER BY cv_documents.embedding <=> query_embedding)::int AS rank_ix
+    FROM cv_documents
+    WHERE cv_documents.embedding IS NOT NULL
+      AND (filter_user_id IS NULL OR cv_documents.user_id = filter_user_id)
+    ORDER BY cv_documents.embedding <=> query_embedding
+    LIMIT match_count * 2
+)
+SELECT
+    coalesce(full_text.id, semantic.id) AS id,
+    coalesce(full_text_weight / (rrf_k + full_text.rank_ix), 0.0)
+        + coalesce(semantic_weight / (rrf_k + semantic.rank_ix), 0.0) AS score,
+    semantic.similarity,
+    full_text.rank_ix AS fts_rank,
+    semantic.rank_ix AS semantic_rank
+FROM full_text
+FULL OUTER JOIN semantic ON full_text.id = semantic.id
+ORDER BY score DESC
+LIMIT match_count;
+$$;
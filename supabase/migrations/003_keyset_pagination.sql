@@ -0,0 +1,10 @@
+-- ATS Intelligent System - Keyset pagination for the CV listing
+-- Run after 002_hybrid_search.sql
+
+-- Matches: WHERE user_id = $1 AND (created_at, id) < cursor ORDER BY created_at DESC, id DESC
+-- Every page is an index range scan from the cursor, independent of page depth.
+CREATE INDEX IF NOT EXISTS idx_cv_documents_user_created_id
+    ON cv_documents (user_id, created_at DESC, id DESC);
+
+-- Planner estimates (count=planned) are only as good as the table statistics
+ANALYZE cv_documents;
@@ -0,0 +1,67 @@
+-- ATS Intelligent System - HNSW vector index + per-query recall/speed tuning
+-- Run after 003_keyset_pagination.sql (requires pgvector >= 0.5.0)
+
+-- =============================================================================
+-- HNSW index (replaces ivfflat lists = 10)
+-- =============================================================================
+-- ivfflat built on an empty table has meaningless centroids; HNSW needs no training
+-- and keeps recall as rows are added. Tune the build here:
+--   m               links per node (16 default; 24-32 for higher recall, bigger index)
+--   ef_construction candidate list at build time (64 default; >= 2 * m)
+DO $$
+DECLARE
+    hnsw_m int := 16;
+    hnsw_ef_construction int := 64;
+BEGIN
+    EXECUTE format(
+        'CREATE INDEX IF NOT EXISTS idx_cv_documents_embedding_hnsw ON cv_documents '
+        'USING hnsw (embedding vector_cosine_ops) WITH (m = %s, ef_construction = %s)',
+        hnsw_m, hnsw_ef_construction
+    );
+END
+$$;
+
+DROP INDEX IF EXISTS idx_cv_documents_embedding;
+
+-- =============================================================================
+-- RPC: Semantic search with per-call tuning
+-- =============================================================================
+-- ef_search:      HNSW candidate list (pgvector default 40); higher = better recall, slower
+-- ivfflat_probes: lists probed when an ivfflat index is used instead
+-- exact:          disable index scans - brute-force ground truth for recall measurement
+-- Settings are SET LOCAL (transaction scope), so they never leak to other calls.
+DROP FUNCTION IF EXISTS match_cv_documents(vector, float, int);
+
+CREATE OR REPLACE FUNCTION match_cv_documents(
+    query_embedding vector(384),
+    match_threshold float DEFAULT 0.5,
+    match_count int DEFAULT 10,
+    ef_search int DEFAULT NULL,
+    ivfflat_probes int DEFAULT NULL,
+    exact boolean DEFAULT false
+)
+RETURNS TABLE (id uuid, similarity float)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF ef_search IS NOT NULL THEN
+        PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+    END IF;
+    IF ivfflat_probes IS NOT NULL THEN
+        PERFORM set_config('ivfflat.probes', ivfflat_probes::text, true);
+    END IF;
+    IF exact THEN
+        PERFORM set_config('enable_indexscan', 'off', true);
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        cv_documents.id,
+        1 - (cv_documents.embedding <=> query_embedding) AS similarity
+    FROM cv_documents
+    WHERE cv_documents.embedding IS NOT NULL
+      AND 1 - (cv_documents.embedding <=> query_embedding) > match_threshold
+    ORDER BY cv_documents.embedding <=> query_embedding
+    LIMIT match_count;
+END;
+$$;
@@ -0,0 +1,110 @@
+-- ATS Intelligent System - Metadata filter pushdown into vector search
+-- Run after 004_hnsw_index.sql (requires pgvector >= 0.8.0 for iterative index scans)
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- =============================================================================
+-- Supporting indexes for filterable structured_data paths
+-- =============================================================================
+-- Skills as a tsvector: works for both ["Python"] and [{"name": "Python"}] shapes,
+-- case-insensitive, multi-word skills matched as phrases.
+ALTER TABLE cv_documents
+    ADD COLUMN IF NOT EXISTS skills_tsv tsvector
+    GENERATED ALWAYS AS (
+        jsonb_to_tsvector('simple', coalesce(structured_data->'skills', '[]'::jsonb), '["string"]')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_cv_documents_skills_tsv ON cv_documents USING GIN (skills_tsv);
+
+CREATE INDEX IF NOT EXISTS idx_cv_documents_source_type ON cv_documents (source_type);
+
+CREATE INDEX IF NOT EXISTS idx_cv_documents_seniority
+    ON cv_documents (lower(structured_data->'career_summary'->>'seniority_level'));
+
+CREATE INDEX IF NOT EXISTS idx_cv_documents_location_trgm
+    ON cv_documents USING GIN ((structured_data->'candidate_info'->>'location') gin_trgm_ops);
+
+-- =============================================================================
+-- RPC: Semantic search with structured filters
+-- =============================================================================
+-- filters (all optional, AND-ed):
+--   {"user_id": "...", "status": ["active"], "source_type": ["upload", "sample"],
+--    "seniority": "senior", "location": "Paris", "skills": ["Kubernetes", "Terraform"]}
+-- With filters set, hnsw.iterative_scan keeps walking the graph until match_count rows
+-- pass the filter, so callers get a full top-k without over-fetching.
+DROP FUNCTION IF EXISTS match_cv_documents(vector, float, int, int, int, boolean);
+
+CREATE OR REPLACE FUNCTION match_cv_documents(
+    query_embedding vector(384),
+    match_threshold float DEFAULT 0.5,
+    match_count int DEFAULT 10,
+    ef_search int DEFAULT NULL,
+    ivfflat_probes int DEFAULT NULL,
+    exact boolean DEFAULT false,
+    filters jsonb DEFAULT '{}'::jsonb
+)
+RETURNS TABLE (id uuid, similarity float)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    f_user_id uuid := (filters->>'user_id')::uuid;
+    f_status text[];
+    f_source_types text[];
+    f_seniority text := lower(filters->>'seniority');
+    f_location text := filters->>'location';
+    f_skills tsquery;
+    skill text;
+BEGIN
+    IF jsonb_typeof(filters->'status') = 'array' THEN
+        f_status := ARRAY(SELECT jsonb_array_elements_text(filters->'status'));
+    END IF;
+    IF jsonb_typeof(filters->'source_type') = 'array' THEN
+        f_source_types := ARRAY(SELECT jsonb_array_elements_text(filters->'source_type'));
+    END IF;
+    IF jsonb_typeof(filters->'skills') = 'array' THEN
+        FOR skill IN SELECT jsonb_array_elements_text(filters->'skills') LOOP
+            f_skills := CASE WHEN f_skills IS NULL
+                THEN phraseto_tsquery('simple', skill)
+                ELSE f_skills && phraseto_tsquery('simple', skill) END;
+        END LOOP;
+    END IF;
+
+    IF ef_search IS NOT NULL THEN
+        PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+    END IF;
+    IF ivfflat_probes IS NOT NULL THEN
+        PERFORM set_config('ivfflat.probes', ivfflat_probes::text, true);
+    END IF;
+    IF filters <> '{}'::jsonb THEN
+        PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+        PERFORM set_config('ivfflat.iterative_scan', 'relaxed_order', true);
+    END IF;
+    IF exact THEN
+        PERFORM set_config('enable_indexscan', 'off', true);
+    END IF;
+
+    RETURN QUERY
+    WITH candidates AS MATERIALIZED (
+        SELECT
+            cv_documents.id,
+            cv_documents.embedding <=> query_embedding AS distance
+        FROM cv_documents
+        WHERE cv_documents.embedding IS NOT NULL
+          AND (f_user_id IS NULL OR cv_documents.user_id = f_user_id)
+          AND (f_status IS NULL OR cv_documents.status = ANY (f_status))
+          AND (f_source_types IS NULL OR cv_documents.source_type = ANY (f_source_types))
+          AND (f_seniority IS NULL
+               OR lower(cv_documents.structured_data->'career_summary'->>'seniority_level') = f_seniority)
+          AND (f_location IS NULL
+               OR cv_documents.structured_data->'candidate_info'->>'location' ILIKE '%' || f_location || '%')
+          AND (f_skills IS NULL OR cv_documents.skills_tsv @@ f_skills)
+          AND 1 - (cv_documents.embedding <=> query_embedding) > match_threshold
+        ORDER BY cv_documents.embedding <=> query_embedding
+        LIMIT match_count
+    )
+    -- relaxed_order may return slightly out-of-order rows: re-sort the final top-k
+    SELECT candidates.id, 1 - candidates.distance AS similarity
+    FROM candidates
+    ORDER BY candidates.distance;
+END;
+$$;
@@ -0,0 +1,35 @@
+-- ATS Intelligent System - Batch matching (many job descriptions x CV pool)
+-- Run after 005_filtered_vector_search.sql
+
+-- =============================================================================
+-- RPC: top-k CVs for N query embeddings in one call
+-- =============================================================================
+-- query_embeddings: JSON array of 384-float arrays (one per job).
+-- Each query reuses match_cv_documents (index scan + filters) via LATERAL, so the
+-- whole batch is one round trip. Returns query_index (0-based) with its matches.
+CREATE OR REPLACE FUNCTION match_cv_documents_batch(
+    query_embeddings jsonb,
+    match_threshold float DEFAULT 0.3,
+    match_count int DEFAULT 10,
+    ef_search int DEFAULT NULL,
+    filters jsonb DEFAULT '{}'::jsonb
+)
+RETURNS TABLE (query_index int, id uuid, similarity float)
+LANGUAGE sql
+AS $$
+    SELECT
+        (q.ord - 1)::int AS query_index,
+        m.id,
+        m.similarity
+    FROM jsonb_array_elements(query_embeddings) WITH ORDINALITY AS q(embedding, ord)
+    CROSS JOIN LATERAL match_cv_documents(
+        (q.embedding::text)::vector(384),
+        match_threshold,
+        match_count,
+        ef_search,
+        NULL,
+        false,
+        filters
+    ) AS m
+    ORDER BY query_index, m.similarity DESC;
+$$;
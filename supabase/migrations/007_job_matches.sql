@@ -0,0 +1,129 @@
+-- ATS Intelligent System - Stored job offer embeddings + materialized job matches
+-- Run after 006_batch_matching.sql
+
+-- =============================================================================
+-- Job offers: embedding stored once, open/closed status, sample key
+-- =============================================================================
+ALTER TABLE job_offers ADD COLUMN IF NOT EXISTS embedding vector(384);
+ALTER TABLE job_offers ADD COLUMN IF NOT EXISTS embedding_model TEXT;
+ALTER TABLE job_offers ADD COLUMN IF NOT EXISTS department TEXT;
+ALTER TABLE job_offers ADD COLUMN IF NOT EXISTS status TEXT DEFAULT 'open'
+    CHECK (status IN ('open', 'closed', 'archived'));
+-- Stable key for jobs loaded from samples/job_offers.json ("job-001", ...)
+ALTER TABLE job_offers ADD COLUMN IF NOT EXISTS external_id TEXT UNIQUE;
+
+CREATE INDEX IF NOT EXISTS idx_job_offers_status ON job_offers (status);
+
+DROP TRIGGER IF EXISTS update_job_offers_updated_at ON job_offers;
+CREATE TRIGGER update_job_offers_updated_at
+    BEFORE UPDATE ON job_offers
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- =============================================================================
+-- Job matches: top-k candidates per job, read with one index range scan
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS job_matches (
+    job_id UUID NOT NULL REFERENCES job_offers(id) ON DELETE CASCADE,
+    cv_id UUID NOT NULL REFERENCES cv_documents(id) ON DELETE CASCADE,
+    similarity FLOAT NOT NULL,
+    computed_at TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (job_id, cv_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_matches_job_similarity ON job_matches (job_id, similarity DESC);
+CREATE INDEX IF NOT EXISTS idx_job_matches_cv_id ON job_matches (cv_id);
+
+ALTER TABLE job_matches ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Users can view matches for own job offers" ON job_matches
+    FOR SELECT USING (
+        EXISTS (SELECT 1 FROM job_offers j WHERE j.id = job_matches.job_id AND j.user_id = auth.uid())
+    );
+
+-- =============================================================================
+-- RPC: refresh one job against the whole CV pool (new or edited job)
+-- =============================================================================
+CREATE OR REPLACE FUNCTION refresh_job_matches_for_job(
+    p_job_id uuid,
+    match_count int DEFAULT 50,
+    match_threshold float DEFAULT 0.3
+)
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    job_embedding vector(384);
+    inserted int;
+BEGIN
+    SELECT embedding INTO job_embedding FROM job_offers WHERE id = p_job_id;
+    DELETE FROM job_matches WHERE job_id = p_job_id;
+    IF job_embedding IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    INSERT INTO job_matches (job_id, cv_id, similarity)
+    SELECT p_job_id, m.id, m.similarity
+    FROM match_cv_documents(
+        job_embedding,
+        match_threshold,
+        match_count,
+        greatest(match_count * 2, 40),
+        NULL,
+        false,
+        '{"status": ["active"]}'::jsonb
+    ) AS m;
+
+    GET DIAGNOSTICS inserted = ROW_COUNT;
+    RETURN inserted;
+END;
+$$;
+
+-- =============================================================================
+-- RPC: refresh one CV against open jobs only (new or reprocessed CV)
+-- =============================================================================
+-- Inserts the CV into every open job it qualifies for, then trims those jobs
+-- back to their top match_count. Cost is O(open jobs), independent of pool size.
+CREATE OR REPLACE FUNCTION refresh_job_matches_for_cv(
+    p_cv_id uuid,
+    match_count int DEFAULT 50,
+    match_threshold float DEFAULT 0.3
+)
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    cv_embedding vector(384);
+    inserted int;
+BEGIN
+    SELECT embedding INTO cv_embedding
+    FROM cv_documents
+    WHERE id = p_cv_id AND status = 'active';
+
+    DELETE FROM job_matches WHERE cv_id = p_cv_id;
+    IF cv_embedding IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    INSERT INTO job_matches (job_id, cv_id, similarity)
+    SELECT j.id, p_cv_id, 1 - (j.embedding <=> cv_embedding)
+    FROM job_offers j
+    WHERE j.status = 'open'
+      AND j.embedding IS NOT NULL
+      AND 1 - (j.embedding <=> cv_embedding) > match_threshold;
+
+    GET DIAGNOSTICS inserted = ROW_COUNT;
+
+    DELETE FROM job_matches jm
+    USING (
+        SELECT job_id, cv_id,
+               row_number() OVER (PARTITION BY job_id ORDER BY similarity DESC) AS rn
+        FROM job_matches
+        WHERE job_id IN (SELECT job_id FROM job_matches WHERE cv_id = p_cv_id)
+    ) ranked
+    WHERE jm.job_id = ranked.job_id
+      AND jm.cv_id = ranked.cv_id
+      AND ranked.rn > match_count;
+
+    RETURN inserted;
+END;
+$$;
@@ -0,0 +1,88 @@
+-- ATS Intelligent System - Server-side candidate scoring
+-- Run after 007_job_matches.sql
+
+-- Array length that tolerates missing / non-array values in LLM-produced JSON
+CREATE OR REPLACE FUNCTION jsonb_array_length_safe(value jsonb)
+RETURNS int
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT CASE WHEN jsonb_typeof(value) = 'array' THEN jsonb_array_length(value) ELSE 0 END;
+$$;
+
+-- =============================================================================
+-- RPC: multi-criteria scoring over structured_data
+-- =============================================================================
+-- Same breakdown as the API's scoring engine:
+--   skills     fraction of job skill groups matched (or saturated count / 10 without a job)
+--   experience saturated count / 5, education saturated count / 3, quality = quality_score
+-- skill_groups: [["javascript", "js", ...], ["postgresql", "postgres", ...]] - one group per
+--   required skill with its aliases; a group matches if any variant is in skills_tsv.
+-- Returns only ids, scores and breakdowns, best first, limited server-side.
+CREATE OR REPLACE FUNCTION score_cv_documents(
+    cv_ids uuid[],
+    w_skills float DEFAULT 0.4,
+    w_experience float DEFAULT 0.3,
+    w_education float DEFAULT 0.2,
+    w_quality float DEFAULT 0.1,
+    skill_groups jsonb DEFAULT NULL,
+    result_limit int DEFAULT NULL
+)
+RETURNS TABLE (
+    id uuid,
+    score float,
+    skills float,
+    experience float,
+    education float,
+    quality float,
+    matched_skills text[]
+)
+LANGUAGE sql
+STABLE
+AS $$
+WITH features AS (
+    SELECT
+        c.id,
+        CASE
+            WHEN jsonb_array_length_safe(skill_groups) = 0
+                THEN least(jsonb_array_length_safe(c.structured_data->'skills') / 10.0, 1.0)
+            ELSE coalesce(cardinality(m.matched), 0)::float / jsonb_array_length_safe(skill_groups)
+        END AS f_skills,
+        least(jsonb_array_length_safe(c.structured_data->'experiences') / 5.0, 1.0) AS f_experience,
+        least(jsonb_array_length_safe(c.structured_data->'education') / 3.0, 1.0) AS f_education,
+        coalesce(c.quality_score, 0.0) AS f_quality,
+        coalesce(m.matched, '{}'::text[]) AS matched
+    FROM cv_documents c
+    LEFT JOIN LATERAL (
+        SELECT array_agg(g->>0) AS matched
+        FROM jsonb_array_elements(CASE WHEN jsonb_typeof(skill_groups) = 'array' THEN skill_groups END) AS g
+        WHERE EXISTS (
+            SELECT 1
+            FROM jsonb_array_elements_text(g) AS v
+            WHERE c.skills_tsv @@ phraseto_tsquery('simple', v)
+        )
+    ) m ON true
+    WHERE c.id = ANY (cv_ids)
+),
+weighted AS (
+    SELECT
+        id,
+        f_skills * w_skills AS skills,
+        f_experience * w_experience AS experience,
+        f_education * w_education AS education,
+        f_quality * w_quality AS quality,
+        matched
+    FROM features
+)
+SELECT
+    id,
+    round(least(skills + experience + education + quality, 1.0)::numeric, 2)::float AS score,
+    round(skills::numeric, 2)::float,
+    round(experience::numeric, 2)::float,
+    round(education::numeric, 2)::float,
+    round(quality::numeric, 2)::float,
+    matched
+FROM weighted
+ORDER BY score DESC, id
+LIMIT result_limit;
+$$;
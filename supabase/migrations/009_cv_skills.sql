@@ -0,0 +1,155 @@
+-- ATS Intelligent System - Normalized skills table with indexed lookup
+-- Run after 008_score_candidates_rpc.sql
+-- Existing CVs: python scripts/backfill_cv_skills.py
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- =============================================================================
+-- cv_skills: one row per (CV, canonical skill), written at ingestion
+-- =============================================================================
+-- skill_norm is the API's canonical name ("JS" -> "javascript", "k8s" -> "kubernetes").
+CREATE TABLE IF NOT EXISTS cv_skills (
+    cv_id UUID NOT NULL REFERENCES cv_documents(id) ON DELETE CASCADE,
+    skill_norm TEXT NOT NULL,
+    skill_raw TEXT,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (cv_id, skill_norm)
+);
+
+-- Exact lookups ("all CVs with kubernetes"): index-only scan on (skill_norm, cv_id)
+CREATE INDEX IF NOT EXISTS idx_cv_skills_skill_norm ON cv_skills (skill_norm, cv_id);
+-- Fuzzy / prefix suggestions ("kube", "terraf")
+CREATE INDEX IF NOT EXISTS idx_cv_skills_skill_trgm ON cv_skills USING GIN (skill_norm gin_trgm_ops);
+
+ALTER TABLE cv_skills ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Users can view skills of own CVs" ON cv_skills
+    FOR SELECT USING (
+        EXISTS (SELECT 1 FROM cv_documents c WHERE c.id = cv_skills.cv_id AND c.user_id = auth.uid())
+    );
+
+-- =============================================================================
+-- RPC: CV ids by skills (AND over all_skills, OR over any_skills)
+-- =============================================================================
+-- Skills must already be canonical (the API normalizes them). Ranked by matched count.
+CREATE OR REPLACE FUNCTION find_cvs_by_skills(
+    all_skills text[] DEFAULT NULL,
+    any_skills text[] DEFAULT NULL,
+    filter_user_id uuid DEFAULT NULL,
+    result_limit int DEFAULT NULL
+)
+RETURNS TABLE (cv_id uuid, matched int)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT s.cv_id, count(*)::int AS matched
+    FROM cv_skills s
+    JOIN cv_documents c ON c.id = s.cv_id
+    WHERE s.skill_norm = ANY (coalesce(all_skills, '{}') || coalesce(any_skills, '{}'))
+      AND (filter_user_id IS NULL OR c.user_id = filter_user_id)
+    GROUP BY s.cv_id
+    HAVING count(*) FILTER (WHERE s.skill_norm = ANY (coalesce(all_skills, '{}')))
+               = coalesce(cardinality(all_skills), 0)
+       AND (coalesce(cardinality(any_skills), 0) = 0
+            OR count(*) FILTER (WHERE s.skill_norm = ANY (any_skills)) > 0)
+    ORDER BY matched DESC, s.cv_id
+    LIMIT result_limit;
+$$;
+
+-- =============================================================================
+-- RPC: skill suggestions (trigram similarity) with CV counts
+-- =============================================================================
+CREATE OR REPLACE FUNCTION suggest_skills(query text, result_limit int DEFAULT 10)
+RETURNS TABLE (skill_norm text, cv_count int)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT s.skill_norm, count(*)::int AS cv_count
+    FROM cv_skills s
+    WHERE s.skill_norm % lower(query) OR s.skill_norm LIKE lower(query) || '%'
+    GROUP BY s.skill_norm
+    ORDER BY max(similarity(s.skill_norm, lower(query))) DESC, cv_count DESC
+    LIMIT result_limit;
+$$;
+
+-- =============================================================================
+-- match_cv_documents: add the cv_ids prefilter ({"cv_ids": [...]}, e.g. from find_cvs_by_skills)
+-- =============================================================================
+CREATE OR REPLACE FUNCTION match_cv_documents(
+    query_embedding vector(384),
+    match_threshold float DEFAULT 0.5,
+    match_count int DEFAULT 10,
+    ef_search int DEFAULT NULL,
+    ivfflat_probes int DEFAULT NULL,
+    exact boolean DEFAULT false,
+    filters jsonb DEFAULT '{}'::jsonb
+)
+RETURNS TABLE (id uuid, similarity float)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    f_user_id uuid := (filters->>'user_id')::uuid;
+    f_status text[];
+    f_source_types text[];
+    f_seniority text := lower(filters->>'seniority');
+    f_location text := filters->>'location';
+    f_skills tsquery;
+    f_cv_ids uuid[];
+    skill text;
+BEGIN
+    IF jsonb_typeof(filters->'cv_ids') = 'array' THEN
+        f_cv_ids := ARRAY(SELECT jsonb_array_elements_text(filters->'cv_ids')::uuid);
+    END IF;
+    IF jsonb_typeof(filters->'status') = 'array' THEN
+        f_status := ARRAY(SELECT jsonb_array_elements_text(filters->'status'));
+    END IF;
+    IF jsonb_typeof(filters->'source_type') = 'array' THEN
+        f_source_types := ARRAY(SELECT jsonb_array_elements_text(filters->'source_type'));
+    END IF;
+    IF jsonb_typeof(filters->'skills') = 'array' THEN
+        FOR skill IN SELECT jsonb_array_elements_text(filters->'skills') LOOP
+            f_skills := CASE WHEN f_skills IS NULL
+                THEN phraseto_tsquery('simple', skill)
+                ELSE f_skills && phraseto_tsquery('simple', skill) END;
+        END LOOP;
+    END IF;
+
+    IF ef_search IS NOT NULL THEN
+        PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+    END IF;
+    IF ivfflat_probes IS NOT NULL THEN
+        PERFORM set_config('ivfflat.probes', ivfflat_probes::text, true);
+    END IF;
+    IF filters <> '{}'::jsonb THEN
+        PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+        PERFORM set_config('ivfflat.iterative_scan', 'relaxed_order', true);
+    END IF;
+    IF exact THEN
+        PERFORM set_config('enable_indexscan', 'off', true);
+    END IF;
+
+    RETURN QUERY
+    WITH candidates AS MATERIALIZED (
+        SELECT
+            cv_documents.id,
+            cv_documents.embedding <=> query_embedding AS distance
+        FROM cv_documents
+        WHERE cv_documents.embedding IS NOT NULL
+          AND (f_cv_ids IS NULL OR cv_documents.id = ANY (f_cv_ids))
+          AND (f_user_id IS NULL OR cv_documents.user_id = f_user_id)
+          AND (f_status IS NULL OR cv_documents.status = ANY (f_status))
+          AND (f_source_types IS NULL OR cv_documents.source_type = ANY (f_source_types))
+          AND (f_seniority IS NULL
+               OR lower(cv_documents.structured_data->'career_summary'->>'seniority_level') = f_seniority)
+          AND (f_location IS NULL
+               OR cv_documents.structured_data->'candidate_info'->>'location' ILIKE '%' || f_location || '%')
+          AND (f_skills IS NULL OR cv_documents.skills_tsv @@ f_skills)
+          AND 1 - (cv_documents.embedding <=> query_embedding) > match_threshold
+        ORDER BY cv_documents.embedding <=> query_embedding
+        LIMIT match_count
+    )
+    -- relaxed_order may return slightly out-of-order rows: re-sort the final top-k
+    SELECT candidates.id, 1 - candidates.distance AS similarity
+    FROM candidates
+    ORDER BY candidates.distance;
+END;
+$$;
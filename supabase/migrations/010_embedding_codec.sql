@@ -0,0 +1,119 @@
+-- ATS Intelligent System - Compact embedding transport
+-- Run after 009_cv_skills.sql
+--
+-- Embeddings travel as base64 of packed big-endian floats instead of JSON / pgvector
+-- text ("[0.0123,-0.0456,...]", ~8 KB per 384-dim vector). float32 is exact
+-- (2 KB base64 for 384 dims); float16 halves that again with ~3 significant digits,
+-- which does not change cosine rankings. Storage stays vector(384) either way.
+
+-- =============================================================================
+-- Codec functions
+-- =============================================================================
+-- packed: base64 of big-endian float32 (4 bytes/dim) or float16 (2 bytes/dim)
+CREATE OR REPLACE FUNCTION vector_from_base64(packed text, dtype text DEFAULT 'float32')
+RETURNS vector
+LANGUAGE sql
+IMMUTABLE
+STRICT
+AS $$
+    WITH raw AS (
+        SELECT decode(packed, 'base64') AS b,
+               CASE dtype WHEN 'float16' THEN 2 ELSE 4 END AS width
+    ),
+    words AS (
+        SELECT i,
+               CASE width
+                   WHEN 2 THEN (get_byte(b, i * 2)::bigint << 8) | get_byte(b, i * 2 + 1)
+                   ELSE (get_byte(b, i * 4)::bigint << 24) | (get_byte(b, i * 4 + 1)::bigint << 16)
+                        | (get_byte(b, i * 4 + 2)::bigint << 8) | get_byte(b, i * 4 + 3)
+               END AS bits,
+               width
+        FROM raw, generate_series(0, length(b) / width - 1) AS i
+    )
+    SELECT array_agg(
+        (CASE WHEN width = 2 THEN
+             -- sign(1) exponent(5, bias 15) mantissa(10)
+             CASE WHEN (bits >> 10) & 31 = 0
+                  THEN (bits & 1023) * power(2::float8, -24)
+                  ELSE (1 + (bits & 1023) / 1024.0::float8) * power(2::float8, ((bits >> 10) & 31) - 15)
+             END * (1 - 2 * ((bits >> 15) & 1))
+         ELSE
+             -- sign(1) exponent(8, bias 127) mantissa(23)
+             CASE WHEN (bits >> 23) & 255 = 0
+                  THEN (bits & 8388607) * power(2::float8, -149)
+                  ELSE (1 + (bits & 8388607) / 8388608.0::float8) * power(2::float8, ((bits >> 23) & 255) - 127)
+             END * (1 - 2 * ((bits >> 31) & 1))
+         END)::real
+        ORDER BY i
+    )::vector
+    FROM words;
+$$;
+
+-- vector_send is pgvector's binary output: int16 dim, int16 unused, then big-endian float32s
+CREATE OR REPLACE FUNCTION vector_to_base64(v vector)
+RETURNS text
+LANGUAGE sql
+IMMUTABLE
+STRICT
+AS $$
+    SELECT replace(encode(substring(vector_send(v) FROM 5), 'base64'), E'\n', '');
+$$;
+
+-- Computed column: select=id,embedding_b64 returns the packed float32 embedding
+CREATE OR REPLACE FUNCTION embedding_b64(cv cv_documents)
+RETURNS text
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT vector_to_base64(cv.embedding);
+$$;
+
+-- =============================================================================
+-- RPC: multi-row upsert with packed embeddings
+-- =============================================================================
+-- rows: [{...cv_documents columns..., "embedding_b64": "...", "embedding_dtype": "float32"}]
+-- Upsert on id, so a retried batch is harmless (the BulkWriter relies on it).
+CREATE OR REPLACE FUNCTION upsert_cv_documents_packed(rows jsonb)
+RETURNS int
+LANGUAGE sql
+AS $$
+    WITH written AS (
+        INSERT INTO cv_documents (
+            id, user_id, original_file_path, raw_text, structured_data, embedding,
+            quality_score, status, source_type, original_filename, mime_type,
+            file_size_bytes, gdpr_consent, processing_error
+        )
+        SELECT
+            (r->>'id')::uuid,
+            (r->>'user_id')::uuid,
+            r->>'original_file_path',
+            r->>'raw_text',
+            coalesce(r->'structured_data', '{}'::jsonb),
+            vector_from_base64(r->>'embedding_b64', coalesce(r->>'embedding_dtype', 'float32')),
+            (r->>'quality_score')::float,
+            coalesce(r->>'status', 'active'),
+            coalesce(r->>'source_type', 'upload'),
+            r->>'original_filename',
+            r->>'mime_type',
+            (r->>'file_size_bytes')::bigint,
+            coalesce((r->>'gdpr_consent')::boolean, false),
+            r->>'processing_error'
+        FROM jsonb_array_elements(rows) AS r
+        ON CONFLICT (id) DO UPDATE SET
+            user_id = EXCLUDED.user_id,
+            original_file_path = EXCLUDED.original_file_path,
+            raw_text = EXCLUDED.raw_text,
+            structured_data = EXCLUDED.structured_data,
+            embedding = EXCLUDED.embedding,
+            quality_score = EXCLUDED.quality_score,
+            status = EXCLUDED.status,
+            source_type = EXCLUDED.source_type,
+            original_filename = EXCLUDED.original_filename,
+            mime_type = EXCLUDED.mime_type,
+            file_size_bytes = EXCLUDED.file_size_bytes,
+            gdpr_consent = EXCLUDED.gdpr_consent,
+            processing_error = EXCLUDED.processing_error
+        RETURNING 1
+    )
+    SELECT count(*)::int FROM written;
+$$;
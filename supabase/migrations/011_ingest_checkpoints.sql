@@ -0,0 +1,102 @@
+-- ATS Intelligent System - Resumable ingestion checkpoints
+-- Run after 010_embedding_codec.sql
+--
+-- Ingestion creates the cv_documents row first (status 'processing') and saves each
+-- stage's output as soon as it completes. completed_stages lists the stages whose
+-- output is stored, so an interrupted or failed ingest resumes from there
+-- (POST /api/cv/{id}/resume, scripts/resume_ingests.py) without redoing OCR.
+
+ALTER TABLE cv_documents
+    ADD COLUMN IF NOT EXISTS completed_stages TEXT[] NOT NULL DEFAULT '{}';
+
+-- CVs ingested before checkpoints went through every stage
+UPDATE cv_documents
+SET completed_stages = ARRAY['storage', 'ocr', 'llm', 'embedding']
+WHERE status = 'active' AND completed_stages = '{}';
+
+-- Resume candidates: unfinished, failed, or with a stage left to redo
+CREATE INDEX IF NOT EXISTS idx_cv_documents_resumable ON cv_documents (updated_at)
+    WHERE status IN ('processing', 'error')
+       OR NOT (completed_stages @> ARRAY['ocr', 'llm', 'embedding']);
+
+-- =============================================================================
+-- RPC: save one stage's output
+-- =============================================================================
+-- fields: any of raw_text, structured_data, quality_score, original_file_path,
+-- status, processing_error, and the embedding as "embedding" (JSON list) or
+-- "embedding_b64" + "embedding_dtype" (migration 010). Keys not present are left
+-- unchanged. stage (if given) is appended to completed_stages atomically, so
+-- stages finishing at the same time do not overwrite each other.
+CREATE OR REPLACE FUNCTION checkpoint_cv(cv_id uuid, stage text DEFAULT NULL, fields jsonb DEFAULT '{}')
+RETURNS void
+LANGUAGE sql
+AS $$
+    UPDATE cv_documents c SET
+        raw_text = CASE WHEN fields ? 'raw_text' THEN fields->>'raw_text' ELSE c.raw_text END,
+        structured_data = CASE WHEN fields ? 'structured_data' THEN fields->'structured_data' ELSE c.structured_data END,
+        quality_score = CASE WHEN fields ? 'quality_score' THEN (fields->>'quality_score')::float ELSE c.quality_score END,
+        original_file_path = CASE WHEN fields ? 'original_file_path' THEN fields->>'original_file_path' ELSE c.original_file_path END,
+        status = CASE WHEN fields ? 'status' THEN fields->>'status' ELSE c.status END,
+        processing_error = CASE WHEN fields ? 'processing_error' THEN fields->>'processing_error' ELSE c.processing_error END,
+        embedding = CASE
+            WHEN fields ? 'embedding_b64'
+                THEN vector_from_base64(fields->>'embedding_b64', coalesce(fields->>'embedding_dtype', 'float32'))
+            WHEN fields ? 'embedding' THEN (fields->>'embedding')::vector
+            ELSE c.embedding
+        END,
+        completed_stages = CASE
+            WHEN stage IS NULL OR stage = ANY (c.completed_stages) THEN c.completed_stages
+            ELSE array_append(c.completed_stages, stage)
+        END
+    WHERE c.id = cv_id;
+$$;
+
+-- =============================================================================
+-- Packed upsert (migration 010) now also writes completed_stages
+-- =============================================================================
+CREATE OR REPLACE FUNCTION upsert_cv_documents_packed(rows jsonb)
+RETURNS int
+LANGUAGE sql
+AS $$
+    WITH written AS (
+        INSERT INTO cv_documents (
+            id, user_id, original_file_path, raw_text, structured_data, embedding,
+            quality_score, status, source_type, original_filename, mime_type,
+            file_size_bytes, gdpr_consent, processing_error, completed_stages
+        )
+        SELECT
+            (r->>'id')::uuid,
+            (r->>'user_id')::uuid,
+            r->>'original_file_path',
+            r->>'raw_text',
+            coalesce(r->'structured_data', '{}'::jsonb),
+            vector_from_base64(r->>'embedding_b64', coalesce(r->>'embedding_dtype', 'float32')),
+            (r->>'quality_score')::float,
+            coalesce(r->>'status', 'active'),
+            coalesce(r->>'source_type', 'upload'),
+            r->>'original_filename',
+            r->>'mime_type',
+            (r->>'file_size_bytes')::bigint,
+            coalesce((r->>'gdpr_consent')::boolean, false),
+            r->>'processing_error',
+            coalesce(ARRAY(SELECT jsonb_array_elements_text(r->'completed_stages')), '{}')
+        FROM jsonb_array_elements(rows) AS r
+        ON CONFLICT (id) DO UPDATE SET
+            user_id = EXCLUDED.user_id,
+            original_file_path = EXCLUDED.original_file_path,
+            raw_text = EXCLUDED.raw_text,
+            structured_data = EXCLUDED.structured_data,
+            embedding = EXCLUDED.embedding,
+            quality_score = EXCLUDED.quality_score,
+            status = EXCLUDED.status,
+            source_type = EXCLUDED.source_type,
+            original_filename = EXCLUDED.original_filename,
+            mime_type = EXCLUDED.mime_type,
+            file_size_bytes = EXCLUDED.file_size_bytes,
+            gdpr_consent = EXCLUDED.gdpr_consent,
+            processing_error = EXCLUDED.processing_error,
+            completed_stages = EXCLUDED.completed_stages
+        RETURNING 1
+    )
+    SELECT count(*)::int FROM written;
+$$;
@@ -0,0 +1,132 @@
+-- ATS Intelligent System - Prompt / model versions per CV
+-- Run after 011_ingest_checkpoints.sql
+--
+-- Each row records what produced it: the structuring prompt version and LLM model
+-- (structured_data) and the embedding model (embedding). When one changes,
+-- scripts/reprocess_cvs.py re-runs only the affected stage from the stored raw_text.
+--
+-- Rows from before this migration have no versions and count as stale. To keep them,
+-- backfill first, e.g.:
+--   UPDATE cv_documents SET prompt_version = '1', llm_model = 'llama-3.3-70b-versatile'
+--   WHERE 'llm' = ANY (completed_stages);
+
+ALTER TABLE cv_documents
+    ADD COLUMN IF NOT EXISTS prompt_version TEXT,
+    ADD COLUMN IF NOT EXISTS llm_model TEXT,
+    ADD COLUMN IF NOT EXISTS embedding_model TEXT;
+
+-- =============================================================================
+-- RPC: active CVs produced with other versions than the current ones
+-- =============================================================================
+-- Keyset paging on id (pass the last id as after_id). Rows without raw_text cannot
+-- be reprocessed and are skipped.
+CREATE OR REPLACE FUNCTION find_stale_cvs(
+    current_prompt_version text,
+    current_llm_model text,
+    current_embedding_model text,
+    after_id uuid DEFAULT NULL,
+    result_limit int DEFAULT 100
+)
+RETURNS TABLE (id uuid, stale_llm boolean, stale_embedding boolean)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT s.id, s.stale_llm, s.stale_embedding
+    FROM (
+        SELECT c.id,
+               (c.prompt_version IS DISTINCT FROM current_prompt_version
+                OR c.llm_model IS DISTINCT FROM current_llm_model) AS stale_llm,
+               c.embedding_model IS DISTINCT FROM current_embedding_model AS stale_embedding
+        FROM cv_documents c
+        WHERE c.status = 'active'
+          AND coalesce(c.raw_text, '') <> ''
+          AND (after_id IS NULL OR c.id > after_id)
+    ) s
+    WHERE s.stale_llm OR s.stale_embedding
+    ORDER BY s.id
+    LIMIT result_limit;
+$$;
+
+-- =============================================================================
+-- checkpoint_cv (migration 011) and the packed upsert (migration 010) write the versions
+-- =============================================================================
+CREATE OR REPLACE FUNCTION checkpoint_cv(cv_id uuid, stage text DEFAULT NULL, fields jsonb DEFAULT '{}')
+RETURNS void
+LANGUAGE sql
+AS $$
+    UPDATE cv_documents c SET
+        raw_text = CASE WHEN fields ? 'raw_text' THEN fields->>'raw_text' ELSE c.raw_text END,
+        structured_data = CASE WHEN fields ? 'structured_data' THEN fields->'structured_data' ELSE c.structured_data END,
+        quality_score = CASE WHEN fields ? 'quality_score' THEN (fields->>'quality_score')::float ELSE c.quality_score END,
+        original_file_path = CASE WHEN fields ? 'original_file_path' THEN fields->>'original_file_path' ELSE c.original_file_path END,
+        status = CASE WHEN fields ? 'status' THEN fields->>'status' ELSE c.status END,
+        processing_error = CASE WHEN fields ? 'processing_error' THEN fields->>'processing_error' ELSE c.processing_error END,
+        prompt_version = CASE WHEN fields ? 'prompt_version' THEN fields->>'prompt_version' ELSE c.prompt_version END,
+        llm_model = CASE WHEN fields ? 'llm_model' THEN fields->>'llm_model' ELSE c.llm_model END,
+        embedding_model = CASE WHEN fields ? 'embedding_model' THEN fields->>'embedding_model' ELSE c.embedding_model END,
+        embedding = CASE
+            WHEN fields ? 'embedding_b64'
+                THEN vector_from_base64(fields->>'embedding_b64', coalesce(fields->>'embedding_dtype', 'float32'))
+            WHEN fields ? 'embedding' THEN (fields->>'embedding')::vector
+            ELSE c.embedding
+        END,
+        completed_stages = CASE
+            WHEN stage IS NULL OR stage = ANY (c.completed_stages) THEN c.completed_stages
+            ELSE array_append(c.completed_stages, stage)
+        END
+    WHERE c.id = cv_id;
+$$;
+
+CREATE OR REPLACE FUNCTION upsert_cv_documents_packed(rows jsonb)
+RETURNS int
+LANGUAGE sql
+AS $$
+    WITH written AS (
+        INSERT INTO cv_documents (
+            id, user_id, original_file_path, raw_text, structured_data, embedding,
+            quality_score, status, source_type, original_filename, mime_type,
+            file_size_bytes, gdpr_consent, processing_error, completed_stages,
+            prompt_version, llm_model, embedding_model
+        )
+        SELECT
+            (r->>'id')::uuid,
+            (r->>'user_id')::uuid,
+            r->>'original_file_path',
+            r->>'raw_text',
+            coalesce(r->'structured_data', '{}'::jsonb),
+            vector_from_base64(r->>'embedding_b64', coalesce(r->>'embedding_dtype', 'float32')),
+            (r->>'quality_score')::float,
+            coalesce(r->>'status', 'active'),
+            coalesce(r->>'source_type', 'upload'),
+            r->>'original_filename',
+            r->>'mime_type',
+            (r->>'file_size_bytes')::bigint,
+            coalesce((r->>'gdpr_consent')::boolean, false),
+            r->>'processing_error',
+            coalesce(ARRAY(SELECT jsonb_array_elements_text(r->'completed_stages')), '{}'),
+            r->>'prompt_version',
+            r->>'llm_model',
+            r->>'embedding_model'
+        FROM jsonb_array_elements(rows) AS r
+        ON CONFLICT (id) DO UPDATE SET
+            user_id = EXCLUDED.user_id,
+            original_file_path = EXCLUDED.original_file_path,
+            raw_text = EXCLUDED.raw_text,
+            structured_data = EXCLUDED.structured_data,
+            embedding = EXCLUDED.embedding,
+            quality_score = EXCLUDED.quality_score,
+            status = EXCLUDED.status,
+            source_type = EXCLUDED.source_type,
+            original_filename = EXCLUDED.original_filename,
+            mime_type = EXCLUDED.mime_type,
+            file_size_bytes = EXCLUDED.file_size_bytes,
+            gdpr_consent = EXCLUDED.gdpr_consent,
+            processing_error = EXCLUDED.processing_error,
+            completed_stages = EXCLUDED.completed_stages,
+            prompt_version = EXCLUDED.prompt_version,
+            llm_model = EXCLUDED.llm_model,
+            embedding_model = EXCLUDED.embedding_model
+        RETURNING 1
+    )
+    SELECT count(*)::int FROM written;
+$$;
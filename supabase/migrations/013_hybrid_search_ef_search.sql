@@ -0,0 +1,66 @@
+-- ATS Intelligent System - HNSW candidate list for hybrid search
+-- Run after 012_processing_versions.sql
+--
+-- The semantic side of hybrid_search_cv_documents (migration 002) asks for
+-- match_count * 2 rows, but an HNSW scan returns at most hnsw.ef_search of them
+-- (pgvector default 40): above match_count = 20 the fusion silently ran on a short
+-- vector list. Same signature, now plpgsql so ef_search can be raised transaction-locally
+-- (SET LOCAL semantics, like match_cv_documents in 004/005) before the query runs.
+
+CREATE OR REPLACE FUNCTION hybrid_search_cv_documents(
+    query_text text,
+    query_embedding vector(384),
+    match_count int DEFAULT 10,
+    full_text_weight float DEFAULT 1.0,
+    semantic_weight float DEFAULT 1.0,
+    rrf_k int DEFAULT 60,
+    filter_user_id uuid DEFAULT NULL
+)
+RETURNS TABLE (id uuid, score float, similarity float, fts_rank int, semantic_rank int)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+BEGIN
+    PERFORM set_config(
+        'hnsw.ef_search',
+        greatest(coalesce(current_setting('hnsw.ef_search', true), '40')::int, match_count * 2)::text,
+        true
+    );
+
+    RETURN QUERY
+    WITH full_text AS (
+        SELECT
+            cv_documents.id,
+            row_number() OVER (
+                ORDER BY ts_rank_cd(cv_documents.fts, websearch_to_tsquery('simple', query_text)) DESC
+            )::int AS rank_ix
+        FROM cv_documents
+        WHERE cv_documents.fts @@ websearch_to_tsquery('simple', query_text)
+          AND (filter_user_id IS NULL OR cv_documents.user_id = filter_user_id)
+        ORDER BY rank_ix
+        LIMIT match_count * 2
+    ),
+    semantic AS (
+        SELECT
+            cv_documents.id,
+            1 - (cv_documents.embedding <=> query_embedding) AS similarity,
+            row_number() OVER (ORDER BY cv_documents.embedding <=> query_embedding)::int AS rank_ix
+        FROM cv_documents
+        WHERE cv_documents.embedding IS NOT NULL
+          AND (filter_user_id IS NULL OR cv_documents.user_id = filter_user_id)
+        ORDER BY cv_documents.embedding <=> query_embedding
+        LIMIT match_count * 2
+    )
+    SELECT
+        coalesce(full_text.id, semantic.id) AS id,
+        (coalesce(full_text_weight / (rrf_k + full_text.rank_ix), 0.0)
+            + coalesce(semantic_weight / (rrf_k + semantic.rank_ix), 0.0))::float AS score,
+        semantic.similarity::float,
+        full_text.rank_ix AS fts_rank,
+        semantic.rank_ix AS semantic_rank
+    FROM full_text
+    FULL OUTER JOIN semantic ON full_text.id = semantic.id
+    ORDER BY 2 DESC
+    LIMIT match_count;
+END;
+$$;
@@ -0,0 +1,89 @@
+-- ATS Intelligent System - Score job skills against the normalized cv_skills table
+-- Run after 013_hybrid_search_ef_search.sql (needs cv_skills from 009;
+-- existing CVs: python scripts/backfill_cv_skills.py)
+--
+-- Migration 008 matched job skills with phraseto_tsquery over skills_tsv. The 'simple'
+-- parser drops punctuation, so "c++" and "c#" both become the token "c" and match any
+-- CV listing C - a different answer from the API's engine. cv_skills.skill_norm holds
+-- the same canonical names the engine compares (skill_normalizer), so matching on it
+-- gives the same matched_skills and skills score on both paths.
+--
+-- Without a job both paths use the number of listed skills (saturated at 10), unchanged.
+
+-- =============================================================================
+-- RPC: multi-criteria scoring over structured_data + cv_skills
+-- =============================================================================
+-- skill_groups: [["javascript", "js", ...], ...] - one group per required skill, canonical
+--   name first (skill_normalizer.skill_variants). The group matches when the CV has that
+--   canonical skill in cv_skills; aliases are already folded in at ingestion.
+CREATE OR REPLACE FUNCTION score_cv_documents(
+    cv_ids uuid[],
+    w_skills float DEFAULT 0.4,
+    w_experience float DEFAULT 0.3,
+    w_education float DEFAULT 0.2,
+    w_quality float DEFAULT 0.1,
+    skill_groups jsonb DEFAULT NULL,
+    result_limit int DEFAULT NULL
+)
+RETURNS TABLE (
+    id uuid,
+    score float,
+    skills float,
+    experience float,
+    education float,
+    quality float,
+    matched_skills text[]
+)
+LANGUAGE sql
+STABLE
+AS $$
+WITH required AS (
+    SELECT g.value->>0 AS skill_norm, g.ordinality AS ord
+    FROM jsonb_array_elements(CASE WHEN jsonb_typeof(skill_groups) = 'array' THEN skill_groups END)
+        WITH ORDINALITY AS g
+),
+features AS (
+    SELECT
+        c.id,
+        CASE
+            WHEN jsonb_array_length_safe(skill_groups) = 0
+                THEN least(jsonb_array_length_safe(c.structured_data->'skills') / 10.0, 1.0)
+            ELSE coalesce(cardinality(m.matched), 0)::float / jsonb_array_length_safe(skill_groups)
+        END AS f_skills,
+        least(jsonb_array_length_safe(c.structured_data->'experiences') / 5.0, 1.0) AS f_experience,
+        least(jsonb_array_length_safe(c.structured_data->'education') / 3.0, 1.0) AS f_education,
+        coalesce(c.quality_score, 0.0) AS f_quality,
+        coalesce(m.matched, '{}'::text[]) AS matched
+    FROM cv_documents c
+    LEFT JOIN LATERAL (
+        -- Index-only lookups on cv_skills' (cv_id, skill_norm) primary key
+        SELECT array_agg(r.skill_norm ORDER BY r.ord) AS matched
+        FROM required r
+        WHERE EXISTS (
+            SELECT 1 FROM cv_skills s WHERE s.cv_id = c.id AND s.skill_norm = r.skill_norm
+        )
+    ) m ON true
+    WHERE c.id = ANY (cv_ids)
+),
+weighted AS (
+    SELECT
+        id,
+        f_skills * w_skills AS skills,
+        f_experience * w_experience AS experience,
+        f_education * w_education AS education,
+        f_quality * w_quality AS quality,
+        matched
+    FROM features
+)
+SELECT
+    id,
+    round(least(skills + experience + education + quality, 1.0)::numeric, 2)::float AS score,
+    round(skills::numeric, 2)::float,
+    round(experience::numeric, 2)::float,
+    round(education::numeric, 2)::float,
+    round(quality::numeric, 2)::float,
+    matched
+FROM weighted
+ORDER BY score DESC, id
+LIMIT result_limit;
+$$;
@@ -0,0 +1,98 @@
+-- ATS Intelligent System - Exact scan for small cv_ids prefilters
+-- Run after 014_score_cv_skills.sql
+--
+-- match_cv_documents (migration 009) applied the cv_ids prefilter inside the HNSW
+-- iterative scan. With a small candidate set (a skills query matching a few dozen CVs)
+-- the walk visits mostly rejected rows, and under relaxed_order it can stop at
+-- hnsw.max_scan_tuples with fewer than match_count results even though more allowed
+-- rows pass the threshold. Same signature; up to exact_prefilter_max ids the index scan
+-- is disabled for the transaction, so the ids are fetched through the primary key and
+-- ranked by exact distance. Larger sets keep the index path.
+
+-- =============================================================================
+-- match_cv_documents: exact ranking for small cv_ids prefilters
+-- =============================================================================
+CREATE OR REPLACE FUNCTION match_cv_documents(
+    query_embedding vector(384),
+    match_threshold float DEFAULT 0.5,
+    match_count int DEFAULT 10,
+    ef_search int DEFAULT NULL,
+    ivfflat_probes int DEFAULT NULL,
+    exact boolean DEFAULT false,
+    filters jsonb DEFAULT '{}'::jsonb
+)
+RETURNS TABLE (id uuid, similarity float)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    f_user_id uuid := (filters->>'user_id')::uuid;
+    f_status text[];
+    f_source_types text[];
+    f_seniority text := lower(filters->>'seniority');
+    f_location text := filters->>'location';
+    f_skills tsquery;
+    f_cv_ids uuid[];
+    -- Prefilters up to this size are scanned exactly (primary key lookups + sort)
+    exact_prefilter_max constant int := 2000;
+    skill text;
+BEGIN
+    IF jsonb_typeof(filters->'cv_ids') = 'array' THEN
+        f_cv_ids := ARRAY(SELECT jsonb_array_elements_text(filters->'cv_ids')::uuid);
+    END IF;
+    IF jsonb_typeof(filters->'status') = 'array' THEN
+        f_status := ARRAY(SELECT jsonb_array_elements_text(filters->'status'));
+    END IF;
+    IF jsonb_typeof(filters->'source_type') = 'array' THEN
+        f_source_types := ARRAY(SELECT jsonb_array_elements_text(filters->'source_type'));
+    END IF;
+    IF jsonb_typeof(filters->'skills') = 'array' THEN
+        FOR skill IN SELECT jsonb_array_elements_text(filters->'skills') LOOP
+            f_skills := CASE WHEN f_skills IS NULL
+                THEN phraseto_tsquery('simple', skill)
+                ELSE f_skills && phraseto_tsquery('simple', skill) END;
+        END LOOP;
+    END IF;
+
+    IF ef_search IS NOT NULL THEN
+        PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+    END IF;
+    IF ivfflat_probes IS NOT NULL THEN
+        PERFORM set_config('ivfflat.probes', ivfflat_probes::text, true);
+    END IF;
+    IF filters <> '{}'::jsonb THEN
+        PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+        PERFORM set_config('ivfflat.iterative_scan', 'relaxed_order', true);
+    END IF;
+    -- A small cv_ids set is mostly filtered out of the HNSW graph walk: the iterative
+    -- scan can hit hnsw.max_scan_tuples before enough allowed rows turn up. Distances
+    -- for a few thousand known ids are cheap, so compute them exactly instead.
+    IF exact OR cardinality(f_cv_ids) <= exact_prefilter_max THEN
+        PERFORM set_config('enable_indexscan', 'off', true);
+    END IF;
+
+    RETURN QUERY
+    WITH candidates AS MATERIALIZED (
+        SELECT
+            cv_documents.id,
+            cv_documents.embedding <=> query_embedding AS distance
+        FROM cv_documents
+        WHERE cv_documents.embedding IS NOT NULL
+          AND (f_cv_ids IS NULL OR cv_documents.id = ANY (f_cv_ids))
+          AND (f_user_id IS NULL OR cv_documents.user_id = f_user_id)
+          AND (f_status IS NULL OR cv_documents.status = ANY (f_status))
+          AND (f_source_types IS NULL OR cv_documents.source_type = ANY (f_source_types))
+          AND (f_seniority IS NULL
+               OR lower(cv_documents.structured_data->'career_summary'->>'seniority_level') = f_seniority)
+          AND (f_location IS NULL
+               OR cv_documents.structured_data->'candidate_info'->>'location' ILIKE '%' || f_location || '%')
+          AND (f_skills IS NULL OR cv_documents.skills_tsv @@ f_skills)
+          AND 1 - (cv_documents.embedding <=> query_embedding) > match_threshold
+        ORDER BY cv_documents.embedding <=> query_embedding
+        LIMIT match_count
+    )
+    -- relaxed_order may return slightly out-of-order rows: re-sort the final top-k
+    SELECT candidates.id, 1 - candidates.distance AS similarity
+    FROM candidates
+    ORDER BY candidates.distance;
+END;
+$$;
@@ -0,0 +1,85 @@
+-- ATS Intelligent System - score_cv_documents takes the canonical job skills as text[]
+-- Run after 015_exact_small_prefilter.sql
+--
+-- Since migration 014 the RPC matches job skills against cv_skills.skill_norm, so only
+-- the canonical name of each skill_groups entry was read and every alias after it was
+-- dead payload. The API now sends the canonical names (skill_normalizer.normalize_skills)
+-- as required_skills. The parameter type changes, so the old function is dropped first.
+
+DROP FUNCTION IF EXISTS score_cv_documents(uuid[], float, float, float, float, jsonb, int);
+
+-- =============================================================================
+-- RPC: multi-criteria scoring over structured_data + cv_skills
+-- =============================================================================
+-- required_skills: canonical job skills. NULL or empty - no job: the skills criterion
+--   uses the number of listed skills (saturated at 10).
+CREATE OR REPLACE FUNCTION score_cv_documents(
+    cv_ids uuid[],
+    w_skills float DEFAULT 0.4,
+    w_experience float DEFAULT 0.3,
+    w_education float DEFAULT 0.2,
+    w_quality float DEFAULT 0.1,
+    required_skills text[] DEFAULT NULL,
+    result_limit int DEFAULT NULL
+)
+RETURNS TABLE (
+    id uuid,
+    score float,
+    skills float,
+    experience float,
+    education float,
+    quality float,
+    matched_skills text[]
+)
+LANGUAGE sql
+STABLE
+AS $$
+WITH required AS (
+    SELECT r.skill_norm, r.ord
+    FROM unnest(required_skills) WITH ORDINALITY AS r(skill_norm, ord)
+),
+features AS (
+    SELECT
+        c.id,
+        CASE
+            WHEN coalesce(cardinality(required_skills), 0) = 0
+                THEN least(jsonb_array_length_safe(c.structured_data->'skills') / 10.0, 1.0)
+            ELSE coalesce(cardinality(m.matched), 0)::float / cardinality(required_skills)
+        END AS f_skills,
+        least(jsonb_array_length_safe(c.structured_data->'experiences') / 5.0, 1.0) AS f_experience,
+        least(jsonb_array_length_safe(c.structured_data->'education') / 3.0, 1.0) AS f_education,
+        coalesce(c.quality_score, 0.0) AS f_quality,
+        coalesce(m.matched, '{}'::text[]) AS matched
+    FROM cv_documents c
+    LEFT JOIN LATERAL (
+        -- Index-only lookups on cv_skills' (cv_id, skill_norm) primary key
+        SELECT array_agg(r.skill_norm ORDER BY r.ord) AS matched
+        FROM required r
+        WHERE EXISTS (
+            SELECT 1 FROM cv_skills s WHERE s.cv_id = c.id AND s.skill_norm = r.skill_norm
+        )
+    ) m ON true
+    WHERE c.id = ANY (cv_ids)
+),
+weighted AS (
+    SELECT
+        id,
+        f_skills * w_skills AS skills,
+        f_experience * w_experience AS experience,
+        f_education * w_education AS education,
+        f_quality * w_quality AS quality,
+        matched
+    FROM features
+)
+SELECT
+    id,
+    round(least(skills + experience + education + quality, 1.0)::numeric, 2)::float AS score,
+    round(skills::numeric, 2)::float,
+    round(experience::numeric, 2)::float,
+    round(education::numeric, 2)::float,
+    round(quality::numeric, 2)::float,
+    matched
+FROM weighted
+ORDER BY score DESC, id
+LIMIT result_limit;
+$$;